@@ -1,8 +1,13 @@
 """Application configuration constants."""
 
+import os
 
 # Preview settings
 DEFAULT_PREVIEW_ROWS = 200
+FILE_PREVIEW_ROWS = 50  # Rows read up front for per-file previews
+
+# Full DataFrames are parsed lazily; when enabled they are prefetched in the background
+PREFETCH_FULL_DATAFRAMES = True
 
 # File settings
 SUPPORTED_FILE_TYPES = [
@@ -15,10 +20,62 @@ SUPPORTED_FILE_TYPES = [
 WINDOW_TITLE = "Pivot Builder"
 WINDOW_MIN_WIDTH = 1200
 WINDOW_MIN_HEIGHT = 800
+TABLE_BLOCK_ROWS = 200  # Rows formatted at a time for the preview/pivot tables
+TABLE_CACHE_BLOCKS = 32  # Formatted row blocks kept per table (least recently used dropped)
+TABLE_ROW_HEIGHT_PX = 23  # Fallback row height for sizing the table viewport
+COLUMN_WIDTH_SAMPLE_ROWS = 200  # Rows sampled per column when auto-sizing table columns
+COLUMN_WIDTH_MIN_PX = 40
+COLUMN_WIDTH_MAX_PX = 400
+COLUMN_WIDTH_BATCH = 25  # Columns sized per idle callback, so wide tables lay out incrementally
+
+# Source cache settings (parsed files stored as Feather, requires pyarrow)
+SOURCE_CACHE_ENABLED = True
+SOURCE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".pivot_builder", "cache")
+SOURCE_CACHE_MAX_MB = 2048  # Least recently used entries are evicted past this
+
+# Background work settings
+BACKGROUND_MAX_WORKERS = min(8, os.cpu_count() or 2)  # Concurrent file loads
+BACKGROUND_POLL_INTERVAL_MS = 50  # How often the Tk loop drains worker callbacks
+
+# Pivot settings
+PIVOT_MAX_WORKERS = os.cpu_count() or 2  # Partitions aggregated concurrently
+PIVOT_CACHE_MAX_MB = 256  # Memory budget for cached pivot results (LRU eviction)
+PIVOT_CACHE_KEY_CODES = True  # Reuse factorized row/column keys across rebuilds of the same dataset
+PIVOT_PAGE_SIZE = 1000  # Pivot rows materialized per page in the preview
+PIVOT_PARALLEL_MEASURES = True  # Aggregate several value fields concurrently (with PIVOT_MAX_WORKERS > 1)
+PIVOT_LIVE_DEBOUNCE_MS = 400  # Quiet period after a configuration edit before a live rebuild
+PIVOT_LIVE_SAMPLE_ROWS = 200000  # Rows sampled for the approximate live preview (exact result follows)
 
 # Export settings
 DEFAULT_EXPORT_FORMAT = "xlsx"
-EXPORT_FORMATS = ["xlsx", "csv"]
+EXPORT_FORMATS = ["xlsx", "csv", "json", "ndjson"]  # csv/json/ndjson also as .gz (or .zst with zstandard)
+EXPORT_CHUNK_ROWS = 100000  # Rows serialized per write when streaming CSV/JSON exports
+EXPORT_WRITE_BUFFER_BYTES = 1024 * 1024  # Output buffer for streaming exports
+JSON_DATE_FORMAT = "iso"  # Dates in JSON/NDJSON exports, for every orient: "iso" (ISO 8601) or "epoch" (ms)
 
 # Validation settings
-MAX_FILE_SIZE_MB = 100
+MAX_FILE_SIZE_MB = 100  # Excel workbooks
+MAX_CSV_FILE_SIZE_MB = None  # None for no limit; large CSVs are parsed in parallel chunks
+
+# CSV parsing settings
+CSV_SNIFF_SAMPLE_BYTES = 64 * 1024  # Bytes read to sniff the delimiter/quoting
+CSV_SNIFF_DELIMITERS = ",;\t|"
+CSV_ENGINE = "c"  # "c" | "pyarrow" (when installed; parses dates itself) | "auto" (pyarrow when installed, else c)
+CSV_LARGE_FILE_THRESHOLD_MB = 256  # CSVs at least this large are memory-mapped and parsed in chunks
+CSV_CHUNK_TARGET_MB = 64  # Approximate bytes per parallel parse chunk
+CSV_PARALLEL_WORKERS = os.cpu_count() or 2  # Worker processes for chunked parsing
+CSV_PROGRESS_CHUNK_ROWS = 250000  # Rows per read when a smaller CSV load reports progress
+
+# Combined dataset settings
+# Keep per-file frames as partitions and only concatenate on demand
+VIRTUAL_COMBINED_DATASET = True
+
+# Dtype optimization settings
+OPTIMIZE_DTYPES_ON_LOAD = True  # Category/downcast/date conversion for full loads
+DTYPE_SAMPLE_ROWS = 10000  # Rows sampled per column for type inference
+DTYPE_CATEGORY_MAX_RATIO = 0.5  # Text columns with at most this distinct/non-null ratio become category
+
+# Excel settings
+WORKBOOK_CACHE_MAX_HANDLES = 8  # Open workbooks kept for sheet listing/switching
+XLSX_STREAM_CHUNK_ROWS = 10000  # Rows converted per chunk when streaming a sheet
+XLSX_MAX_ROWS_PER_SHEET = 1048576  # Excel's row limit (header included); larger exports continue on new sheets
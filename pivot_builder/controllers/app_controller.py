@@ -1,6 +1,7 @@
 """Main application controller."""
 
 from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import BACKGROUND_MAX_WORKERS, BACKGROUND_POLL_INTERVAL_MS
 from pivot_builder.models.file_model import FileModel
 from pivot_builder.models.dataset_model import DatasetModel, CombinedDataset
 from pivot_builder.models.mapping_model import ColumnMappingModel, MappingRule
@@ -11,6 +12,7 @@ from pivot_builder.services.column_normalization_service import ColumnNormalizat
 from pivot_builder.services.column_matching_service import ColumnMatchingService
 from pivot_builder.services.dataset_builder_service import DatasetBuilderService
 from pivot_builder.services.pivot_engine_service import PivotEngineService
+from pivot_builder.services.background_task_service import BackgroundTaskService
 
 
 class AppController:
@@ -50,6 +52,10 @@ class AppController:
         # Debounce/throttle system for rebuilds
         self._scheduled_tasks = {}  # key -> after_id
 
+        # Worker pool for file loads and other long-running work
+        self.background_task_service = BackgroundTaskService(BACKGROUND_MAX_WORKERS)
+        self._background_poll_id = None
+
         # Status bar (will be set by main window)
         self.status_bar = None
 
@@ -84,6 +90,87 @@ class AppController:
             logger.warning(f"No main window for scheduling, executing '{key}' immediately")
             fn()
 
+    def run_in_background(
+        self,
+        fn,
+        *args,
+        key: str = None,
+        on_success=None,
+        on_error=None,
+        on_progress=None,
+        on_cancel=None
+    ):
+        """
+        Run fn(task, *args) on the worker pool.
+
+        Callbacks are always invoked on the Tk main thread: the worker queue is
+        drained by a poll loop scheduled through main_window.after.
+
+        Args:
+            fn: Task function, receives the BackgroundTask as first argument
+            *args: Extra positional arguments for fn
+            key: Optional task label (see BackgroundTaskService.cancel_by_key)
+            on_success: Called with fn's return value
+            on_error: Called with the raised exception
+            on_progress: Called with the payload of task.report_progress(...)
+            on_cancel: Called once a cancelled task has stopped
+
+        Returns:
+            BackgroundTask handle
+        """
+        task = self.background_task_service.submit(
+            fn,
+            *args,
+            key=key,
+            on_success=on_success,
+            on_error=on_error,
+            on_progress=on_progress,
+            on_cancel=on_cancel
+        )
+
+        if hasattr(self, 'main_window') and self.main_window:
+            self._ensure_background_polling()
+        else:
+            # No main loop to poll from yet, wait and deliver callbacks inline
+            logger.warning(f"No main window for background work, running '{key}' inline")
+            try:
+                task.future.result()
+            except Exception:
+                pass  # Errors are delivered through on_error
+            self.background_task_service.process_pending_callbacks()
+
+        return task
+
+    def _ensure_background_polling(self):
+        """Start the callback poll loop if it is not already running."""
+        if self._background_poll_id is None:
+            self._background_poll_id = self.main_window.after(
+                BACKGROUND_POLL_INTERVAL_MS,
+                self._poll_background_tasks
+            )
+
+    def _poll_background_tasks(self):
+        """Deliver queued worker callbacks; reschedules while work is pending."""
+        self._background_poll_id = None
+        self.background_task_service.process_pending_callbacks()
+
+        if self.background_task_service.has_pending():
+            self._ensure_background_polling()
+
+    def set_status(self, message: str):
+        """
+        Show a message in the status bar (no-op before the window exists).
+
+        Args:
+            message: Status text
+        """
+        if self.status_bar:
+            self.status_bar.set(message)
+
+    def shutdown(self):
+        """Stop background workers when the application exits."""
+        self.background_task_service.shutdown()
+
     @property
     def files(self):
         """Convenience property to access files dictionary directly."""
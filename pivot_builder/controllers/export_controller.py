@@ -1,5 +1,7 @@
 """Controller for export operations."""
 
+import os
+
 from pivot_builder.config.logging_config import logger
 from pivot_builder.services.export_service import ExportService
 
@@ -16,69 +18,240 @@ class ExportController:
         """
         self.app_controller = app_controller
         self.export_service = ExportService()
+        self._export_task = None
+        self.views = []
+
+    def add_view(self, view):
+        """
+        Register a view to be told when exports start and stop.
 
-    def export_csv(self, path: str) -> bool:
+        Args:
+            view: View with a set_exporting(bool) method
+        """
+        self.views.append(view)
+
+    def export_csv(self, path: str, on_done=None) -> bool:
         """
         Export current pivot to CSV file.
 
+        Args:
+            path: File path to save to (.gz/.zst for compressed output)
+            on_done: Called with True/False when the export finishes
+
+        Returns:
+            True if the export was started, False otherwise
+        """
+        return self.export_pivot(path, 'csv', on_done)
+
+    def export_xlsx(self, path: str, on_done=None) -> bool:
+        """
+        Export current pivot to Excel (XLSX) file.
+
         Args:
             path: File path to save to
+            on_done: Called with True/False when the export finishes
 
         Returns:
-            True if successful, False otherwise
+            True if the export was started, False otherwise
+        """
+        return self.export_pivot(path, 'xlsx', on_done)
+
+    def export_json(self, path: str, on_done=None) -> bool:
+        """
+        Export current pivot to JSON file (NDJSON for .ndjson/.jsonl paths).
+
+        Args:
+            path: File path to save to (.gz/.zst for compressed output)
+            on_done: Called with True/False when the export finishes
+
+        Returns:
+            True if the export was started, False otherwise
+        """
+        detected, _ = self.export_service.detect_format(path)
+        return self.export_pivot(path, 'ndjson' if detected == 'ndjson' else 'json', on_done)
+
+    def export_pivot(self, path: str, fmt: str = None, on_done=None) -> bool:
+        """
+        Export the current pivot in the background.
+
+        Args:
+            path: File path to save to
+            fmt: 'csv', 'json', 'ndjson' or 'xlsx' (None to use the file extension)
+            on_done: Called with True/False on the main thread when the export finishes
+
+        Returns:
+            True if the export was started, False otherwise
         """
         # Check validation before export
         if not self._check_validation_for_export('pivot'):
             return False
 
-        pivot_df = self._get_pivot_dataframe()
+        pivot_df, build_fn = self._get_pivot_dataframe()
+        if build_fn is not None:
+            # The full result is built on the export worker, not the UI thread
+            return self._start_export(None, None, None, path, fmt, on_done, build_fn)
+
         if pivot_df is None:
             logger.error("No pivot data to export")
             return False
 
-        return self.export_service.export_csv(pivot_df, path)
+        return self._start_export([pivot_df], list(pivot_df.columns), len(pivot_df), path, fmt, on_done)
 
-    def export_xlsx(self, path: str) -> bool:
+    def export_combined(self, path: str, fmt: str = None, on_done=None) -> bool:
         """
-        Export current pivot to Excel (XLSX) file.
+        Export the combined dataset in the background, streaming its partitions.
 
         Args:
             path: File path to save to
+            fmt: 'csv', 'json' or 'ndjson' (None to use the file extension)
+            on_done: Called with True/False on the main thread when the export finishes
 
         Returns:
-            True if successful, False otherwise
+            True if the export was started, False otherwise
         """
         # Check validation before export
-        if not self._check_validation_for_export('pivot'):
+        if not self._check_validation_for_export('combined'):
             return False
 
-        pivot_df = self._get_pivot_dataframe()
-        if pivot_df is None:
-            logger.error("No pivot data to export")
+        combined_dataset = getattr(self.app_controller, 'combined_dataset', None)
+        if combined_dataset is None or not combined_dataset.get_columns():
+            logger.error("No combined dataset to export")
             return False
 
-        return self.export_service.export_xlsx(pivot_df, path)
+        return self._start_export(
+            combined_dataset.iter_partitions(),
+            combined_dataset.get_columns(),
+            combined_dataset.get_row_count(),
+            path,
+            fmt,
+            on_done
+        )
 
-    def export_json(self, path: str) -> bool:
+    def export_combined_csv(self, path: str, on_done=None) -> bool:
         """
-        Export current pivot to JSON file.
+        Export the combined dataset to CSV, streaming its partitions.
 
         Args:
             path: File path to save to
+            on_done: Called with True/False when the export finishes
 
         Returns:
-            True if successful, False otherwise
+            True if the export was started, False otherwise
         """
-        # Check validation before export
-        if not self._check_validation_for_export('pivot'):
-            return False
+        return self.export_combined(path, 'csv', on_done)
 
-        pivot_df = self._get_pivot_dataframe()
-        if pivot_df is None:
-            logger.error("No pivot data to export")
+    def cancel_export(self) -> bool:
+        """
+        Cancel the running export, if any (its partial file is removed).
+
+        Returns:
+            True if an export was cancelled
+        """
+        task, self._export_task = self._export_task, None
+        if task is None:
             return False
+        task.cancel()
+        self._set_exporting(False)
+        logger.info("Export cancelled")
+        return True
+
+    def is_exporting(self) -> bool:
+        """Check if an export is running."""
+        return self._export_task is not None
 
-        return self.export_service.export_json(pivot_df, path)
+    def _set_exporting(self, exporting: bool):
+        """Enable or disable the views' cancel controls."""
+        for view in self.views:
+            view.set_exporting(exporting)
+
+    def _start_export(self, frames, columns, total_rows, path: str, fmt, on_done, build_fn=None) -> bool:
+        """
+        Run an export on the worker pool, reporting progress in the status bar.
+
+        Args:
+            frames: DataFrames to write (or an iterator of partitions)
+            columns: Output column order
+            total_rows: Total rows, for progress
+            path: File path to save to
+            fmt: Output format (None to use the file extension)
+            on_done: Called with True/False on the main thread
+            build_fn: Optional build_fn(cancel_check, progress_callback) run on
+                the worker to produce the single frame to write (frames,
+                columns and total_rows are then ignored)
+
+        Returns:
+            True (the export was started)
+        """
+        if fmt is None:
+            fmt, _ = self.export_service.detect_format(path)
+            fmt = fmt or 'csv'
+
+        self.cancel_export()
+        name = os.path.basename(path)
+        self.app_controller.set_status(f"Exporting {name}...")
+
+        def finished(success: bool):
+            self._export_task = None
+            self._set_exporting(False)
+            self.app_controller.set_status(
+                f"Exported {name}" if success else f"Export failed: {name}"
+            )
+            if on_done:
+                on_done(success)
+
+        def failed(error: Exception):
+            logger.error(f"Export failed: {error}")
+            finished(False)
+
+        def cancelled():
+            self.app_controller.set_status(f"Export cancelled: {name}")
+
+        def progress(done: int, total: int, stage: str = 'rows'):
+            if stage == 'build':
+                self.app_controller.set_status(f"Building pivot for {name}... ({done}/{total})")
+            elif total:
+                self.app_controller.set_status(
+                    f"Exporting {name}: {done:,} of {total:,} rows "
+                    f"({done * 100 // total}%)"
+                )
+
+        task = self.app_controller.run_in_background(
+            self._export_task_fn,
+            frames,
+            columns,
+            total_rows,
+            path,
+            fmt,
+            build_fn,
+            key=f"export:{path}",
+            on_success=finished,
+            on_error=failed,
+            on_progress=progress,
+            on_cancel=cancelled
+        )
+
+        if not task.future.done():
+            self._export_task = task
+            self._set_exporting(True)
+        return True
+
+    def _export_task_fn(self, task, frames, columns, total_rows, path: str, fmt: str, build_fn=None) -> bool:
+        """Build (if needed) and write an export on a worker thread."""
+        if build_fn is not None:
+            pivot_df = build_fn(
+                task.check_cancelled,
+                lambda done, total: task.report_progress(done, total, 'build')
+            )
+            task.check_cancelled()
+            if pivot_df is None or len(pivot_df) == 0:
+                raise ValueError("Pivot result is empty")
+            frames, columns, total_rows = [pivot_df], list(pivot_df.columns), len(pivot_df)
+
+        def on_chunk(rows_written, total):
+            task.check_cancelled()
+            task.report_progress(rows_written, total)
+
+        return self.export_service.export_frames(frames, columns, path, fmt, on_chunk, total_rows)
 
     def _check_validation_for_export(self, export_type: str) -> bool:
         """
@@ -119,20 +292,24 @@ class ExportController:
         Get the current pivot DataFrame from pivot controller.
 
         Returns:
-            Pivot DataFrame or None if not available
+            (pivot_df, build_fn) - the full pivot DataFrame, or a function that
+            builds it on the export worker; (None, None) if not available
         """
         if not hasattr(self.app_controller, 'pivot_controller'):
             logger.warning("Pivot controller not available")
-            return None
+            return None, None
 
         pivot_controller = self.app_controller.pivot_controller
         if pivot_controller is None:
             logger.warning("Pivot controller is None")
-            return None
+            return None, None
+
+        pivot_df, build_fn = pivot_controller.export_pivot()
+        if build_fn is not None:
+            return None, build_fn
 
-        pivot_df = pivot_controller.export_pivot()
         if pivot_df is None or len(pivot_df) == 0:
             logger.warning("Pivot DataFrame is empty or None")
-            return None
+            return None, None
 
-        return pivot_df
+        return pivot_df, None
@@ -1,24 +1,45 @@
 """Controller for file operations."""
 
-from typing import List
+from typing import List, Optional
 
 from pivot_builder.config.logging_config import logger
-from pivot_builder.config.app_config import SUPPORTED_FILE_TYPES
+from pivot_builder.config.app_config import (
+    SUPPORTED_FILE_TYPES,
+    FILE_PREVIEW_ROWS,
+    PREFETCH_FULL_DATAFRAMES,
+)
 from pivot_builder.services.file_service import FileService
 from pivot_builder.services.sheet_detection_service import SheetDetectionService
+from pivot_builder.services.workbook_cache_service import WorkbookCacheService
+from pivot_builder.services.source_cache_service import SourceCacheService
 from pivot_builder.models.file_model import FileDescriptor, FileModel
 from pivot_builder.widgets.dialog_widgets import DialogWidgets
 
 
+# Delay used to coalesce file list redraws while many loads complete
+FILE_LIST_REFRESH_DELAY_MS = 50
+
+# Delay used to coalesce mapping rebuilds while many loads complete
+MAPPING_REBUILD_DELAY_MS = 150
+
+
 class FileController:
     """Handles file-related operations and UI updates."""
 
     def __init__(self, app_controller):
         self.app_controller = app_controller
-        self.file_service = FileService()
-        self.sheet_service = SheetDetectionService()
+        # One workbook cache shared by both services so each archive is parsed once
+        self.workbook_cache = WorkbookCacheService()
+        self.file_service = FileService(self.workbook_cache)
+        self.sheet_service = SheetDetectionService(self.workbook_cache)
+
+        # On-disk columnar cache of parsed sources (hit before any parsing)
+        self.source_cache = SourceCacheService()
         self.view = None
 
+        # In-flight background loads: file_id -> BackgroundTask
+        self._load_tasks = {}
+
     def set_view(self, view):
         """Set the view for this controller."""
         self.view = view
@@ -34,9 +55,22 @@ class FileController:
             logger.info("No files selected")
             return
 
-        # Process each selected file
-        for file_path in file_paths:
-            self.add_file(file_path)
+        self.add_files(file_paths)
+
+    def add_files(self, file_paths: List[str]):
+        """
+        Add several files; their loads run concurrently on the worker pool.
+
+        Args:
+            file_paths: Paths of the files to add
+        """
+        descriptors = [self._register_file(file_path) for file_path in file_paths]
+
+        # Show all files as pending before any parsing starts
+        self.refresh_file_list()
+
+        for descriptor in descriptors:
+            self.start_file_load(descriptor)
 
     def add_file(self, file_path: str):
         """
@@ -45,6 +79,18 @@ class FileController:
         Args:
             file_path: Path to the file to add
         """
+        self.add_files([file_path])
+
+    def _register_file(self, file_path: str) -> FileDescriptor:
+        """
+        Create a pending FileDescriptor for a path and register it.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            The registered FileDescriptor
+        """
         logger.info(f"Adding file: {file_path}")
 
         # Generate unique file ID
@@ -59,52 +105,344 @@ class FileController:
         # Add to app controller (registers in model)
         self.app_controller.register_file(descriptor)
 
-        # Load metadata based on file type
-        self.load_file_metadata(descriptor)
+        return descriptor
 
-        # Refresh UI
-        self.refresh_file_list()
+    def start_file_load(self, descriptor: FileDescriptor):
+        """
+        Load a file's metadata (and CSV data) on the worker pool.
+
+        The descriptor moves pending -> loading -> loaded/error; all updates
+        are applied on the Tk main thread.
+
+        Args:
+            descriptor: FileDescriptor to load
+        """
+        self.cancel_file_load(descriptor.id)
+
+        task = self.app_controller.run_in_background(
+            self._load_file_task,
+            str(descriptor.path),
+            descriptor.file_type,
+            key=f"load_file:{descriptor.id}",
+            on_success=lambda result: self._on_load_finished(descriptor, result),
+            on_error=lambda e: self._on_load_finished(descriptor, {'error': str(e)}),
+            on_progress=lambda *_: self._on_load_started(descriptor),
+            on_cancel=lambda: self._on_load_cancelled(descriptor)
+        )
+
+        if not task.future.done():
+            self._load_tasks[descriptor.id] = task
+        self._update_load_status()
+
+    def cancel_file_load(self, file_id: str) -> bool:
+        """
+        Cancel the in-flight load for a file, if any.
+
+        Args:
+            file_id: ID of the file
+
+        Returns:
+            True if a load was cancelled
+        """
+        task = self._load_tasks.pop(file_id, None)
+        if task is None:
+            return False
+
+        task.cancel()
+        logger.info(f"Cancelled load for file ID: {file_id}")
+        self._update_load_status()
+        return True
+
+    def cancel_all_loads(self):
+        """Cancel every in-flight file load."""
+        for file_id in list(self._load_tasks):
+            self.cancel_file_load(file_id)
+
+    def is_loading(self) -> bool:
+        """Check if any file loads are in flight."""
+        return bool(self._load_tasks)
 
     def load_file_metadata(self, descriptor: FileDescriptor):
         """
-        Load metadata for a file descriptor.
+        Load metadata for a file descriptor synchronously.
 
         Args:
             descriptor: FileDescriptor to populate with metadata
         """
-        logger.info(f"Loading metadata for {descriptor.filename}")
+        result = self._read_file(str(descriptor.path), descriptor.file_type)
+        self._apply_load_result(descriptor, result)
 
-        # Load metadata using file service
-        metadata, error = self.file_service.load_file_metadata(str(descriptor.path))
+    def _load_file_task(self, task, file_path: str, file_type: str) -> dict:
+        """
+        Worker-side file load (runs off the main thread; must not touch Tk).
+
+        Args:
+            task: BackgroundTask handle
+            file_path: Path to the file
+            file_type: "csv" or "xlsx"
 
+        Returns:
+            Load result dict (see _read_file)
+        """
+        task.report_progress('loading')
+        return self._read_file(file_path, file_type, task)
+
+    def _read_file(self, file_path: str, file_type: str, task=None) -> dict:
+        """
+        Read file metadata, and the header plus preview rows for CSVs.
+
+        The full CSV parse is deferred (see FileDescriptor.set_lazy_dataframe).
+
+        Args:
+            file_path: Path to the file
+            file_type: "csv" or "xlsx"
+            task: Optional BackgroundTask polled for cancellation
+
+        Returns:
+            Dict with 'metadata', 'preview' and 'error' keys
+        """
+        logger.info(f"Loading metadata for {file_path}")
+
+        result = {'metadata': None, 'preview': None, 'error': None}
+
+        # Load metadata using file service
+        metadata, error = self.file_service.load_file_metadata(file_path)
         if error:
+            result['error'] = error
+            return result
+        result['metadata'] = metadata
+
+        if file_type == 'csv':
+            if task is not None:
+                task.check_cancelled()
+
+            # For CSV, read only the preview rows now (reusing the sniffed dialect)
+            preview_df, preview_error = self.file_service.load_csv_dataframe(
+                file_path,
+                metadata.get('dialect'),
+                nrows=FILE_PREVIEW_ROWS
+            )
+            if preview_error:
+                result['error'] = preview_error
+            else:
+                result['preview'] = preview_df
+
+        return result
+
+    def _make_full_loader(self, file_path: str, sheet_name: Optional[str], load_fn):
+        """
+        Build the deferred loader for a file's full DataFrame.
+
+        Args:
+            file_path: Path to the source file
+            sheet_name: Sheet name for XLSX files (None for CSV)
+            load_fn: Callable taking a rows-read callback and returning
+                (dataframe, error_message) on a cache miss
+
+        Returns:
+            Callable loader(progress_callback, cancel_check) returning the
+            DataFrame (raises RuntimeError on failure, or whatever cancel_check
+            raises between chunks)
+        """
+        def loader(progress_callback=None, cancel_check=None):
+            def on_rows_read(row_count: int):
+                if cancel_check:
+                    cancel_check()
+                if progress_callback:
+                    progress_callback(row_count)
+
+            df, error = self._load_with_cache(file_path, sheet_name, lambda: load_fn(on_rows_read))
+
+            # A cancellation raised from on_rows_read surfaces as a load error
+            if cancel_check:
+                cancel_check()
+            if error:
+                raise RuntimeError(error)
+            return df
+
+        return loader
+
+    def _prefetch_dataframe(self, descriptor: FileDescriptor):
+        """
+        Parse a lazily-loaded file's full DataFrame on the worker pool.
+
+        Mapping and preview do not wait for this; consumers that need the data
+        first (e.g. building the combined dataset) share the same load.
+
+        Args:
+            descriptor: FileDescriptor with a deferred loader
+        """
+        if not PREFETCH_FULL_DATAFRAMES or descriptor.is_dataframe_loaded:
+            return
+
+        self.app_controller.run_in_background(
+            self._prefetch_task,
+            descriptor,
+            key=f"prefetch:{descriptor.id}",
+            on_success=lambda df: self._on_prefetched(descriptor, df),
+            on_error=lambda e: self._on_prefetch_failed(descriptor, str(e)),
+            on_progress=lambda row_count: self._on_prefetch_progress(descriptor, row_count),
+            on_cancel=self._update_load_status
+        )
+
+    def _prefetch_task(self, task, descriptor: FileDescriptor):
+        """Worker-side full parse, reporting rows read and stopping between chunks if cancelled."""
+        task.check_cancelled()
+        return descriptor.load_dataframe(task.report_progress, task.check_cancelled)
+
+    def _on_prefetch_progress(self, descriptor: FileDescriptor, row_count: int):
+        """Show full-parse progress (main thread)."""
+        if self._is_registered(descriptor):
+            sheet = f" [{descriptor.selected_sheet}]" if descriptor.selected_sheet else ""
+            self.app_controller.set_status(f"Loading {descriptor.filename}{sheet}: {row_count:,} rows read")
+
+    def _on_prefetched(self, descriptor: FileDescriptor, df):
+        """Refresh the file list once a background full parse finishes."""
+        self._update_load_status()
+        if not self._is_registered(descriptor):
+            return
+        if df is not None:
+            logger.info(f"Full data loaded: {descriptor.filename} with {len(df)} rows")
+        self._schedule_refresh()
+
+    def _on_prefetch_failed(self, descriptor: FileDescriptor, error: str):
+        """Mark a file whose full parse failed (main thread)."""
+        self._update_load_status()
+        if not self._is_registered(descriptor):
+            return
+        logger.error(f"Deferred load failed for {descriptor.filename}: {error}")
+        descriptor.set_load_failed(error)
+        self._schedule_refresh()
+
+    def _load_with_cache(self, file_path: str, sheet_name: Optional[str], load_fn):
+        """
+        Load a DataFrame through the source cache.
+
+        Args:
+            file_path: Path to the source file
+            sheet_name: Sheet name for XLSX files (None for CSV)
+            load_fn: Callable returning (dataframe, error_message) on a miss
+
+        Returns:
+            (dataframe, error_message)
+        """
+        # CSV engines and dtype optimization change the result, so they get separate entries
+        variant = self.file_service.get_load_variant('csv' if sheet_name is None else 'xlsx')
+
+        df = self.source_cache.get(file_path, sheet_name, variant)
+        if df is not None:
+            return df, None
+
+        df, error = load_fn()
+        if error is None:
+            self.source_cache.put(file_path, df, sheet_name, variant)
+        return df, error
+
+    def _apply_load_result(self, descriptor: FileDescriptor, result: dict):
+        """
+        Populate a descriptor from a load result (main thread).
+
+        Args:
+            descriptor: FileDescriptor to populate
+            result: Dict returned by _read_file
+        """
+        if result.get('error') and result.get('metadata') is None:
             # Set error status
-            descriptor.set_error(error)
-            logger.error(f"Failed to load {descriptor.filename}: {error}")
+            descriptor.set_error(result['error'])
+            logger.error(f"Failed to load {descriptor.filename}: {result['error']}")
             return
 
+        metadata = result['metadata']
+
         # Populate descriptor based on file type
         if descriptor.file_type == 'csv':
             descriptor.original_columns = metadata.get('columns', [])
+            descriptor.csv_dialect = metadata.get('dialect')
 
-            # For CSV, load DataFrame immediately
-            df, df_error = self.file_service.load_csv_dataframe(str(descriptor.path))
-            if df_error:
-                descriptor.set_error(df_error)
-                logger.error(f"Failed to load CSV DataFrame: {df_error}")
+            if result.get('error'):
+                descriptor.set_error(result['error'])
+                logger.error(f"Failed to load CSV preview: {result['error']}")
             else:
-                descriptor.set_dataframe(df)
+                file_path = str(descriptor.path)
+                dialect = descriptor.csv_dialect
+                descriptor.set_lazy_dataframe(
+                    self._make_full_loader(
+                        file_path,
+                        None,
+                        lambda on_rows_read: self.file_service.load_csv_dataframe(
+                            file_path, dialect, progress_callback=on_rows_read
+                        )
+                    ),
+                    list(result['preview'].columns),
+                    result['preview']
+                )
                 descriptor.needs_sheet_selection = False
                 descriptor.set_loaded()
-                logger.info(f"CSV fully loaded: {descriptor.filename} with {len(df)} rows, {len(df.columns)} columns")
+                logger.info(f"CSV header loaded: {descriptor.filename} with {len(descriptor.original_columns)} columns")
                 # Notify mapping controller of new file data
                 self._notify_mapping_changed()
+                self._prefetch_dataframe(descriptor)
 
         elif descriptor.file_type == 'xlsx':
             descriptor.available_sheets = metadata.get('sheets', [])
             descriptor.set_loaded()
             logger.info(f"XLSX metadata loaded: {descriptor.filename} with {len(descriptor.available_sheets)} sheets")
 
+    def _is_registered(self, descriptor: FileDescriptor) -> bool:
+        """Check the descriptor was not removed while its load was in flight."""
+        return self.app_controller.file_model.get_file(descriptor.id) is descriptor
+
+    def _on_load_started(self, descriptor: FileDescriptor):
+        """Handle a worker picking up a file load."""
+        if self._is_registered(descriptor):
+            descriptor.set_loading()
+            self._schedule_refresh()
+
+    def _forget_load_task(self, descriptor: FileDescriptor) -> bool:
+        """
+        Drop the descriptor's finished load task from the in-flight table.
+
+        Returns:
+            True if another load for the same file is still in flight
+        """
+        task = self._load_tasks.get(descriptor.id)
+        if task is not None and (task.is_cancelled or task.future.done()):
+            del self._load_tasks[descriptor.id]
+            task = None
+        return task is not None
+
+    def _on_load_finished(self, descriptor: FileDescriptor, result: dict):
+        """Apply a completed file load (drops results for removed files)."""
+        self._forget_load_task(descriptor)
+        if self._is_registered(descriptor):
+            self._apply_load_result(descriptor, result)
+            self._schedule_refresh()
+        self._update_load_status()
+
+    def _on_load_cancelled(self, descriptor: FileDescriptor):
+        """Mark a file whose load was cancelled."""
+        superseded = self._forget_load_task(descriptor)
+        if self._is_registered(descriptor) and not superseded and not descriptor.has_dataframe:
+            descriptor.set_error("Loading cancelled")
+            self._schedule_refresh()
+        self._update_load_status()
+
+    def _update_load_status(self):
+        """Report outstanding background loads in the status bar."""
+        remaining = len(self._load_tasks)
+        if remaining:
+            self.app_controller.set_status(f"Loading files... {remaining} remaining")
+        else:
+            self.app_controller.set_status("Ready")
+
+    def _schedule_refresh(self):
+        """Coalesce file list redraws while loads complete."""
+        self.app_controller.schedule_task(
+            'refresh_file_list',
+            FILE_LIST_REFRESH_DELAY_MS,
+            self.refresh_file_list
+        )
+
     def on_remove_file(self, file_id: str):
         """
         Handle remove file action.
@@ -114,9 +452,24 @@ class FileController:
         """
         logger.info(f"Removing file: {file_id}")
 
+        # Stop any in-flight load (or queued full-data prefetch) for this file
+        self.cancel_file_load(file_id)
+        self.app_controller.background_task_service.cancel_by_key(f"prefetch:{file_id}")
+
+        # Release the cached workbook handle unless another entry uses the same file
+        descriptor = self.app_controller.file_model.get_file(file_id)
+
         # Remove from model
         self.app_controller.file_model.remove_file(file_id)
 
+        if descriptor and descriptor.file_type == 'xlsx':
+            still_open = any(
+                fd.path == descriptor.path
+                for fd in self.app_controller.file_model.get_all_files()
+            )
+            if not still_open:
+                self.workbook_cache.invalidate(str(descriptor.path))
+
         # Notify mapping controller of file removal
         self._notify_mapping_changed()
 
@@ -152,25 +505,86 @@ class FileController:
             logger.error(f"File descriptor not found for ID: {file_id}")
             return
 
-        # Update selected sheet
+        # Update selected sheet; the previous sheet's full parse is no longer needed
         descriptor.selected_sheet = sheet_name
+        self.cancel_file_load(file_id)
+        self.app_controller.background_task_service.cancel_by_key(f"prefetch:{file_id}")
+
+        # Load DataFrame for the selected sheet on the worker pool
+        task = self.app_controller.run_in_background(
+            self._load_sheet_task,
+            str(descriptor.path),
+            sheet_name,
+            key=f"load_file:{descriptor.id}",
+            on_success=lambda df: self._on_sheet_loaded(descriptor, sheet_name, df, None),
+            on_error=lambda e: self._on_sheet_loaded(descriptor, sheet_name, None, str(e)),
+            on_progress=lambda stage, *args: self._on_sheet_progress(descriptor, stage, *args),
+            on_cancel=lambda: self._on_load_cancelled(descriptor)
+        )
+
+        if not task.future.done():
+            self._load_tasks[descriptor.id] = task
+        self._update_load_status()
+
+    def _load_sheet_task(self, task, file_path: str, sheet_name: str):
+        """
+        Worker-side XLSX sheet preview load (runs off the main thread).
 
-        # Load DataFrame for the selected sheet
-        df, error = self.file_service.load_xlsx_sheet(str(descriptor.path), sheet_name)
+        Only the header and preview rows are read here; the full sheet is
+        streamed by the deferred loader.
+
+        Returns:
+            DataFrame with the first FILE_PREVIEW_ROWS rows
+
+        Raises:
+            RuntimeError: If the sheet could not be loaded
+        """
+        task.report_progress('loading')
+
+        df, error = self.file_service.load_xlsx_sheet(file_path, sheet_name, nrows=FILE_PREVIEW_ROWS)
+
+        task.check_cancelled()
+        if error:
+            raise RuntimeError(error)
+        return df
+
+    def _on_sheet_progress(self, descriptor: FileDescriptor, stage: str):
+        """Mark a sheet load as started (main thread)."""
+        if stage == 'loading':
+            self._on_load_started(descriptor)
+
+    def _on_sheet_loaded(self, descriptor: FileDescriptor, sheet_name: str, df, error: Optional[str]):
+        """Apply a completed sheet load (main thread)."""
+        self._forget_load_task(descriptor)
+        self._update_load_status()
+
+        # Drop results for removed files or superseded sheet selections
+        if not self._is_registered(descriptor) or descriptor.selected_sheet != sheet_name:
+            return
 
         if error:
             descriptor.set_error(error)
             logger.error(f"Failed to load sheet '{sheet_name}': {error}")
         else:
-            descriptor.set_dataframe(df)
+            file_path = str(descriptor.path)
+            descriptor.set_lazy_dataframe(
+                self._make_full_loader(
+                    file_path,
+                    sheet_name,
+                    lambda on_rows_read: self.file_service.load_xlsx_sheet(file_path, sheet_name, on_rows_read)
+                ),
+                list(df.columns),
+                df
+            )
             descriptor.needs_sheet_selection = False
             descriptor.set_loaded()
-            logger.info(f"XLSX sheet fully loaded: {descriptor.filename}[{sheet_name}] with {len(df)} rows, {len(df.columns)} columns")
+            logger.info(f"XLSX sheet header loaded: {descriptor.filename}[{sheet_name}] with {len(df.columns)} columns")
             # Notify mapping controller of new file data
             self._notify_mapping_changed()
+            self._prefetch_dataframe(descriptor)
 
         # Refresh UI to update the file item widget
-        self.refresh_file_list()
+        self._schedule_refresh()
 
     def refresh_file_list(self):
         """Refresh the file list in the UI."""
@@ -187,6 +601,11 @@ class FileController:
         """
         if self.app_controller.mapping_controller:
             logger.debug("Notifying mapping controller of file changes")
-            self.app_controller.mapping_controller.rebuild_mapping_from_files()
+            # Debounced so a batch of completing loads triggers a single rebuild
+            self.app_controller.schedule_task(
+                'rebuild_mapping',
+                MAPPING_REBUILD_DELAY_MS,
+                self.app_controller.mapping_controller.rebuild_mapping_from_files
+            )
         else:
             logger.debug("Mapping controller not available for notification")
@@ -1,8 +1,10 @@
 """Controller for column mapping operations."""
 
+import copy
 from typing import Dict, List, Optional
 
 from pivot_builder.config.logging_config import logger
+from pivot_builder.services.background_task_service import TaskCancelledError
 from pivot_builder.services.column_matching_service import ColumnMatchingService
 from pivot_builder.services.column_normalization_service import ColumnNormalizationService
 from pivot_builder.models.mapping_model import ColumnMappingModel, MappingRule
@@ -32,6 +34,8 @@ class MappingController:
         self.matching_service = matching_service
         self.mapping_model = mapping_model
         self.view = None
+        self._build_task = None  # Running combined-dataset build, if any
+        self._build_generation = 0  # Bumped per build; stale results are dropped
 
     def set_view(self, view):
         """
@@ -154,11 +158,8 @@ class MappingController:
         if not self.app or not hasattr(self.app, 'files'):
             return []
 
-        # Return only files that have DataFrames loaded
-        return [
-            fd for fd in self.app.files.values()
-            if fd.has_dataframe and fd.dataframe is not None
-        ]
+        # Return only files with data available (without forcing deferred loads)
+        return [fd for fd in self.app.files.values() if fd.has_dataframe]
 
     def _gather_files_columns(self) -> Dict[str, List[str]]:
         """
@@ -174,11 +175,11 @@ class MappingController:
 
         # Get all file descriptors from files dictionary
         for file_desc in self.app.files.values():
-            # Only include files that have DataFrames loaded
-            if file_desc.dataframe is None:
+            # Only include files with data available; the header is enough here
+            if not file_desc.has_dataframe:
                 continue
 
-            files_columns[file_desc.id] = list(file_desc.dataframe.columns)
+            files_columns[file_desc.id] = list(file_desc.original_columns)
 
         logger.debug(f"Gathered columns from {len(files_columns)} files")
         return files_columns
@@ -188,10 +189,14 @@ class MappingController:
         Build combined dataset from all loaded files using current mappings.
 
         This method:
-        1. Gets all files with loaded DataFrames
-        2. Calls dataset_builder_service to merge them using canonical mappings
-        3. Stores result in app.combined_dataset
+        1. Gets all files with data available
+        2. On a worker, parses any files whose full DataFrame is still
+           deferred and calls dataset_builder_service to merge them using
+           canonical mappings
+        3. Stores result in app.combined_dataset (on the main thread)
         4. Triggers preview refresh
+
+        A build started while another is running supersedes it.
         """
         logger.info("Building combined dataset from current mappings")
 
@@ -212,33 +217,136 @@ class MappingController:
                     self.view.show_error("No files loaded. Please add and load files first.")
                 return
 
-            # Build combined dataset
-            combined_dataset = self.app.dataset_builder_service.build_combined_dataset(
-                files,
-                self.mapping_model
-            )
+            if self._build_task is not None:
+                self._build_task.cancel()
+                self._build_task = None
+            self._build_generation += 1
+            generation = self._build_generation
 
-            # Store in app controller
-            self.app.combined_dataset = combined_dataset
+            self.app.set_status("Building combined dataset...")
 
-            logger.info(
-                f"Combined dataset built: {combined_dataset.get_row_count()} rows, "
-                f"{len(combined_dataset.get_canonical_columns())} canonical columns"
+            # The worker gets its own copy; the UI keeps editing the mapping
+            task = self.app.run_in_background(
+                self._build_dataset_task,
+                files,
+                copy.deepcopy(self.mapping_model),
+                key="build_combined_dataset",
+                on_success=lambda result: self._on_dataset_built(generation, result),
+                on_error=lambda e: self._on_dataset_build_failed(generation, e),
+                on_progress=lambda *payload: self._on_dataset_build_progress(generation, *payload)
             )
 
-            # Refresh preview if available
-            if self.app.preview_controller:
-                self.app.preview_controller.refresh_combined_preview()
-
-            # Notify pivot controller of new available fields
-            if self.app.pivot_controller and self.app.pivot_controller.view:
-                self.app.pivot_controller.view.refresh_available_fields()
+            if not task.future.done():
+                self._build_task = task
 
         except Exception as e:
             logger.error(f"Error building combined dataset: {e}", exc_info=True)
             if self.view:
                 self.view.show_error(f"Failed to build combined dataset: {str(e)}")
 
+    def _build_dataset_task(self, task, files: List, mapping_model: ColumnMappingModel):
+        """
+        Worker-side combined dataset build.
+
+        Deferred loads run here with the task's progress and cancel callbacks.
+        A file that fails to load is left out and reported back rather than
+        marked on its descriptor, which the main thread owns.
+
+        Returns:
+            (CombinedDataset, [(FileDescriptor, error_message), ...])
+        """
+        loaded_files = []
+        failures = []
+        for file_desc in files:
+            task.check_cancelled()
+            try:
+                df = file_desc.load_dataframe(
+                    lambda row_count, name=file_desc.filename: task.report_progress('rows', name, row_count),
+                    task.check_cancelled
+                )
+            except TaskCancelledError:
+                raise
+            except Exception as e:
+                task.check_cancelled()  # Cancellation inside a loader can surface as a load error
+                failures.append((file_desc, str(e)))
+                continue
+            if df is not None:
+                loaded_files.append(file_desc)
+
+        task.check_cancelled()
+        task.report_progress('combining')
+        combined_dataset = self.app.dataset_builder_service.build_combined_dataset(
+            loaded_files,
+            mapping_model
+        )
+        return combined_dataset, failures
+
+    def _on_dataset_build_progress(self, generation: int, stage: str, filename: str = None, row_count: int = 0):
+        """Show combined dataset build progress (main thread)."""
+        if generation != self._build_generation:
+            return
+        if stage == 'rows':
+            self.app.set_status(f"Loading {filename}: {row_count:,} rows read")
+        else:
+            self.app.set_status("Building combined dataset...")
+
+    def _on_dataset_built(self, generation: int, result):
+        """Apply a finished combined dataset build (main thread; dropped if superseded)."""
+        if generation != self._build_generation:
+            logger.debug("Dropping combined dataset from a superseded build")
+            return
+        self._build_task = None
+
+        combined_dataset, failures = result
+        self._report_load_failures(failures)
+
+        # Store in app controller
+        self.app.combined_dataset = combined_dataset
+
+        # Cached pivots were built from the previous dataset
+        if self.app.pivot_controller:
+            self.app.pivot_controller.invalidate_cache()
+
+        logger.info(
+            f"Combined dataset built: {combined_dataset.get_row_count()} rows, "
+            f"{len(combined_dataset.get_canonical_columns())} canonical columns"
+        )
+        self.app.set_status("Ready")
+
+        # Refresh preview if available
+        if self.app.preview_controller:
+            self.app.preview_controller.refresh_combined_preview()
+
+        # Notify pivot controller of new available fields
+        if self.app.pivot_controller and self.app.pivot_controller.view:
+            self.app.pivot_controller.view.refresh_available_fields()
+
+        if failures and self.view:
+            names = ", ".join(file_desc.filename for file_desc, _ in failures)
+            self.view.show_error(f"Some files could not be loaded and were left out: {names}")
+
+    def _on_dataset_build_failed(self, generation: int, error: Exception):
+        """Report a failed combined dataset build (main thread)."""
+        if generation != self._build_generation:
+            return
+        self._build_task = None
+        logger.error(f"Error building combined dataset: {error}")
+        self.app.set_status("Ready")
+        if self.view:
+            self.view.show_error(f"Failed to build combined dataset: {str(error)}")
+
+    def _report_load_failures(self, failures: List):
+        """Mark files whose deferred load failed during a build (main thread)."""
+        if not failures:
+            return
+        for file_desc, message in failures:
+            # Skip files removed while the build ran
+            if self.app.file_model.get_file(file_desc.id) is file_desc:
+                logger.error(f"Deferred load failed for {file_desc.filename}: {message}")
+                file_desc.set_load_failed(message)
+        if self.app.file_controller:
+            self.app.file_controller.refresh_file_list()
+
     def export_mapping_config(self) -> dict:
         """
         Export current mapping configuration.
@@ -1,12 +1,19 @@
 """Controller for pivot table operations."""
 
-from typing import List, Dict, Optional
+import copy
+from typing import Callable, List, Dict, Optional, Tuple
 import pandas as pd
 
 from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import (
+    PIVOT_LIVE_DEBOUNCE_MS,
+    PIVOT_LIVE_SAMPLE_ROWS,
+    PIVOT_PAGE_SIZE,
+)
 from pivot_builder.models.pivot_model import PivotConfig, PivotValueField
 from pivot_builder.services.pivot_engine_service import PivotEngineService
 from pivot_builder.services.pivot_config_service import PivotConfigService
+from pivot_builder.services.pivot_cache_service import PivotCacheService
 
 
 class PivotController:
@@ -23,14 +30,23 @@ class PivotController:
         self.app = app_controller
         self.pivot_engine = pivot_engine_service
         self.config_service = PivotConfigService()
+        self.pivot_cache = PivotCacheService()
         self.view = None
 
-        # Current pivot configuration
-        self.config = PivotConfig()
+        # Current pivot configuration (the preview shows one page at a time)
+        self.config = PivotConfig(limit=PIVOT_PAGE_SIZE)
 
         # Latest pivot result
         self.pivot_df = None
 
+        # Background build state: results from an older generation are dropped
+        self._build_generation = 0
+        self._build_task = None
+        self._build_key = None  # (dataset version, config fingerprint) of the running build
+
+        # Live mode: configuration edits schedule a debounced rebuild
+        self.live_mode = False
+
     def set_view(self, view):
         """Set the view for this controller."""
         self.view = view
@@ -44,6 +60,7 @@ class PivotController:
         """
         logger.info(f"Updating rows: {rows}")
         self.config.rows = rows.copy()
+        self._on_config_changed()
 
     def update_columns(self, columns: List[str]):
         """
@@ -54,6 +71,7 @@ class PivotController:
         """
         logger.info(f"Updating columns: {columns}")
         self.config.columns = columns.copy()
+        self._on_config_changed()
 
     def update_values(self, values: List[PivotValueField]):
         """
@@ -64,6 +82,7 @@ class PivotController:
         """
         logger.info(f"Updating values: {values}")
         self.config.values = values.copy()
+        self._on_config_changed()
 
     def update_filters(self, filters: Dict[str, List[str]]):
         """
@@ -74,19 +93,28 @@ class PivotController:
         """
         logger.info(f"Updating filters: {filters}")
         self.config.filters = filters.copy()
+        self._on_config_changed()
 
-    def rebuild_pivot(self):
+    def rebuild_pivot(self, reset_page: bool = False, sample_first: bool = False):
         """
         Rebuild the pivot table using current configuration.
 
+        Args:
+            reset_page: Go back to the first page (e.g. after a configuration change)
+            sample_first: Show an approximate result from a sample of
+                PIVOT_LIVE_SAMPLE_ROWS rows before the exact one
+
         This method:
         1. Gets the combined dataset from app controller
-        2. Calls pivot engine to build pivot
-        3. Stores result
+        2. Starts the pivot engine on a worker (cached results apply immediately)
+        3. Stores the result on the main thread, unless a newer build superseded it
         4. Notifies view to refresh
         """
         logger.info("Rebuilding pivot table")
 
+        if reset_page:
+            self.config.offset = 0
+
         try:
             # Get combined dataset
             if not hasattr(self.app, 'combined_dataset'):
@@ -97,7 +125,7 @@ class PivotController:
 
             combined_dataset = self.app.combined_dataset
 
-            if combined_dataset.df is None or len(combined_dataset.df) == 0:
+            if combined_dataset.get_row_count() == 0:
                 logger.warning("Combined dataset is empty")
                 if self.view:
                     self.view.show_error("Combined dataset is empty. Please load files and build dataset.")
@@ -110,25 +138,277 @@ class PivotController:
                     self.view.show_error("Please add at least one value field with aggregation.")
                 return
 
-            # Build pivot
-            self.pivot_df = self.pivot_engine.build_pivot(combined_dataset.df, self.config)
+            # Nothing to do if this exact build is already running
+            build_key = (combined_dataset.version, self.pivot_cache.fingerprint(self.config))
+            if self._build_task is not None and build_key == self._build_key:
+                logger.debug("Pivot build for this configuration already running")
+                return
 
-            if self.pivot_df is not None and len(self.pivot_df) > 0:
-                logger.info(f"Pivot rebuilt successfully: {self.pivot_df.shape}")
+            # Any build still running is for an older configuration
+            self._supersede_build()
+            generation = self._build_generation
 
-                # Notify view to refresh
-                if self.view:
-                    self.view.load_pivot_preview(self.pivot_df)
-            else:
-                logger.warning("Pivot result is empty")
-                if self.view:
-                    self.view.show_error("Pivot result is empty. Check configuration and data.")
+            # Build pivot (only the current page is materialized)
+            cached = self.pivot_cache.get(combined_dataset.version, self.config)
+            if cached is not None:
+                self._apply_pivot_result(cached)
+                return
+
+            # The worker gets its own copy; the UI keeps editing self.config
+            self._build_key = build_key
+            self._start_build(
+                combined_dataset,
+                copy.deepcopy(self.config),
+                generation,
+                PIVOT_LIVE_SAMPLE_ROWS if sample_first else None
+            )
 
         except Exception as e:
             logger.error(f"Error rebuilding pivot: {e}", exc_info=True)
             if self.view:
                 self.view.show_error(f"Failed to build pivot: {str(e)}")
 
+    def _start_build(
+        self,
+        combined_dataset,
+        config: PivotConfig,
+        generation: int,
+        sample_rows: Optional[int] = None,
+        status: Optional[str] = None
+    ):
+        """
+        Run one build pass on a worker.
+
+        Args:
+            combined_dataset: CombinedDataset to pivot
+            config: Snapshot of the configuration to build
+            generation: Build generation the result belongs to
+            sample_rows: Build an approximate result from about this many rows
+            status: Status bar message while the pass runs
+        """
+        self.app.set_status(status or ("Building pivot preview..." if sample_rows else "Building pivot..."))
+        if self.view:
+            self.view.set_building(True)
+
+        task = self.app.run_in_background(
+            self._build_task_fn,
+            combined_dataset,
+            config,
+            sample_rows,
+            key="pivot",
+            on_success=lambda pivot_df: self._on_build_done(generation, combined_dataset, config, pivot_df),
+            on_error=lambda error: self._on_build_failed(generation, error),
+            on_progress=lambda done, total: self._on_build_progress(generation, done, total),
+            on_cancel=lambda: self._on_build_cancelled(generation)
+        )
+        if generation == self._build_generation and not task.future.done():
+            self._build_task = task
+
+    def set_live_mode(self, enabled: bool):
+        """
+        Turn live preview on or off.
+
+        In live mode every configuration edit schedules a debounced rebuild
+        that shows an approximate result from a sample first, then the exact one.
+
+        Args:
+            enabled: True to rebuild automatically
+        """
+        logger.info(f"Live pivot preview {'enabled' if enabled else 'disabled'}")
+        self.live_mode = enabled
+        self._on_config_changed()
+
+    def _on_config_changed(self):
+        """Schedule a debounced live rebuild after a configuration edit."""
+        if self.live_mode:
+            self.app.schedule_task("pivot_live", PIVOT_LIVE_DEBOUNCE_MS, self._live_rebuild)
+
+    def _live_rebuild(self):
+        """Rebuild for live mode, skipping configurations that are still incomplete."""
+        if not self.live_mode:
+            return
+
+        # Half-built configurations are normal while editing; wait silently
+        combined_dataset = getattr(self.app, 'combined_dataset', None)
+        if combined_dataset is None or not self.config.is_valid() or combined_dataset.get_row_count() == 0:
+            return
+
+        self.rebuild_pivot(reset_page=True, sample_first=True)
+
+    def cancel_build(self):
+        """Cancel the running pivot build, if any; its result will be discarded."""
+        if self._build_task is None:
+            return
+        logger.info("Cancelling pivot build")
+        self._supersede_build()
+        self.app.set_status("Pivot build cancelled")
+
+    def is_building(self) -> bool:
+        """Check if a pivot build is running."""
+        return self._build_task is not None
+
+    def _supersede_build(self):
+        """
+        Start a new build generation, cancelling the running build.
+
+        The cancelled build's callbacks are dropped, so the view is taken out
+        of its building state here; a build started next sets it again.
+        """
+        self._build_generation += 1
+        self._build_key = None
+        if self._build_task is not None:
+            self._build_task.cancel()
+            self._build_task = None
+            if self.view:
+                self.view.set_building(False)
+
+    def _build_task_fn(
+        self,
+        task,
+        combined_dataset,
+        config: PivotConfig,
+        sample_rows: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Build a pivot on a worker thread."""
+        task.check_cancelled()
+        return self.pivot_engine.build_pivot_from_dataset(
+            combined_dataset,
+            config,
+            cancel_check=task.check_cancelled,
+            progress_callback=task.report_progress,
+            sample_rows=sample_rows
+        )
+
+    def _on_build_done(self, generation: int, combined_dataset, config: PivotConfig, pivot_df):
+        """Apply a finished build on the main thread (dropped if superseded)."""
+        if generation != self._build_generation:
+            logger.debug("Dropping pivot result from a superseded build")
+            return
+
+        self._build_task = None
+
+        sample_fraction = pivot_df.attrs.get('sample_fraction') if pivot_df is not None else None
+        if sample_fraction is not None:
+            # Show the approximate result (never cached), then refine it
+            if len(pivot_df) > 0:
+                self.pivot_df = pivot_df
+                if self.view:
+                    self.view.load_pivot_preview(pivot_df)
+            self._start_build(
+                combined_dataset,
+                config,
+                generation,
+                status=f"Approximate preview from a {sample_fraction:.1%} sample; computing exact result..."
+            )
+            return
+
+        self._build_key = None
+        if self.view:
+            self.view.set_building(False)
+
+        if pivot_df is not None and len(pivot_df) > 0:
+            self.pivot_cache.put(combined_dataset.version, config, pivot_df)
+        self._apply_pivot_result(pivot_df)
+
+    def _on_build_failed(self, generation: int, error: Exception):
+        """Report a failed build on the main thread (ignored if superseded)."""
+        if generation != self._build_generation:
+            return
+
+        self._build_task = None
+        self._build_key = None
+        logger.error(f"Error rebuilding pivot: {error}")
+        self.app.set_status("Pivot build failed")
+        if self.view:
+            self.view.set_building(False)
+            self.view.show_error(f"Failed to build pivot: {str(error)}")
+
+    def _on_build_progress(self, generation: int, done: int, total: int):
+        """Show build progress in the status bar."""
+        if generation == self._build_generation:
+            self.app.set_status(f"Building pivot... ({done}/{total})")
+
+    def _on_build_cancelled(self, generation: int):
+        """Log a cancelled build once its worker has stopped."""
+        logger.debug(f"Pivot build {generation} stopped after cancellation")
+
+    def _apply_pivot_result(self, pivot_df):
+        """Store a pivot result and refresh the view."""
+        self.pivot_df = pivot_df
+
+        if self.pivot_df is not None and len(self.pivot_df) > 0:
+            logger.info(f"Pivot rebuilt successfully: {self.pivot_df.shape}")
+            self.app.set_status(f"Pivot built: {len(self.pivot_df):,} rows")
+
+            # Notify view to refresh
+            if self.view:
+                self.view.load_pivot_preview(self.pivot_df)
+        else:
+            logger.warning("Pivot result is empty")
+            self.app.set_status("Pivot result is empty")
+            if self.view and self.live_mode:
+                # No dialog on every edit; say it in the table instead
+                self.view.show_pivot_message("Pivot result is empty.\n\nCheck your configuration and filters.")
+            elif self.view:
+                self.view.show_error("Pivot result is empty. Check configuration and data.")
+
+    def set_sort(self, sort_by: Optional[str], ascending: bool = True):
+        """
+        Sort the pivot result by a result column or row field.
+
+        Args:
+            sort_by: Column name, or None for the default (row key) order
+            ascending: Sort direction
+        """
+        logger.info(f"Sorting pivot by {sort_by} ({'ascending' if ascending else 'descending'})")
+        self.config.sort_by = sort_by or None
+        self.config.sort_ascending = ascending
+        self.config.offset = 0
+        self._on_config_changed()
+
+    def set_top_n(self, top_n: Optional[int]):
+        """
+        Keep only the first N rows of the sorted result.
+
+        Args:
+            top_n: Row count, or None for all rows
+        """
+        logger.info(f"Setting pivot top-N: {top_n}")
+        self.config.top_n = top_n
+        self.config.offset = 0
+        self._on_config_changed()
+
+    def next_page(self):
+        """Show the next page of the pivot result."""
+        start, stop, total = self.get_page_info()
+        if self.config.limit and stop < total:
+            self.config.offset = start + self.config.limit
+            self.rebuild_pivot()
+
+    def previous_page(self):
+        """Show the previous page of the pivot result."""
+        if self.config.limit and self.config.offset > 0:
+            self.config.offset = max(0, self.config.offset - self.config.limit)
+            self.rebuild_pivot()
+
+    def get_page_info(self) -> tuple:
+        """
+        Get the position of the displayed page.
+
+        Returns:
+            (first row, row after the last, total rows) - zero-based, (0, 0, 0) if no pivot
+        """
+        if self.pivot_df is None:
+            return 0, 0, 0
+        total = self.pivot_df.attrs.get('total_rows', len(self.pivot_df))
+        start = min(self.config.offset, total)
+        return start, start + len(self.pivot_df), total
+
+    def invalidate_cache(self):
+        """Drop cached pivot results (call when the combined dataset is rebuilt)."""
+        self.pivot_cache.invalidate()
+        logger.debug("Pivot result cache invalidated")
+
     def get_available_fields(self) -> List[str]:
         """
         Get list of available field names from combined dataset.
@@ -141,9 +421,6 @@ class PivotController:
 
         combined_dataset = self.app.combined_dataset
 
-        if combined_dataset.df is None:
-            return []
-
         # Get canonical columns (excludes __source_file etc.)
         return combined_dataset.get_canonical_columns()
 
@@ -151,26 +428,31 @@ class PivotController:
         """Add a field to rows."""
         self.config.add_row(field)
         logger.debug(f"Added row field: {field}")
+        self._on_config_changed()
 
     def remove_row_field(self, field: str):
         """Remove a field from rows."""
         self.config.remove_row(field)
         logger.debug(f"Removed row field: {field}")
+        self._on_config_changed()
 
     def add_column_field(self, field: str):
         """Add a field to columns."""
         self.config.add_column(field)
         logger.debug(f"Added column field: {field}")
+        self._on_config_changed()
 
     def remove_column_field(self, field: str):
         """Remove a field from columns."""
         self.config.remove_column(field)
         logger.debug(f"Removed column field: {field}")
+        self._on_config_changed()
 
     def add_value_field(self, column: str, aggregation: str):
         """Add a value field with aggregation."""
         self.config.add_value(column, aggregation)
         logger.debug(f"Added value field: {column} ({aggregation})")
+        self._on_config_changed()
 
     def remove_value_field(self, index: int):
         """Remove a value field by index."""
@@ -178,21 +460,56 @@ class PivotController:
             removed = self.config.values[index]
             self.config.remove_value(index)
             logger.debug(f"Removed value field at index {index}: {removed}")
+            self._on_config_changed()
 
     def clear_configuration(self):
         """Clear all pivot configuration."""
+        self.cancel_build()
         self.config.clear_all()
         self.pivot_df = None
         logger.info("Pivot configuration cleared")
 
-    def export_pivot(self) -> Optional[pd.DataFrame]:
+    def export_pivot(self) -> Tuple[Optional[pd.DataFrame], Optional[Callable]]:
         """
-        Export the current pivot DataFrame.
+        Get the current pivot for export.
+
+        The preview only holds one page (or, in live mode, may still be an
+        approximate result), so the full exact result may have to be built.
+        That is as costly as the pivot itself, so it is not built here on the
+        UI thread; a build function is returned for the export worker instead.
 
         Returns:
-            Current pivot DataFrame or None
+            (pivot_df, None) when the full result is already available, or
+            (None, build_fn) where build_fn(cancel_check, progress_callback)
+            builds it; (None, None) if there is no pivot
         """
-        return self.pivot_df
+        if self.pivot_df is None:
+            return None, None
+
+        approximate = 'sample_fraction' in self.pivot_df.attrs
+        if self.config.limit is None and not self.config.offset and not approximate:
+            return self.pivot_df, None
+
+        combined_dataset = getattr(self.app, 'combined_dataset', None)
+        if combined_dataset is None:
+            return (None, None) if approximate else (self.pivot_df, None)
+
+        # The worker gets its own copy; the UI keeps editing self.config
+        config = copy.deepcopy(self.config.without_paging())
+        cached = self.pivot_cache.get(combined_dataset.version, config)
+        if cached is not None:
+            return cached, None
+
+        def build(cancel_check=None, progress_callback=None) -> pd.DataFrame:
+            logger.info("Building full pivot result for export")
+            return self.pivot_engine.build_pivot_from_dataset(
+                combined_dataset,
+                config,
+                cancel_check=cancel_check,
+                progress_callback=progress_callback
+            )
+
+        return None, build
 
     def save_config(self, path: str) -> bool:
         """
@@ -230,8 +547,11 @@ class PivotController:
         loaded_config = self.config_service.load(path)
 
         if loaded_config:
+            if loaded_config.limit is None:
+                loaded_config.limit = PIVOT_PAGE_SIZE
             self.config = loaded_config
             logger.info("Pivot configuration loaded successfully")
+            self._on_config_changed()
 
             # Refresh view to show loaded configuration
             if self.view:
@@ -110,14 +110,14 @@ class PreviewController:
 
         combined_dataset = self.app_controller.combined_dataset
 
-        if combined_dataset.df is None or len(combined_dataset.df) == 0:
+        if combined_dataset.get_row_count() == 0:
             logger.warning("Combined dataset is empty")
             if self.view:
                 self.view.load_combined_preview(None)
             return
 
-        # Get preview (first n rows)
-        preview_df = combined_dataset.df.head(n_rows)
+        # Get preview (first n rows, reading only the leading partitions)
+        preview_df = combined_dataset.head(n_rows)
 
         # Send to view
         if self.view:
@@ -126,3 +126,32 @@ class PreviewController:
                 f"Combined preview loaded: {len(preview_df)} rows, "
                 f"{len(preview_df.columns)} columns"
             )
+
+    def export_combined(self, path: str, on_done=None) -> bool:
+        """
+        Export the combined dataset in the background (format from the file extension).
+
+        Args:
+            path: File path to save to
+            on_done: Called with True/False when the export finishes
+
+        Returns:
+            True if the export was started, False otherwise
+        """
+        export_controller = getattr(self.app_controller, 'export_controller', None)
+        if export_controller is None:
+            logger.error("Export controller not available")
+            return False
+        return export_controller.export_combined(path, on_done=on_done)
+
+    def cancel_export(self) -> bool:
+        """
+        Cancel the running export, if any.
+
+        Returns:
+            True if an export was cancelled
+        """
+        export_controller = getattr(self.app_controller, 'export_controller', None)
+        if export_controller is None:
+            return False
+        return export_controller.cancel_export()
@@ -49,6 +49,8 @@ def main():
     mapping_controller.set_view(main_window.mapping_view)
     preview_controller.set_view(main_window.preview_view)
     pivot_controller.set_view(main_window.pivot_view)
+    export_controller.add_view(main_window.pivot_view)
+    export_controller.add_view(main_window.preview_view)
 
     logger.info("Application initialized successfully")
 
@@ -1,7 +1,17 @@
 """Model for dataset management."""
 
+import itertools
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+
+# Metadata column naming each row's source file (categorical)
+SOURCE_FILE_COLUMN = '__source_file'
+
+# Process-wide counter so every dataset build gets a distinct version
+_dataset_versions = itertools.count(1)
 
 
 @dataclass
@@ -14,11 +24,21 @@ class PerFileDataset:
         df: The pandas DataFrame for this file (after mapping applied)
         column_mapping: Mapping from original column names to canonical names
         effective_columns: List of canonical field names included from this file
+        data_version: FileDescriptor.data_version the projection was built from
+        fingerprint: Inputs the projection was built from (see DatasetBuilderService)
+        source_name: Value of the __source_file column for this file's rows
+        row_start: Offset of this file's first row in the combined dataset
+        row_stop: Offset just past this file's last row in the combined dataset
     """
     file_id: str
     df: object = None  # pandas DataFrame
     column_mapping: Dict[str, str] = field(default_factory=dict)  # original → canonical
     effective_columns: List[str] = field(default_factory=list)  # canonical fields included
+    data_version: int = 0
+    fingerprint: Optional[tuple] = None
+    source_name: str = ""
+    row_start: int = 0
+    row_stop: int = 0
 
 
 @dataclass
@@ -26,12 +46,141 @@ class CombinedDataset:
     """
     Represents the combined dataset from all files.
 
+    The per-file frames in source_metadata are the dataset's partitions. The
+    concatenated frame is only built when df is first accessed; consumers that
+    can work partition by partition (pivoting, previews, exports) should use
+    iter_partitions/head/get_row_count instead.
+
     Attributes:
-        df: The merged pandas DataFrame with aligned canonical columns
+        df: The merged pandas DataFrame with aligned canonical columns (built on demand)
         source_metadata: List of PerFileDataset objects tracking per-file contributions
+        version: Distinct per build; changes whenever the data is replaced
     """
-    df: object = None  # pandas DataFrame
+    _df: object = field(default=None, repr=False)  # pandas DataFrame, see df property
     source_metadata: List[PerFileDataset] = field(default_factory=list)
+    version: int = field(default_factory=lambda: next(_dataset_versions))
+
+    def __init__(
+        self,
+        df=None,
+        source_metadata: Optional[List[PerFileDataset]] = None,
+        version: Optional[int] = None
+    ):
+        """
+        Initialize the dataset.
+
+        Args:
+            df: Merged DataFrame, if already built (otherwise built from the partitions on demand)
+            source_metadata: Per-file contributions (the dataset's partitions)
+            version: Dataset version (a new distinct version if None)
+        """
+        self._df = df
+        self.source_metadata = source_metadata if source_metadata is not None else []
+        self.version = version if version is not None else next(_dataset_versions)
+
+    @property
+    def df(self):
+        """Get the concatenated DataFrame, building it from the partitions on first access."""
+        if self._df is None:
+            partitions = [meta.df for meta in self.source_metadata if meta.df is not None]
+            if partitions:
+                self._df = pd.concat(partitions, ignore_index=True) if len(partitions) > 1 else partitions[0]
+        return self._df
+
+    @df.setter
+    def df(self, value):
+        self._df = value
+        self.version = next(_dataset_versions)
+
+    @property
+    def is_materialized(self) -> bool:
+        """Check if the concatenated DataFrame has been built."""
+        return self._df is not None
+
+    def iter_partitions(self):
+        """
+        Iterate over the dataset's partitions without concatenating them.
+
+        Yields:
+            pandas DataFrames (the concatenated frame if it was set directly)
+        """
+        if self._df is not None:
+            yield self._df
+            return
+        for meta in self.source_metadata:
+            if meta.df is not None:
+                yield meta.df
+
+    def iter_source_partitions(self) -> Iterator[Tuple[PerFileDataset, object]]:
+        """
+        Iterate over (source metadata, rows) pairs, one per source file.
+
+        Rows come from the partition itself, or from a row-range slice of the
+        concatenated frame once it has been built.
+
+        Yields:
+            (PerFileDataset, pandas DataFrame)
+        """
+        if not self.source_metadata and self._df is not None:
+            # Frame set directly, without per-source metadata
+            yield PerFileDataset(file_id="", df=self._df, row_stop=len(self._df)), self._df
+            return
+
+        for meta in self.source_metadata:
+            if self._df is not None:
+                yield meta, self._df.iloc[meta.row_start:meta.row_stop]
+            elif meta.df is not None:
+                yield meta, meta.df
+
+    def get_source_row_range(self, file_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Get the (start, stop) row offsets of a source file in the combined dataset.
+
+        Args:
+            file_id: Source file ID
+
+        Returns:
+            (start, stop) tuple, or None if the file is not part of the dataset
+        """
+        for meta in self.source_metadata:
+            if meta.file_id == file_id:
+                return meta.row_start, meta.row_stop
+        return None
+
+    def get_rows_for_source(self, file_id: str):
+        """
+        Get a source file's rows without scanning the source column.
+
+        Args:
+            file_id: Source file ID
+
+        Returns:
+            pandas DataFrame, or None if the file is not part of the dataset
+        """
+        for meta, rows in self.iter_source_partitions():
+            if meta.file_id == file_id:
+                return rows
+        return None
+
+    def get_source_row_counts(self) -> Dict[str, int]:
+        """
+        Get the number of rows contributed by each source file.
+
+        Returns:
+            Dict mapping source name -> row count
+        """
+        return {meta.source_name: meta.row_stop - meta.row_start for meta in self.source_metadata}
+
+    def get_columns(self) -> List[str]:
+        """
+        Get all column names in concatenation order.
+
+        Returns:
+            List of column names (including metadata columns)
+        """
+        return list(dict.fromkeys(
+            col for partition in self.iter_partitions() for col in partition.columns
+        ))
 
     def get_canonical_columns(self) -> List[str]:
         """
@@ -40,11 +189,8 @@ class CombinedDataset:
         Returns:
             List of column names (excluding metadata columns like __source_file)
         """
-        if self.df is None:
-            return []
-
         # Filter out metadata columns
-        return [col for col in self.df.columns if not col.startswith('__')]
+        return [col for col in self.get_columns() if not col.startswith('__')]
 
     def get_row_count(self) -> int:
         """
@@ -53,9 +199,34 @@ class CombinedDataset:
         Returns:
             Number of rows
         """
-        if self.df is None:
-            return 0
-        return len(self.df)
+        return sum(len(partition) for partition in self.iter_partitions())
+
+    def head(self, n: int):
+        """
+        Get the first n rows, reading only as many partitions as needed.
+
+        Args:
+            n: Number of rows
+
+        Returns:
+            pandas DataFrame, or None if the dataset has no partitions
+        """
+        columns = self.get_columns()
+        if not columns:
+            return None
+
+        pieces = []
+        remaining = n
+        for partition in self.iter_partitions():
+            if remaining <= 0:
+                break
+            piece = partition.head(remaining)
+            pieces.append(piece)
+            remaining -= len(piece)
+
+        if not pieces:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(pieces, ignore_index=True).reindex(columns=columns)
 
     def get_file_count(self) -> int:
         """
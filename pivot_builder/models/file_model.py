@@ -1,9 +1,13 @@
 """Model for file management."""
 
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Optional, List
+import threading
 import uuid
 
+from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import FILE_PREVIEW_ROWS
+
 
 class FileDescriptor:
     """Descriptor for a loaded file with metadata."""
@@ -15,14 +19,75 @@ class FileDescriptor:
         self.available_sheets = []  # When XLSX
         self.selected_sheet = None
         self.original_columns = []  # For CSV header preview
-        self.status = "pending"     # pending | loaded | error
+        self.csv_dialect = None     # Sniffed CSV dialect (delimiter, quoting)
+        self.status = "pending"     # pending | loading | loaded | error
         self.error_message = None
 
         # DataFrame and preview
-        self.dataframe = None  # The full pandas DataFrame
+        self._dataframe = None  # The full pandas DataFrame (see dataframe property)
+        self._loader = None  # Callable producing the full DataFrame on first access
+        self._load_lock = threading.Lock()  # Held for a whole load, so callers share it
+        self._state_lock = threading.Lock()  # Held briefly to swap the loader/DataFrame
+        self.row_count = None  # Known once the full DataFrame is loaded
+        self.data_version = 0  # Bumped whenever the underlying data is replaced
         self.preview_rows = None  # Cached preview (head N rows)
         self.needs_sheet_selection = (file_type == "xlsx")  # XLSX needs sheet selection
 
+    @property
+    def dataframe(self):
+        """
+        Get the full DataFrame, running the deferred loader on first access.
+
+        Concurrent callers (e.g. a background prefetch and a dataset build)
+        share a single load. Returns None if no data is available or the
+        deferred load failed; the failure is only logged here, since this may
+        run on a worker thread (see load_dataframe and set_load_failed).
+        """
+        try:
+            return self.load_dataframe()
+        except Exception as e:
+            logger.error(f"Deferred load failed for {self.filename}: {e}")
+            return None
+
+    def load_dataframe(self, progress_callback: Optional[Callable] = None, cancel_check: Optional[Callable] = None):
+        """
+        Get the full DataFrame, running the deferred loader if needed.
+
+        Concurrent callers share a single load. A failed or cancelled load
+        leaves the descriptor untouched, so the caller decides how to report it.
+
+        Args:
+            progress_callback: Passed to the loader; called with rows read so far
+            cancel_check: Passed to the loader; raises to abort between chunks
+
+        Returns:
+            DataFrame, or None if no data is available (or the data was
+            replaced while this load ran)
+
+        Raises:
+            Whatever the deferred loader raised
+        """
+        if self._dataframe is None and self._loader is not None:
+            with self._load_lock:
+                loader = self._loader
+                if self._dataframe is None and loader is not None:
+                    df = loader(progress_callback, cancel_check)
+                    with self._state_lock:
+                        # Drop the result if set_lazy_dataframe replaced the loader meanwhile
+                        if self._loader is loader:
+                            self._loader = None
+                            self._dataframe = df
+                            self.row_count = len(df)
+        return self._dataframe
+
+    @dataframe.setter
+    def dataframe(self, df):
+        with self._state_lock:
+            self._dataframe = df
+            self._loader = None
+            self.data_version += 1
+            self.row_count = len(df) if df is not None else None
+
     @property
     def filename(self) -> str:
         """Get the filename without path."""
@@ -35,14 +100,34 @@ class FileDescriptor:
 
     @property
     def has_dataframe(self) -> bool:
-        """Check if DataFrame is loaded."""
-        return self.dataframe is not None
+        """Check if data is available (loaded, or loadable on first access)."""
+        return self._dataframe is not None or self._loader is not None
+
+    @property
+    def is_dataframe_loaded(self) -> bool:
+        """Check if the full DataFrame has actually been parsed."""
+        return self._dataframe is not None
 
     def set_error(self, message: str):
         """Set error status with message."""
         self.status = "error"
         self.error_message = message
 
+    def set_load_failed(self, message: str):
+        """
+        Set error status after the deferred full load failed (drops the loader).
+
+        Call on the main thread; workers report load failures back instead.
+        """
+        with self._state_lock:
+            self._loader = None
+        self.set_error(message)
+
+    def set_loading(self):
+        """Set loading status (a worker is reading the file)."""
+        self.status = "loading"
+        self.error_message = None
+
     def set_loaded(self):
         """Set loaded status."""
         self.status = "loaded"
@@ -60,15 +145,35 @@ class FileDescriptor:
             self.original_columns = list(df.columns)
             self.generate_preview()
 
-    def generate_preview(self, n_rows: int = 50):
+    def set_lazy_dataframe(self, loader: Callable, columns: List[str], preview_df):
+        """
+        Defer the full DataFrame load until it is first accessed.
+
+        Mapping and preview work from the header and preview rows alone.
+
+        Args:
+            loader: Callable returning the full DataFrame (raises on failure)
+            columns: Column names read from the header
+            preview_df: DataFrame with the first rows of the file
+        """
+        # Not _load_lock: that would wait for an in-flight load of the old data
+        with self._state_lock:
+            self._dataframe = None
+            self._loader = loader
+            self.row_count = None
+            self.data_version += 1
+        self.original_columns = list(columns)
+        self.preview_rows = preview_df
+
+    def generate_preview(self, n_rows: int = FILE_PREVIEW_ROWS):
         """
         Generate a preview of the first N rows.
 
         Args:
             n_rows: Number of rows to include in preview
         """
-        if self.dataframe is not None:
-            self.preview_rows = self.dataframe.head(n_rows)
+        if self._dataframe is not None:
+            self.preview_rows = self._dataframe.head(n_rows)
 
 
 class FileModel:
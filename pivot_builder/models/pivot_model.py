@@ -1,7 +1,7 @@
 """Model for pivot table configuration."""
 
-from dataclasses import dataclass, field
-from typing import List, Dict
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Optional
 
 
 @dataclass
@@ -33,11 +33,21 @@ class PivotConfig:
         columns: List of column names to use as column dimensions
         values: List of PivotValueField objects defining aggregations
         filters: Dict mapping column names to list of allowed values
+        sort_by: Result column (flattened name) or row field to sort by
+        sort_ascending: Sort direction for sort_by
+        top_n: Keep only the first N rows of the (sorted) result
+        limit: Page size; only this many rows are materialized (None for all)
+        offset: First row of the page within the (top-N) result
     """
     rows: List[str] = field(default_factory=list)
     columns: List[str] = field(default_factory=list)
     values: List[PivotValueField] = field(default_factory=list)
     filters: Dict[str, List[str]] = field(default_factory=dict)
+    sort_by: Optional[str] = None
+    sort_ascending: bool = True
+    top_n: Optional[int] = None
+    limit: Optional[int] = None
+    offset: int = 0
 
     def is_valid(self) -> bool:
         """
@@ -48,6 +58,27 @@ class PivotConfig:
         """
         return len(self.values) > 0
 
+    def has_window(self) -> bool:
+        """
+        Check if the result is sorted, truncated or paged.
+
+        Returns:
+            True if any of sort_by, top_n, limit or offset is set
+        """
+        return bool(self.sort_by or self.top_n is not None or self.limit is not None or self.offset)
+
+    def without_paging(self) -> "PivotConfig":
+        """
+        Get a copy of this configuration without limit/offset.
+
+        Sorting and top-N are kept, so the copy describes the full result
+        the pages are cut from (e.g. for export).
+
+        Returns:
+            PivotConfig instance
+        """
+        return replace(self, limit=None, offset=0)
+
     def add_row(self, column: str):
         """Add a column to rows."""
         if column not in self.rows:
@@ -84,6 +115,10 @@ class PivotConfig:
         self.columns.clear()
         self.values.clear()
         self.filters.clear()
+        self.sort_by = None
+        self.sort_ascending = True
+        self.top_n = None
+        self.offset = 0
 
     def to_dict(self) -> dict:
         """
@@ -99,7 +134,12 @@ class PivotConfig:
                 {'column': vf.column, 'aggregation': vf.aggregation}
                 for vf in self.values
             ],
-            'filters': {k: v.copy() for k, v in self.filters.items()}
+            'filters': {k: v.copy() for k, v in self.filters.items()},
+            'sort_by': self.sort_by,
+            'sort_ascending': self.sort_ascending,
+            'top_n': self.top_n,
+            'limit': self.limit,
+            'offset': self.offset
         }
 
     @staticmethod
@@ -130,6 +170,13 @@ class PivotConfig:
             k: v.copy() for k, v in data.get('filters', {}).items()
         }
 
+        # Sorting and paging (absent from older saved configurations)
+        config.sort_by = data.get('sort_by')
+        config.sort_ascending = data.get('sort_ascending', True)
+        config.top_n = data.get('top_n')
+        config.limit = data.get('limit')
+        config.offset = data.get('offset', 0)
+
         return config
 
 
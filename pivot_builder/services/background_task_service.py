@@ -0,0 +1,218 @@
+"""Service for running work off the Tk main loop."""
+
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from pivot_builder.config.logging_config import logger
+
+
+class TaskCancelledError(Exception):
+    """Raised inside a task function when its task has been cancelled."""
+
+
+class BackgroundTask:
+    """
+    Handle for a unit of work submitted to the BackgroundTaskService.
+
+    The task function receives this handle as its first argument so it can
+    report progress and poll for cancellation between steps.
+    """
+
+    def __init__(self, task_id: int, service: "BackgroundTaskService", key: Optional[str] = None):
+        self.id = task_id
+        self.key = key
+        self._service = service
+        self._cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Check if cancellation has been requested."""
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Request cancellation (cooperative; queued tasks never start)."""
+        self._cancel_event.set()
+        # A task that never started gets no _run call, so report it here
+        if self.future is not None and self.future.cancel():
+            self._service._post(self, 'cancelled', None)
+
+    def check_cancelled(self):
+        """
+        Raise TaskCancelledError if cancellation has been requested.
+
+        Call this between units of work inside a task function.
+        """
+        if self.is_cancelled:
+            raise TaskCancelledError(f"Task {self.id} cancelled")
+
+    def report_progress(self, *args):
+        """
+        Report progress; delivered to the task's on_progress callback on the main thread.
+
+        Args:
+            *args: Arbitrary progress payload passed through to the callback
+        """
+        if not self.is_cancelled:
+            self._service._post(self, 'progress', args)
+
+
+class BackgroundTaskService:
+    """
+    Runs task functions on a thread pool and marshals their callbacks.
+
+    Worker threads never touch Tk. Completion, error and progress callbacks are
+    queued and only invoked from process_pending_callbacks(), which the owner
+    polls from the main thread (see AppController.run_in_background).
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Initialize the background task service.
+
+        Args:
+            max_workers: Maximum number of concurrent worker threads
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pivot-builder-worker"
+        )
+        self._callbacks = queue.Queue()
+        self._handlers = {}  # task_id -> (on_success, on_error, on_progress, on_cancel)
+        self._active = {}  # task_id -> BackgroundTask
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        key: Optional[str] = None,
+        on_success: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+        on_progress: Optional[Callable] = None,
+        on_cancel: Optional[Callable] = None
+    ) -> BackgroundTask:
+        """
+        Submit a task function to the worker pool.
+
+        Args:
+            fn: Callable invoked as fn(task, *args) on a worker thread
+            *args: Extra positional arguments for fn
+            key: Optional label used for logging and cancel_by_key
+            on_success: Called with fn's return value on the main thread
+            on_error: Called with the raised exception on the main thread
+            on_progress: Called with the payload of task.report_progress(...)
+            on_cancel: Called with no arguments once a cancelled task has stopped
+
+        Returns:
+            BackgroundTask handle
+        """
+        task = BackgroundTask(next(self._ids), self, key)
+
+        with self._lock:
+            self._handlers[task.id] = (on_success, on_error, on_progress, on_cancel)
+            self._active[task.id] = task
+
+        task.future = self._executor.submit(self._run, task, fn, args)
+        return task
+
+    def _run(self, task: BackgroundTask, fn: Callable, args: tuple):
+        """Execute a task function on a worker thread."""
+        if task.is_cancelled:
+            self._post(task, 'cancelled', None)
+            return
+
+        try:
+            result = fn(task, *args)
+        except TaskCancelledError:
+            self._post(task, 'cancelled', None)
+            return
+        except Exception as e:
+            logger.error(f"Background task {task.key or task.id} failed: {e}", exc_info=True)
+            self._post(task, 'error', e)
+            return
+
+        if task.is_cancelled:
+            self._post(task, 'cancelled', None)
+        else:
+            self._post(task, 'success', result)
+
+    def _post(self, task: BackgroundTask, kind: str, payload):
+        """Queue a callback for the main thread."""
+        self._callbacks.put((task, kind, payload))
+
+    def process_pending_callbacks(self) -> int:
+        """
+        Invoke all queued callbacks. Must be called from the main thread.
+
+        Returns:
+            Number of callbacks processed
+        """
+        processed = 0
+        while True:
+            try:
+                task, kind, payload = self._callbacks.get_nowait()
+            except queue.Empty:
+                break
+
+            processed += 1
+            with self._lock:
+                handlers = self._handlers.get(task.id)
+                if kind != 'progress':
+                    self._handlers.pop(task.id, None)
+                    self._active.pop(task.id, None)
+
+            if handlers is None:
+                continue
+
+            on_success, on_error, on_progress, on_cancel = handlers
+            try:
+                if kind == 'success' and on_success:
+                    on_success(payload)
+                elif kind == 'error' and on_error:
+                    on_error(payload)
+                elif kind == 'progress' and on_progress and not task.is_cancelled:
+                    on_progress(*payload)
+                elif kind == 'cancelled':
+                    logger.debug(f"Background task {task.key or task.id} cancelled")
+                    if on_cancel:
+                        on_cancel()
+            except Exception as e:
+                logger.error(f"Error in background task callback: {e}", exc_info=True)
+
+        return processed
+
+    def has_pending(self) -> bool:
+        """Check if any tasks are running or have undelivered callbacks."""
+        with self._lock:
+            return bool(self._active) or not self._callbacks.empty()
+
+    def cancel_by_key(self, key: str) -> int:
+        """
+        Cancel all active tasks submitted with the given key.
+
+        Returns:
+            Number of tasks cancelled
+        """
+        with self._lock:
+            tasks = [t for t in self._active.values() if t.key == key]
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
+
+    def cancel_all(self):
+        """Cancel all active tasks."""
+        with self._lock:
+            tasks = list(self._active.values())
+        for task in tasks:
+            task.cancel()
+
+    def shutdown(self):
+        """Cancel outstanding work and stop the worker pool."""
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
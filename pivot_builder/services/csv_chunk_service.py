@@ -0,0 +1,327 @@
+"""Service for parsing very large CSV files in parallel chunks."""
+
+import datetime
+import io
+import mmap
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import (
+    CSV_LARGE_FILE_THRESHOLD_MB,
+    CSV_CHUNK_TARGET_MB,
+    CSV_PARALLEL_WORKERS,
+)
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+# Bytes scanned per slice when counting quote characters
+SCAN_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def normalize_pyarrow_dates(df):
+    """
+    Give dates parsed by the pyarrow CSV engine the types the rest of the app expects.
+
+    pyarrow turns ISO date columns into object columns of datetime.date and
+    timestamps into datetime64 of varying units; both get the datetime64 type
+    pd.to_datetime gives date text, which is what load-time dtype
+    optimization produces for the same columns read by the C engine.
+
+    Args:
+        df: DataFrame read with engine='pyarrow' (modified in place)
+
+    Returns:
+        df
+    """
+    target = pd.to_datetime(pd.Series(['2024-01-01'])).dtype
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            if series.dtype != target and getattr(series.dtype, 'tz', None) is None:
+                df[col] = series.astype(target)
+        elif series.dtype == object:
+            values = series.dropna()
+            if len(values) and all(type(value) is datetime.date for value in values):
+                df[col] = pd.to_datetime(series).astype(target)
+    return df
+
+
+def _parse_csv_chunk(
+    file_path: str,
+    start: int,
+    stop: int,
+    columns: List[str],
+    read_kwargs: Dict,
+    engine: str
+):
+    """
+    Parse one byte range of a CSV file (runs in a worker process).
+
+    Module-level so it can be pickled for the process pool.
+
+    Args:
+        file_path: Path to the CSV file
+        start: Offset of the first byte of the chunk (start of a record)
+        stop: Offset just past the last byte of the chunk (end of a record)
+        columns: Column names from the header row
+        read_kwargs: pd.read_csv keyword arguments (dialect, dtype overrides)
+        engine: pandas parser engine
+
+    Returns:
+        DataFrame for the chunk's rows
+    """
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buffer = io.BytesIO(mm[start:stop])
+
+    kwargs = dict(read_kwargs, header=None, names=columns, index_col=False)
+    try:
+        frame = pd.read_csv(buffer, engine=engine, **kwargs)
+        return normalize_pyarrow_dates(frame) if engine == 'pyarrow' else frame
+    except Exception:
+        if engine == 'c':
+            raise
+        buffer.seek(0)
+        return pd.read_csv(buffer, engine='c', **kwargs)
+
+
+class CsvChunkService:
+    """
+    Splits a memory-mapped CSV at record boundaries and parses the chunks in
+    a process pool.
+
+    Boundaries are newlines outside quoted fields, found by tracking the parity
+    of quote characters since the end of the header. Doubled quotes ("") keep
+    the parity intact; files that use an escape character are not split.
+    """
+
+    def __init__(
+        self,
+        threshold_mb: float = CSV_LARGE_FILE_THRESHOLD_MB,
+        chunk_target_mb: float = CSV_CHUNK_TARGET_MB,
+        max_workers: int = CSV_PARALLEL_WORKERS
+    ):
+        """
+        Initialize the chunked CSV reader.
+
+        Args:
+            threshold_mb: Files at least this large are parsed in chunks
+            chunk_target_mb: Approximate size of each chunk
+            max_workers: Number of worker processes
+        """
+        self.threshold_bytes = int(threshold_mb * 1024 * 1024)
+        self.chunk_target_bytes = max(1, int(chunk_target_mb * 1024 * 1024))
+        self.max_workers = max(1, max_workers)
+
+    def should_use(self, file_size: int, dialect: Optional[Dict]) -> bool:
+        """
+        Check whether a file should be parsed in chunks.
+
+        Args:
+            file_size: File size in bytes
+            dialect: Sniffed dialect dict
+
+        Returns:
+            True for large files whose records can be split safely
+        """
+        if pd is None or file_size < self.threshold_bytes:
+            return False
+        # Escaped quotes break quote-parity tracking
+        return not (dialect or {}).get('escapechar')
+
+    @staticmethod
+    def _count_byte(mm, start: int, stop: int, byte: bytes) -> int:
+        """Count occurrences of a byte in mm[start:stop] in bounded slices."""
+        total = 0
+        for block_start in range(start, stop, SCAN_BLOCK_SIZE):
+            total += mm[block_start:min(block_start + SCAN_BLOCK_SIZE, stop)].count(byte)
+        return total
+
+    def _next_record_end(self, mm, pos: int, in_quotes: bool, quote: bytes) -> int:
+        """
+        Find the end of the record containing pos.
+
+        Args:
+            mm: Memory-mapped file
+            pos: Offset to start scanning from
+            in_quotes: Whether pos lies inside a quoted field
+            quote: Quote character as a single byte
+
+        Returns:
+            Offset just past the record's terminating newline (or the file size)
+        """
+        while True:
+            newline = mm.find(b'\n', pos)
+            if newline == -1:
+                return len(mm)
+            in_quotes ^= bool(self._count_byte(mm, pos, newline, quote) % 2)
+            if not in_quotes:
+                return newline + 1
+            # Newline inside a quoted field, keep going
+            pos = newline + 1
+
+    def find_chunk_bounds(self, mm, quotechar: str = '"') -> Tuple[int, List[Tuple[int, int]]]:
+        """
+        Split a memory-mapped CSV into byte ranges of whole records.
+
+        Args:
+            mm: Memory-mapped file
+            quotechar: Quote character from the dialect
+
+        Returns:
+            (header_end, [(start, stop), ...]) with header_end the offset of the first data record
+        """
+        quote = quotechar.encode('utf-8')[:1] or b'"'
+        size = len(mm)
+
+        header_end = self._next_record_end(mm, 0, False, quote)
+
+        bounds = []
+        start = header_end
+        while start < size:
+            goal = start + self.chunk_target_bytes
+            if goal >= size:
+                bounds.append((start, size))
+                break
+
+            # Every chunk starts outside quotes, so parity is counted from its start
+            in_quotes = bool(self._count_byte(mm, start, goal, quote) % 2)
+            stop = self._next_record_end(mm, goal, in_quotes, quote)
+            bounds.append((start, stop))
+            start = stop
+
+        return header_end, bounds
+
+    def load(
+        self,
+        file_path: str,
+        columns: List[str],
+        read_kwargs: Dict,
+        engine: str,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        cancel_check: Optional[Callable[[], None]] = None
+    ):
+        """
+        Parse a large CSV in parallel chunks.
+
+        Args:
+            file_path: Path to the CSV file
+            columns: Column names from the header row
+            read_kwargs: pd.read_csv keyword arguments for the dialect
+            engine: pandas parser engine for each chunk
+            progress_callback: Called with the number of rows read so far as
+                chunks finish (in file order)
+            cancel_check: Called between chunks; raises to abort the load, in
+                which case chunks not yet started are cancelled
+
+        Returns:
+            Combined DataFrame
+        """
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                _, bounds = self.find_chunk_bounds(mm, read_kwargs.get('quotechar', '"'))
+
+        if not bounds:
+            return pd.DataFrame(columns=columns)
+
+        logger.info(
+            f"Parsing {file_path} in {len(bounds)} chunks with {self.max_workers} worker processes"
+        )
+
+        # spawn: forking a process that runs Tk and worker threads is unsafe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(bounds)), mp_context=context) as pool:
+            frames = self._parse_chunks(
+                pool, file_path, bounds, columns, read_kwargs, engine, progress_callback, cancel_check
+            )
+
+            # A column inferred as numeric in one chunk but text in another would
+            # concat to mixed objects; re-read those chunks with the column as text
+            text_columns = self.find_mixed_columns(frames)
+            if text_columns:
+                logger.debug(f"Re-reading chunks with text columns: {text_columns}")
+                reread = [
+                    index for index, frame in enumerate(frames)
+                    if any(not self._is_text(frame[col].dtype) for col in text_columns)
+                ]
+                text_kwargs = dict(read_kwargs, dtype={col: str for col in text_columns})
+                replacements = self._parse_chunks(
+                    pool, file_path, [bounds[i] for i in reread], columns, text_kwargs, engine, None, cancel_check
+                )
+                for index, frame in zip(reread, replacements):
+                    frames[index] = frame
+
+        self.align_null_chunks(frames)
+
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def _parse_chunks(self, pool, file_path, bounds, columns, read_kwargs, engine, progress_callback, cancel_check):
+        """Parse byte ranges on the pool, returning frames in file order."""
+        futures = [
+            pool.submit(_parse_csv_chunk, file_path, start, stop, columns, read_kwargs, engine)
+            for start, stop in bounds
+        ]
+        frames = []
+        rows_read = 0
+        try:
+            for future in futures:
+                if cancel_check:
+                    cancel_check()
+                frame = future.result()
+                frames.append(frame)
+                rows_read += len(frame)
+                if progress_callback:
+                    progress_callback(rows_read)
+        except Exception:
+            # Chunks already running finish; queued ones never start
+            for future in futures:
+                future.cancel()
+            raise
+        return frames
+
+    @staticmethod
+    def _is_text(dtype) -> bool:
+        return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+    def find_mixed_columns(self, frames) -> List[str]:
+        """Find columns parsed as text in some chunks and as another type in others."""
+        mixed = []
+        for col in frames[0].columns:
+            text = [self._is_text(frame[col].dtype) for frame in frames]
+            if any(text) and not all(text):
+                # Chunks that are entirely empty in this column say nothing about its type
+                typed = [
+                    is_text for is_text, frame in zip(text, frames)
+                    if frame[col].notna().any()
+                ]
+                if any(typed) and not all(typed):
+                    mixed.append(col)
+        return mixed
+
+    def align_null_chunks(self, frames):
+        """
+        Cast columns that are entirely empty within a chunk to the column's
+        type elsewhere, so they do not widen the concatenated column.
+        """
+        for col in frames[0].columns:
+            typed = [frame[col].dtype for frame in frames if frame[col].notna().any()]
+            if not typed:
+                continue
+
+            target = typed[0]
+            if pd.api.types.is_integer_dtype(target):
+                target = 'float64'
+            elif pd.api.types.is_bool_dtype(target):
+                target = object
+
+            for frame in frames:
+                if frame[col].dtype != target and not frame[col].notna().any():
+                    frame[col] = frame[col].astype(target)
@@ -1,19 +1,40 @@
 """Service for building combined datasets."""
 
-from typing import Dict, List, Optional
+import threading
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 
 from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import VIRTUAL_COMBINED_DATASET
 from pivot_builder.models.file_model import FileDescriptor
 from pivot_builder.models.mapping_model import ColumnMappingModel
-from pivot_builder.models.dataset_model import CombinedDataset, PerFileDataset
+from pivot_builder.models.dataset_model import CombinedDataset, PerFileDataset, SOURCE_FILE_COLUMN
 
 
 class DatasetBuilderService:
-    """Builds combined datasets from multiple sources."""
+    """
+    Builds combined datasets from multiple sources.
 
-    def __init__(self):
-        pass
+    Per-file projections are kept between builds, tagged with a fingerprint of
+    everything that shapes them (the file's data version, its column mapping,
+    the canonical field list, ...). A rebuild only reprojects files whose
+    fingerprint changed and then re-concatenates.
+    """
+
+    def __init__(self, virtual: bool = VIRTUAL_COMBINED_DATASET):
+        """
+        Initialize the dataset builder.
+
+        Args:
+            virtual: Leave the per-file frames as partitions instead of concatenating them
+        """
+        self.virtual = virtual
+        self._per_file_cache: Dict[str, PerFileDataset] = {}  # file_id -> last projection
+        # Builds run on worker threads and may overlap when one supersedes another
+        self._build_lock = threading.Lock()
 
     def build_combined_dataset(
         self,
@@ -32,6 +53,16 @@ class DatasetBuilderService:
         Returns:
             CombinedDataset with merged DataFrame and metadata
         """
+        with self._build_lock:
+            return self._build_combined_dataset(files, mapping_model, include_source_tracking)
+
+    def _build_combined_dataset(
+        self,
+        files: List[FileDescriptor],
+        mapping_model: ColumnMappingModel,
+        include_source_tracking: bool
+    ) -> CombinedDataset:
+        """Build a combined dataset (see build_combined_dataset); caller holds _build_lock."""
         logger.info(f"Building combined dataset from {len(files)} files")
 
         # Initialize combined dataset
@@ -55,18 +86,36 @@ class DatasetBuilderService:
 
         logger.info(f"Combining on {len(all_canonical_fields)} canonical fields")
 
-        # Process each file
+        # Typed fill for fields a file does not provide
+        null_dtypes = self._null_column_dtypes(valid_files, mapping_model)
+
+        # Process each file, reusing projections whose inputs are unchanged
         per_file_frames = []
+        reused = 0
+        row_offset = 0
         for file_desc in valid_files:
-            per_file_df = self._build_per_file_dataframe(
+            fingerprint = self._projection_fingerprint(
                 file_desc,
                 mapping_model,
                 all_canonical_fields,
-                include_source_tracking
+                include_source_tracking,
+                null_dtypes
             )
 
-            if per_file_df is not None:
-                per_file_frames.append(per_file_df)
+            per_file_dataset = self._per_file_cache.get(file_desc.id)
+            if per_file_dataset is not None and per_file_dataset.fingerprint == fingerprint:
+                reused += 1
+            else:
+                per_file_df = self._build_per_file_dataframe(
+                    file_desc,
+                    mapping_model,
+                    all_canonical_fields,
+                    include_source_tracking,
+                    null_dtypes
+                )
+                if per_file_df is None:
+                    self._per_file_cache.pop(file_desc.id, None)
+                    continue
 
                 # Create metadata
                 per_file_dataset = self._create_per_file_metadata(
@@ -74,11 +123,51 @@ class DatasetBuilderService:
                     mapping_model,
                     per_file_df
                 )
-                combined_dataset.source_metadata.append(per_file_dataset)
+                per_file_dataset.data_version = file_desc.data_version
+                per_file_dataset.fingerprint = fingerprint
+                self._per_file_cache[file_desc.id] = per_file_dataset
+
+            per_file_frames.append(per_file_dataset.df)
+
+            # Row ranges belong to this build, so cached metadata is copied, not updated
+            row_stop = row_offset + len(per_file_dataset.df)
+            combined_dataset.source_metadata.append(
+                replace(per_file_dataset, row_start=row_offset, row_stop=row_stop)
+            )
+            row_offset = row_stop
+
+        # Forget projections for files that are gone
+        valid_ids = {f.id for f in valid_files}
+        for file_id in [fid for fid in self._per_file_cache if fid not in valid_ids]:
+            del self._per_file_cache[file_id]
+
+        logger.info(
+            f"Reused {reused} of {len(valid_files)} per-file projections, "
+            f"rebuilt {len(per_file_frames) - reused}"
+        )
 
         # Combine all DataFrames
         if per_file_frames:
             try:
+                harmonized = self._harmonize_categoricals(per_file_frames)
+                for meta, old_frame, frame in zip(combined_dataset.source_metadata, per_file_frames, harmonized):
+                    if frame is not old_frame:
+                        meta.df = frame
+                        # Later builds reuse the recast frame; the old one stays with older datasets
+                        cached = self._per_file_cache.get(meta.file_id)
+                        if cached is not None and cached.df is old_frame:
+                            cached.df = frame
+                per_file_frames = harmonized
+
+                if self.virtual:
+                    # Partitions stay separate; CombinedDataset.df concatenates on demand
+                    logger.info(
+                        f"Combined dataset created: {combined_dataset.get_row_count()} rows, "
+                        f"{len(combined_dataset.get_columns())} columns "
+                        f"in {len(per_file_frames)} partitions"
+                    )
+                    return combined_dataset
+
                 combined_df = pd.concat(per_file_frames, ignore_index=True)
                 combined_dataset.df = combined_df
 
@@ -95,28 +184,85 @@ class DatasetBuilderService:
 
         return combined_dataset
 
+    def _projection_fingerprint(
+        self,
+        file_desc: FileDescriptor,
+        mapping_model: ColumnMappingModel,
+        all_canonical_fields: List[str],
+        include_source_tracking: bool,
+        null_dtypes: Dict[str, object]
+    ) -> Tuple:
+        """
+        Build the fingerprint of everything a file's projection depends on.
+
+        Args:
+            file_desc: FileDescriptor with loaded DataFrame
+            mapping_model: ColumnMappingModel with mappings
+            all_canonical_fields: List of all canonical field names
+            include_source_tracking: Whether the __source_file column is added
+            null_dtypes: Dtypes for all-null fills (from _null_column_dtypes)
+
+        Returns:
+            Hashable fingerprint tuple
+        """
+        file_mappings = mapping_model.file_column_to_canonical.get(file_desc.id, {})
+        provided = set(file_mappings.values())
+
+        # Fill dtypes come from other files, so they are part of the key too
+        fill_dtypes = tuple(
+            (name, str(null_dtypes.get(name)))
+            for name in all_canonical_fields
+            if name not in provided
+        )
+
+        return (
+            file_desc.data_version,
+            tuple(file_mappings.items()),
+            tuple(all_canonical_fields),
+            fill_dtypes,
+            file_desc.filename,
+            include_source_tracking,
+        )
+
+    def invalidate(self, file_id: Optional[str] = None):
+        """
+        Drop cached per-file projections.
+
+        Args:
+            file_id: File to drop (None drops all)
+        """
+        if file_id is None:
+            self._per_file_cache.clear()
+        else:
+            self._per_file_cache.pop(file_id, None)
+
     def _build_per_file_dataframe(
         self,
         file_desc: FileDescriptor,
         mapping_model: ColumnMappingModel,
         all_canonical_fields: List[str],
-        include_source_tracking: bool
+        include_source_tracking: bool,
+        null_dtypes: Optional[Dict[str, object]] = None
     ) -> Optional[pd.DataFrame]:
         """
         Build a DataFrame for a single file with canonical column names.
 
+        The frame is a projection of the source: mapped columns share the
+        source column buffers instead of being copied.
+
         Args:
             file_desc: FileDescriptor with loaded DataFrame
             mapping_model: ColumnMappingModel with mappings
             all_canonical_fields: List of all canonical field names
             include_source_tracking: Whether to add __source_file column
+            null_dtypes: Dtype for each canonical field's all-null fill (object if absent)
 
         Returns:
             DataFrame with canonical columns, or None if error
         """
         try:
             # Get the original DataFrame
-            original_df = file_desc.dataframe.copy()
+            original_df = file_desc.dataframe
 
             # Get column mapping for this file
             file_mappings = mapping_model.file_column_to_canonical.get(file_desc.id, {})
@@ -125,26 +271,39 @@ class DatasetBuilderService:
                 logger.warning(f"No column mappings for file {file_desc.filename}")
                 return None
 
-            # Build new DataFrame with canonical columns
-            canonical_df = pd.DataFrame()
-
             # Map each original column to its canonical name
+            columns = {}
             for original_col, canonical_name in file_mappings.items():
                 if original_col in original_df.columns:
-                    canonical_df[canonical_name] = original_df[original_col]
+                    columns[canonical_name] = original_df[original_col]
                 else:
                     logger.warning(
                         f"Column '{original_col}' not found in {file_desc.filename}"
                     )
 
-            # Add missing canonical fields as NaN
+            # Add missing canonical fields as typed all-null columns
+            null_dtypes = null_dtypes or {}
             for canonical_field in all_canonical_fields:
-                if canonical_field not in canonical_df.columns:
-                    canonical_df[canonical_field] = pd.NA
+                if canonical_field not in columns:
+                    columns[canonical_field] = pd.Series(
+                        np.nan,
+                        index=original_df.index,
+                        dtype=null_dtypes.get(canonical_field, object)
+                    )
 
-            # Add source tracking column if requested
+            # Add source tracking column if requested, dictionary-encoded
+            # (one category per file; categories are unified across files before concat)
             if include_source_tracking:
-                canonical_df['__source_file'] = file_desc.filename
+                columns[SOURCE_FILE_COLUMN] = pd.Series(
+                    pd.Categorical.from_codes(
+                        np.zeros(len(original_df), dtype=np.int8),
+                        categories=[file_desc.filename]
+                    ),
+                    index=original_df.index
+                )
+
+            # Built in one step; copy=False keeps the source buffers shared
+            canonical_df = pd.DataFrame(columns, index=original_df.index, copy=False)
 
             logger.debug(
                 f"Built DataFrame for {file_desc.filename}: "
@@ -160,6 +319,89 @@ class DatasetBuilderService:
             )
             return None
 
+    def _null_column_dtypes(
+        self,
+        files: List[FileDescriptor],
+        mapping_model: ColumnMappingModel
+    ) -> Dict[str, object]:
+        """
+        Pick a dtype for each canonical field's all-null fill.
+
+        The first file providing a field decides its dtype, widened where
+        needed to hold nulls (integers become float64, booleans object), so
+        the fill does not change the concatenated column's type.
+
+        Args:
+            files: FileDescriptors with loaded DataFrames
+            mapping_model: ColumnMappingModel with mappings
+
+        Returns:
+            Dict mapping canonical field name -> dtype
+        """
+        null_dtypes = {}
+        for file_desc in files:
+            df = file_desc.dataframe
+            file_mappings = mapping_model.file_column_to_canonical.get(file_desc.id, {})
+            for original_col, canonical_name in file_mappings.items():
+                if canonical_name in null_dtypes or original_col not in df.columns:
+                    continue
+
+                dtype = df[original_col].dtype
+                if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+                    dtype = np.dtype('float64')
+                elif isinstance(dtype, np.dtype) and dtype.kind == 'b':
+                    dtype = np.dtype(object)
+                null_dtypes[canonical_name] = dtype
+
+        return null_dtypes
+
+    def _harmonize_categoricals(self, frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+        """
+        Give categorical columns the same categories in every frame.
+
+        pd.concat falls back to object dtype when categories differ, so each
+        categorical column is recast to the union of its categories. Frames
+        where the column is entirely empty take the same dtype.
+
+        The input frames are never modified: they are partitions of earlier
+        datasets that a background pivot or export may still be reading.
+        Recast columns go into shallow copies instead.
+
+        Args:
+            frames: Per-file DataFrames about to be concatenated
+
+        Returns:
+            List of frames in the same order (the input frame where nothing changed)
+        """
+        frames = list(frames)
+        columns = dict.fromkeys(col for frame in frames for col in frame.columns)
+
+        for col in columns:
+            series_list = [frame[col] for frame in frames if col in frame.columns]
+            categoricals = [s for s in series_list if isinstance(s.dtype, pd.CategoricalDtype)]
+            if not categoricals:
+                continue
+
+            # Any non-empty, non-categorical part means the column cannot stay categorical
+            if len(categoricals) < len(series_list) and not all(
+                isinstance(s.dtype, pd.CategoricalDtype) or s.isna().all()
+                for s in series_list
+            ):
+                continue
+
+            try:
+                categories = union_categoricals(categoricals, ignore_order=True).categories
+            except TypeError as e:
+                logger.debug(f"Cannot unify categories for '{col}': {e}")
+                continue
+
+            dtype = pd.CategoricalDtype(categories)
+            for i, frame in enumerate(frames):
+                if col in frame.columns and frame[col].dtype != dtype:
+                    frames[i] = frame.assign(**{col: frame[col].astype(dtype)})
+
+        return frames
+
     def _create_per_file_metadata(
         self,
         file_desc: FileDescriptor,
@@ -190,7 +432,8 @@ class DatasetBuilderService:
             file_id=file_desc.id,
             df=per_file_df,
             column_mapping=file_mappings.copy(),
-            effective_columns=effective_columns
+            effective_columns=effective_columns,
+            source_name=file_desc.filename
         )
 
     def build_dataset(self, files, mappings):
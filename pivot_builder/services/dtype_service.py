@@ -1,22 +1,270 @@
 """Service for data type detection and conversion."""
 
+import warnings
+from typing import Dict, Optional
+
 from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import (
+    DTYPE_SAMPLE_ROWS,
+    DTYPE_CATEGORY_MAX_RATIO,
+)
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = None
+    pd = None
 
 
 class DtypeService:
-    """Handles data type detection and conversion."""
+    """
+    Handles data type detection and conversion.
+
+    Types are inferred from an evenly strided sample of each column and only
+    applied when the conversion holds for the whole column: low-cardinality
+    text becomes category, integers are downcast, floats move to float32 only
+    when lossless, and date-like text is parsed only if no value is lost.
+    """
+
+    def __init__(
+        self,
+        sample_rows: int = DTYPE_SAMPLE_ROWS,
+        category_max_ratio: float = DTYPE_CATEGORY_MAX_RATIO
+    ):
+        """
+        Initialize the dtype service.
+
+        Args:
+            sample_rows: Maximum number of rows inspected per column
+            category_max_ratio: Maximum distinct/non-null ratio for category columns
+        """
+        self.sample_rows = sample_rows
+        self.category_max_ratio = category_max_ratio
+
+    def _sample(self, series):
+        """Take an evenly strided sample of a column's non-null values."""
+        step = max(1, len(series) // self.sample_rows)
+        return series.iloc[::step].dropna()
+
+    @staticmethod
+    def _is_text(series) -> bool:
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            return False
+        return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+    def detect_column_types(self, dataframe) -> Dict[str, str]:
+        """
+        Detect data types for all columns.
+
+        Args:
+            dataframe: pandas DataFrame
+
+        Returns:
+            Dict mapping column name -> one of 'empty', 'boolean', 'integer',
+            'float', 'datetime', 'category', 'date_text', 'text' or 'mixed'
+        """
+        types = {}
+        if dataframe is None:
+            return types
+
+        for column in dataframe.columns:
+            types[column] = self._detect_series_type(dataframe[column])
+        return types
+
+    def _detect_series_type(self, series) -> str:
+        """Classify a single column from its dtype and a value sample."""
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            return 'category'
+        if pd.api.types.is_bool_dtype(dtype):
+            return 'boolean'
+        if pd.api.types.is_integer_dtype(dtype):
+            return 'integer'
+        if pd.api.types.is_float_dtype(dtype):
+            return 'float'
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return 'datetime'
+        if not self._is_text(series):
+            return 'mixed'
+
+        sample = self._sample(series)
+        if len(sample) == 0:
+            return 'empty'
+        if pd.api.types.infer_dtype(sample, skipna=True) != 'string':
+            return 'mixed'
+        if self._looks_like_dates(sample):
+            return 'date_text'
+        if sample.nunique() <= len(sample) * self.category_max_ratio:
+            return 'category'
+        return 'text'
+
+    @staticmethod
+    def _looks_like_dates(sample) -> bool:
+        """Check whether every sampled string parses as a date (and not as a number)."""
+        if pd.to_numeric(sample, errors='coerce').notna().any():
+            return False
+        with warnings.catch_warnings():
+            # Format inference warnings are expected for free-form text
+            warnings.simplefilter('ignore')
+            parsed = pd.to_datetime(sample, errors='coerce')
+        return bool(parsed.notna().all())
+
+    def suggest_types(self, dataframe) -> Dict[str, str]:
+        """
+        Suggest optimal data types.
+
+        Only columns whose storage would change are included.
+
+        Args:
+            dataframe: pandas DataFrame
+
+        Returns:
+            Dict mapping column name -> target type ('category', 'datetime64[ns]',
+            'float32', or a downcast integer dtype such as 'int16')
+        """
+        suggestions = {}
+        if dataframe is None:
+            return suggestions
+
+        for column, kind in self.detect_column_types(dataframe).items():
+            series = dataframe[column]
 
-    def __init__(self):
-        pass
+            if kind == 'category':
+                suggestions[column] = 'category'
+            elif kind == 'date_text':
+                suggestions[column] = 'datetime64[ns]'
+            elif kind == 'integer' and len(series) > 0:
+                target = self._smallest_int_dtype(series)
+                if target is not None and target != series.dtype:
+                    suggestions[column] = target.name
+            elif kind == 'float' and series.dtype != np.float32:
+                sample = self._sample(series)
+                if len(sample) > 0 and self._fits_float32(sample):
+                    suggestions[column] = 'float32'
 
-    def detect_column_types(self, dataframe):
-        """Detect data types for all columns."""
-        pass
+        return suggestions
+
+    @staticmethod
+    def _smallest_int_dtype(series):
+        """Get the smallest signed integer dtype that holds a column's range."""
+        if series.dtype.kind not in 'iu':
+            return None  # Nullable extension integers are left alone
+        low, high = series.min(), series.max()
+        for candidate in (np.int8, np.int16, np.int32, np.int64):
+            info = np.iinfo(candidate)
+            if info.min <= low and high <= info.max:
+                return np.dtype(candidate)
+        return None
+
+    @staticmethod
+    def _fits_float32(values) -> bool:
+        """Check that float values round-trip through float32 unchanged."""
+        as_float64 = values.to_numpy(dtype='float64', na_value=np.nan)
+        round_trip = as_float64.astype(np.float32).astype(np.float64)
+        return bool(np.array_equal(as_float64, round_trip, equal_nan=True))
 
     def convert_column_type(self, dataframe, column, target_type):
-        """Convert a column to target type."""
-        pass
+        """
+        Convert a column to target type.
+
+        The conversion is verified against the full column; if it would lose
+        information (new nulls, rounding, too many categories) the original
+        DataFrame is returned unchanged.
+
+        Args:
+            dataframe: pandas DataFrame
+            column: Column to convert
+            target_type: Target dtype name (see suggest_types)
+
+        Returns:
+            DataFrame with the column converted (or the original DataFrame)
+        """
+        if dataframe is None or column not in dataframe.columns:
+            return dataframe
+
+        series = dataframe[column]
+        try:
+            converted = self._convert_series(series, target_type)
+        except (TypeError, ValueError, OverflowError) as e:
+            logger.debug(f"Not converting '{column}' to {target_type}: {e}")
+            return dataframe
+
+        if converted is None:
+            logger.debug(f"Not converting '{column}' to {target_type}: conversion is lossy")
+            return dataframe
+
+        result = dataframe.copy(deep=False)
+        result[column] = converted
+        return result
+
+    def _convert_series(self, series, target_type: str):
+        """
+        Convert a Series, returning None when the conversion would lose data.
+        """
+        non_null = series.notna()
+
+        if target_type == 'category':
+            converted = series.astype('category')
+            if len(converted.cat.categories) > non_null.sum() * self.category_max_ratio:
+                return None
+            return converted
+
+        if target_type.startswith('datetime'):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                converted = pd.to_datetime(series, errors='coerce')
+            if (converted.notna() != non_null).any():
+                return None
+            return converted
+
+        if target_type == 'float32':
+            if not self._fits_float32(series):
+                return None
+            return series.astype(np.float32)
+
+        # Integer downcast: reject anything that would wrap around
+        target = np.dtype(target_type)
+        info = np.iinfo(target)
+        if len(series) and (series.min() < info.min or series.max() > info.max):
+            return None
+        return series.astype(target)
+
+    def optimize_dataframe(self, dataframe, types: Optional[Dict[str, str]] = None):
+        """
+        Apply suggested types to a DataFrame.
+
+        Args:
+            dataframe: pandas DataFrame
+            types: Target types to apply (defaults to suggest_types)
+
+        Returns:
+            DataFrame with optimized column types
+        """
+        if dataframe is None or len(dataframe) == 0:
+            return dataframe
+
+        if types is None:
+            types = self.suggest_types(dataframe)
+        if not types:
+            return dataframe
+
+        before = dataframe.memory_usage(deep=True).sum()
+
+        result = dataframe.copy(deep=False)
+        for column, target_type in types.items():
+            try:
+                converted = self._convert_series(result[column], target_type)
+            except (TypeError, ValueError, OverflowError) as e:
+                logger.debug(f"Not converting '{column}' to {target_type}: {e}")
+                continue
+            if converted is not None:
+                result[column] = converted
 
-    def suggest_types(self, dataframe):
-        """Suggest optimal data types."""
-        pass
+        after = result.memory_usage(deep=True).sum()
+        logger.info(
+            f"Optimized dtypes for {len(types)} columns: "
+            f"{before / 1024 / 1024:.1f}MB -> {after / 1024 / 1024:.1f}MB"
+        )
+        return result
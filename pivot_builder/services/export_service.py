@@ -1,13 +1,160 @@
 """Service for exporting data to various formats."""
 
+import gzip
+import io
+import os
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional
+
 import pandas as pd
-from typing import Optional
 
 from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import (
+    EXPORT_CHUNK_ROWS,
+    EXPORT_WRITE_BUFFER_BYTES,
+    JSON_DATE_FORMAT,
+    XLSX_MAX_ROWS_PER_SHEET,
+)
+from pivot_builder.services.background_task_service import TaskCancelledError
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+try:
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+except ImportError:
+    openpyxl = None
+
+
+# Output format by file extension (after any compression suffix)
+EXPORT_EXTENSIONS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.xlsx': 'xlsx',
+}
+
+# Compression by file suffix
+COMPRESSION_SUFFIXES = {
+    '.gz': 'gzip',
+    '.zst': 'zstd',
+}
+
+
+class _StreamingWorkbook:
+    """
+    Row-at-a-time XLSX writer that never holds a sheet's cells in memory.
+
+    Uses xlsxwriter in constant_memory mode when installed, otherwise an
+    openpyxl write-only workbook. Rows must be written in order.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sheet = None
+        self._row = 0
+
+        if xlsxwriter is not None:
+            self.engine = 'xlsxwriter'
+            self._book = xlsxwriter.Workbook(path, {
+                'constant_memory': True,
+                'nan_inf_to_errors': True,
+                'remove_timezone': True,
+                'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+            })
+            self._header_format = self._book.add_format({'bold': True})
+        elif openpyxl is not None:
+            self.engine = 'openpyxl'
+            self._book = openpyxl.Workbook(write_only=True)
+            self._header_font = Font(bold=True)
+        else:
+            raise RuntimeError("XLSX export requires openpyxl or xlsxwriter")
+
+    def add_sheet(self, name: str, header: List[str]):
+        """Start a new sheet and write its (bold) header row."""
+        if self.engine == 'xlsxwriter':
+            self._sheet = self._book.add_worksheet(name)
+            self._sheet.write_row(0, 0, header, self._header_format)
+        else:
+            self._sheet = self._book.create_sheet(name)
+            cells = []
+            for value in header:
+                cell = WriteOnlyCell(self._sheet, value=value)
+                cell.font = self._header_font
+                cells.append(cell)
+            self._sheet.append(cells)
+        self._row = 1
+
+    def write_rows(self, rows: List[list]):
+        """Append rows of Python values (None for empty cells) to the current sheet."""
+        if self.engine == 'xlsxwriter':
+            write_row = self._sheet.write_row
+            for row in rows:
+                write_row(self._row, 0, row)
+                self._row += 1
+        else:
+            append = self._sheet.append
+            for row in rows:
+                append(row)
+            self._row += len(rows)
+
+    def close(self):
+        """Finish writing the file."""
+        if self.engine == 'xlsxwriter':
+            self._book.close()
+        else:
+            self._book.save(self.path)
+
+    def discard(self):
+        """Release temporary sheet data after a failed or cancelled export."""
+        if self.engine == 'openpyxl':
+            for sheet in self._book.worksheets:
+                try:
+                    sheet.close()
+                except Exception:
+                    pass
 
 
 class ExportService:
-    """Service for exporting DataFrames to CSV, XLSX, and JSON formats."""
+    """Service for exporting DataFrames to CSV, XLSX, JSON and NDJSON formats."""
+
+    def __init__(self, chunk_rows: int = EXPORT_CHUNK_ROWS):
+        """
+        Initialize export service.
+
+        Args:
+            chunk_rows: Rows serialized per write when streaming text formats
+        """
+        self.chunk_rows = chunk_rows
+
+    @staticmethod
+    def detect_format(path: str):
+        """
+        Work out the output format and compression from a file name.
+
+        Args:
+            path: Output file path (e.g. data.csv, data.ndjson.gz)
+
+        Returns:
+            (format, compression) - format is None if the extension is unknown,
+            compression is None, 'gzip' or 'zstd'
+        """
+        root, ext = os.path.splitext(path.lower())
+        compression = COMPRESSION_SUFFIXES.get(ext)
+        if compression:
+            root, ext = os.path.splitext(root)
+        return EXPORT_EXTENSIONS.get(ext), compression
 
     def export_csv(self, df: pd.DataFrame, path: str) -> bool:
         """
@@ -20,13 +167,21 @@ class ExportService:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            df.to_csv(path, index=False)
-            logger.info(f"Exported data to CSV: {path}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to export CSV: {e}")
-            return False
+        return self.export_frames([df], list(df.columns), path, 'csv', total_rows=len(df))
+
+    def export_csv_partitions(self, partitions, columns: List[str], path: str) -> bool:
+        """
+        Export a partitioned dataset to one CSV file, one partition at a time.
+
+        Args:
+            partitions: Iterable of DataFrames (e.g. CombinedDataset.iter_partitions())
+            columns: Output column order
+            path: File path to save to
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.export_frames(partitions, columns, path, 'csv')
 
     def export_xlsx(self, df: pd.DataFrame, path: str) -> bool:
         """
@@ -39,18 +194,98 @@ class ExportService:
         Returns:
             True if successful, False otherwise
         """
+        return self.export_xlsx_frames([df], list(df.columns), path, total_rows=len(df))
+
+    def export_xlsx_frames(
+        self,
+        frames: Iterable[pd.DataFrame],
+        columns: List[str],
+        path: str,
+        progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+        total_rows: Optional[int] = None
+    ) -> bool:
+        """
+        Stream DataFrames to one XLSX file.
+
+        Rows go straight from each chunk into a streaming workbook, so memory
+        use stays flat regardless of size. Once a sheet reaches Excel's row
+        limit the export continues on a new sheet (Sheet2, Sheet3, ...) with
+        the header repeated. As with export_frames, the workbook replaces
+        path only once complete.
+
+        Args:
+            frames: DataFrames to write in order (e.g. dataset partitions)
+            columns: Output column order; missing columns are written empty
+            path: File path to save to
+            progress_callback: Called as (rows_written, total_rows) after each
+                chunk; may raise TaskCancelledError to abort the export
+            total_rows: Total row count for progress reporting, if known
+
+        Returns:
+            True if successful, False otherwise
+        """
+        header = [str(col) for col in columns]
+        sheet_rows = XLSX_MAX_ROWS_PER_SHEET - 1  # Data rows per sheet after the header
+        rows_written = 0
+        sheet_count = 1
+        workbook = None
+        temp_path = self._temp_path(path)
+
         try:
-            df.to_excel(path, index=False, engine='openpyxl')
-            logger.info(f"Exported data to XLSX: {path}")
+            workbook = _StreamingWorkbook(temp_path)
+            workbook.add_sheet('Sheet1', header)
+            room = sheet_rows
+
+            for chunk in self._iter_chunks(frames, columns):
+                rows = self._to_cell_rows(chunk)
+                while rows:
+                    if room == 0:
+                        sheet_count += 1
+                        workbook.add_sheet(f'Sheet{sheet_count}', header)
+                        room = sheet_rows
+                    batch, rows = rows[:room], rows[room:]
+                    workbook.write_rows(batch)
+                    room -= len(batch)
+
+                rows_written += len(chunk)
+                if progress_callback:
+                    progress_callback(rows_written, total_rows)
+
+            workbook.close()
+            os.replace(temp_path, path)
+            logger.info(
+                f"Exported {rows_written} rows to XLSX ({sheet_count} sheet(s), "
+                f"{workbook.engine}): {path}"
+            )
             return True
+
         except Exception as e:
+            if workbook is not None:
+                workbook.discard()
+            self._remove_partial(temp_path)
+            if isinstance(e, TaskCancelledError):
+                logger.info(f"Export cancelled: {path}")
+                raise
             logger.error(f"Failed to export XLSX: {e}")
             return False
 
+    @staticmethod
+    def _to_cell_rows(chunk: pd.DataFrame) -> List[list]:
+        """Convert a chunk to lists of Python values, with None for nulls."""
+        values = chunk.to_numpy(dtype=object)
+        nulls = chunk.isna().to_numpy()
+        if nulls.any():
+            values[nulls] = None
+        return values.tolist()
+
     def export_json(self, df: pd.DataFrame, path: str, orient: str = 'records') -> bool:
         """
         Export DataFrame to JSON file.
 
+        Records are streamed in chunks; other orientations need the whole
+        frame and are written in one call. No orientation is indented, and
+        all write dates as JSON_DATE_FORMAT.
+
         Args:
             df: DataFrame to export
             path: File path to save to
@@ -59,10 +294,167 @@ class ExportService:
         Returns:
             True if successful, False otherwise
         """
+        if orient == 'records':
+            return self.export_frames([df], list(df.columns), path, 'json', total_rows=len(df))
+
         try:
-            df.to_json(path, orient=orient, indent=2)
+            df.to_json(path, orient=orient, date_format=JSON_DATE_FORMAT)
             logger.info(f"Exported data to JSON: {path}")
             return True
         except Exception as e:
             logger.error(f"Failed to export JSON: {e}")
             return False
+
+    def export_ndjson(self, df: pd.DataFrame, path: str) -> bool:
+        """
+        Export DataFrame to newline-delimited JSON (one record per line).
+
+        Args:
+            df: DataFrame to export
+            path: File path to save to
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.export_frames([df], list(df.columns), path, 'ndjson', total_rows=len(df))
+
+    def export_frames(
+        self,
+        frames: Iterable[pd.DataFrame],
+        columns: List[str],
+        path: str,
+        fmt: str,
+        progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+        total_rows: Optional[int] = None
+    ) -> bool:
+        """
+        Stream DataFrames to one CSV, JSON (records), NDJSON or XLSX file.
+
+        Rows are serialized EXPORT_CHUNK_ROWS at a time into a buffered
+        (optionally gzip/zstd compressed, by file suffix) handle, so no
+        full-size text intermediate is ever built. Output goes to a temporary
+        sibling file that replaces path only once complete. XLSX is delegated
+        to export_xlsx_frames.
+
+        Args:
+            frames: DataFrames to write in order (e.g. dataset partitions)
+            columns: Output column order; missing columns are written empty
+            path: File path to save to
+            fmt: 'csv', 'json', 'ndjson' or 'xlsx'
+            progress_callback: Called as (rows_written, total_rows) after each
+                chunk; may raise TaskCancelledError to abort the export
+            total_rows: Total row count for progress reporting, if known
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if fmt == 'xlsx':
+            return self.export_xlsx_frames(frames, columns, path, progress_callback, total_rows)
+
+        _, compression = self.detect_format(path)
+        rows_written = 0
+        temp_path = self._temp_path(path)
+
+        try:
+            with self._open_text(temp_path, compression) as f:
+                if fmt == 'json':
+                    f.write('[')
+
+                for chunk in self._iter_chunks(frames, columns):
+                    if fmt == 'csv':
+                        chunk.to_csv(f, index=False, header=rows_written == 0)
+                    elif fmt == 'json':
+                        # Each chunk serializes as [{...},...]; splice out the brackets
+                        records = chunk.to_json(orient='records', date_format=JSON_DATE_FORMAT)[1:-1]
+                        if records:
+                            f.write(',\n' if rows_written else '\n')
+                            f.write(records)
+                    elif fmt == 'ndjson':
+                        # Output ends with a newline already
+                        f.write(chunk.to_json(orient='records', lines=True, date_format=JSON_DATE_FORMAT))
+                    else:
+                        raise ValueError(f"Unsupported streaming export format: {fmt}")
+
+                    rows_written += len(chunk)
+                    if progress_callback:
+                        progress_callback(rows_written, total_rows)
+
+                if fmt == 'csv' and rows_written == 0:
+                    pd.DataFrame(columns=columns).to_csv(f, index=False)
+                elif fmt == 'json':
+                    f.write('\n]\n' if rows_written else ']\n')
+
+            os.replace(temp_path, path)
+            logger.info(f"Exported {rows_written} rows to {fmt.upper()}: {path}")
+            return True
+
+        except Exception as e:
+            self._remove_partial(temp_path)
+            if isinstance(e, TaskCancelledError):
+                logger.info(f"Export cancelled: {path}")
+                raise
+            logger.error(f"Failed to export {fmt.upper()}: {e}")
+            return False
+
+    def _iter_chunks(self, frames: Iterable[pd.DataFrame], columns: List[str]):
+        """Yield row slices of each frame, aligned to the output columns."""
+        for frame in frames:
+            aligned = list(frame.columns) == list(columns)
+            for start in range(0, len(frame), self.chunk_rows):
+                chunk = frame.iloc[start:start + self.chunk_rows]
+                # Align per chunk so a whole partition is never copied at once
+                yield chunk if aligned else chunk.reindex(columns=columns)
+
+    @contextmanager
+    def _open_text(self, path: str, compression: Optional[str]):
+        """
+        Open a buffered text handle for writing, compressing if requested.
+
+        Args:
+            path: File path
+            compression: None, 'gzip' or 'zstd'
+
+        Yields:
+            Writable text file object
+        """
+        if compression == 'gzip':
+            binary = gzip.open(path, 'wb', compresslevel=6)
+        elif compression == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("zstd compression requires the zstandard package")
+            writer = zstandard.ZstdCompressor().stream_writer(open(path, 'wb'), closefd=True)
+            binary = io.BufferedWriter(writer, EXPORT_WRITE_BUFFER_BYTES)
+        else:
+            binary = open(path, 'wb', buffering=EXPORT_WRITE_BUFFER_BYTES)
+
+        text = io.TextIOWrapper(binary, encoding='utf-8', newline='')
+        try:
+            yield text
+        finally:
+            text.close()
+
+    @staticmethod
+    def _temp_path(path: str) -> str:
+        """
+        Get a unique sibling path to write an export to before moving it into place.
+
+        Writing elsewhere first means a failed or cancelled export never
+        touches an existing file at path, and an export still winding down
+        cannot delete the file a newer export to the same path produced.
+
+        Args:
+            path: Final output path
+
+        Returns:
+            Temporary path in the same directory (so os.replace is atomic)
+        """
+        return f"{path}.{uuid.uuid4().hex[:8]}.part"
+
+    @staticmethod
+    def _remove_partial(path: str):
+        """Delete a partially written output file."""
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove partial export {path}: {e}")
@@ -1,24 +1,59 @@
 """Service for file operations."""
 
+import csv
 import os
 from pathlib import Path
-from typing import Tuple, Optional, Dict, List
+from typing import Callable, Tuple, Optional, Dict, List
 
 from pivot_builder.config.logging_config import logger
-from pivot_builder.config.app_config import MAX_FILE_SIZE_MB
+from pivot_builder.services.workbook_cache_service import WorkbookCacheService
+from pivot_builder.services.xlsx_stream_service import XlsxStreamService
+from pivot_builder.services.csv_chunk_service import CsvChunkService, normalize_pyarrow_dates
+from pivot_builder.services.dtype_service import DtypeService
+from pivot_builder.config.app_config import (
+    MAX_FILE_SIZE_MB,
+    MAX_CSV_FILE_SIZE_MB,
+    CSV_SNIFF_SAMPLE_BYTES,
+    CSV_SNIFF_DELIMITERS,
+    CSV_ENGINE,
+    CSV_PROGRESS_CHUNK_ROWS,
+    OPTIMIZE_DTYPES_ON_LOAD,
+)
 
 try:
     import pandas as pd
 except ImportError:
     pd = None
 
+try:
+    import pyarrow  # noqa: F401 - only needed to enable pandas' pyarrow CSV engine
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 
 class FileService:
     """Handles file loading and validation."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        workbook_cache: Optional[WorkbookCacheService] = None,
+        optimize_dtypes: bool = OPTIMIZE_DTYPES_ON_LOAD
+    ):
+        """
+        Initialize file service.
+
+        Args:
+            workbook_cache: Shared workbook handle cache (creates one if None)
+            optimize_dtypes: Whether full loads get DtypeService type optimization
+        """
         if pd is None:
             logger.warning("pandas not available - file loading will be limited")
+        self.workbook_cache = workbook_cache or WorkbookCacheService()
+        self.xlsx_stream_service = XlsxStreamService()
+        self.csv_chunk_service = CsvChunkService()
+        self.dtype_service = DtypeService()
+        self.optimize_dtypes = optimize_dtypes
 
     def validate_file(self, file_path: str) -> Tuple[bool, Optional[str]]:
         """
@@ -42,16 +77,119 @@ class FileService:
         if extension not in ['.csv', '.xlsx', '.xls']:
             return False, f"Unsupported file type: {extension}. Only CSV and XLSX files are supported."
 
-        # Check file size
+        # Check file size (large CSVs are parsed in parallel chunks instead)
+        max_size_mb = MAX_CSV_FILE_SIZE_MB if extension == '.csv' else MAX_FILE_SIZE_MB
         file_size_mb = path.stat().st_size / (1024 * 1024)
-        if file_size_mb > MAX_FILE_SIZE_MB:
-            return False, f"File too large: {file_size_mb:.1f}MB (max: {MAX_FILE_SIZE_MB}MB)"
+        if max_size_mb is not None and file_size_mb > max_size_mb:
+            return False, f"File too large: {file_size_mb:.1f}MB (max: {max_size_mb}MB)"
 
         return True, None
 
+    def sniff_csv_dialect(self, file_path: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Detect the CSV dialect from a bounded sample at the start of the file.
+
+        Only the first CSV_SNIFF_SAMPLE_BYTES bytes are read, so the cost is
+        independent of the file size. Falls back to comma-separated when the
+        sample is ambiguous (e.g. a single-column file).
+
+        Returns:
+            (dialect_dict, error_message)
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                raw = f.read(CSV_SNIFF_SAMPLE_BYTES)
+                truncated = bool(f.read(1))
+        except OSError as e:
+            error_msg = f"Failed to read CSV: {str(e)}"
+            logger.error(error_msg)
+            return None, error_msg
+
+        sample = raw.decode('utf-8-sig', errors='replace')
+
+        # Drop the trailing partial line so the sniffer only sees whole records
+        if truncated and '\n' in sample:
+            sample = sample[:sample.rindex('\n')]
+
+        dialect = {
+            'delimiter': ',',
+            'quotechar': '"',
+            'doublequote': True,
+            'escapechar': None,
+        }
+
+        try:
+            sniffed = csv.Sniffer().sniff(sample, delimiters=CSV_SNIFF_DELIMITERS)
+            dialect['delimiter'] = sniffed.delimiter
+            dialect['quotechar'] = sniffed.quotechar or '"'
+            # The sniffer reports doublequote=False whenever the sample happens to
+            # contain no "" pairs, so only trust it when an escape char was found
+            if sniffed.escapechar:
+                dialect['escapechar'] = sniffed.escapechar
+                dialect['doublequote'] = sniffed.doublequote
+        except csv.Error:
+            logger.debug(f"Could not sniff dialect for {file_path}, assuming comma-separated")
+
+        logger.debug(f"Sniffed CSV dialect for {file_path}: {dialect}")
+        return dialect, None
+
+    def get_csv_engine(self) -> str:
+        """
+        Get the pandas parser engine to use for full CSV loads.
+
+        Returns:
+            'pyarrow' when configured and installed, otherwise 'c'
+        """
+        if CSV_ENGINE in ('auto', 'pyarrow') and HAS_PYARROW:
+            return 'pyarrow'
+        return 'c'
+
+    def get_load_variant(self, file_type: str) -> str:
+        """
+        Describe the load options that change a file's parsed DataFrame.
+
+        Used to key cached frames so a settings change never returns stale types.
+
+        Args:
+            file_type: 'csv' or 'xlsx'
+
+        Returns:
+            Variant string
+        """
+        variant = self.get_csv_engine() if file_type == 'csv' else 'xlsx'
+        if self.optimize_dtypes:
+            variant += '+dtypes'
+        return variant
+
+    def _finish_full_load(self, df):
+        """Apply load-time type optimization to a fully loaded DataFrame."""
+        if self.optimize_dtypes:
+            return self.dtype_service.optimize_dataframe(df)
+        return df
+
+    def _csv_read_kwargs(self, dialect: Optional[Dict]) -> Dict:
+        """
+        Build pd.read_csv keyword arguments for a sniffed dialect.
+
+        Args:
+            dialect: Dialect dict from sniff_csv_dialect (None for defaults)
+
+        Returns:
+            Dict of read_csv keyword arguments
+        """
+        dialect = dialect or {}
+        kwargs = {
+            'sep': dialect.get('delimiter', ','),
+            'quotechar': dialect.get('quotechar', '"'),
+            'doublequote': dialect.get('doublequote', True),
+        }
+        if dialect.get('escapechar'):
+            kwargs['escapechar'] = dialect['escapechar']
+        return kwargs
+
     def load_csv_metadata(self, file_path: str) -> Tuple[Optional[Dict], Optional[str]]:
         """
-        Load CSV file metadata (header row).
+        Load CSV file metadata (dialect and header row).
 
         Returns:
             (metadata_dict, error_message)
@@ -59,13 +197,18 @@ class FileService:
         if pd is None:
             return None, "pandas is not installed"
 
+        dialect, error = self.sniff_csv_dialect(file_path)
+        if error:
+            return None, error
+
         try:
-            # Read just the first row to get column names
-            df = pd.read_csv(file_path, nrows=0, sep=None, engine='python')
+            # Read just the header row to get column names
+            df = pd.read_csv(file_path, nrows=0, engine='c', **self._csv_read_kwargs(dialect))
 
             metadata = {
                 'columns': list(df.columns),
                 'num_columns': len(df.columns),
+                'dialect': dialect,
                 'file_type': 'csv'
             }
 
@@ -88,9 +231,8 @@ class FileService:
             return None, "pandas is not installed"
 
         try:
-            # Use ExcelFile to efficiently get sheet names without loading data
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
+            # Sheet names come from the workbook index, no cell data is read
+            sheet_names = self.workbook_cache.get_sheet_names(file_path)
 
             metadata = {
                 'sheets': sheet_names,
@@ -138,32 +280,164 @@ class FileService:
         else:
             return 'unknown'
 
-    def load_csv_dataframe(self, file_path: str) -> Tuple[Optional[object], Optional[str]]:
+    def load_csv_dataframe(
+        self,
+        file_path: str,
+        dialect: Optional[Dict] = None,
+        nrows: Optional[int] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        cancel_check: Optional[Callable[[], None]] = None
+    ) -> Tuple[Optional[object], Optional[str]]:
         """
         Load CSV file as a pandas DataFrame.
 
+        Files above CSV_LARGE_FILE_THRESHOLD_MB are memory-mapped, split at
+        record boundaries and parsed in parallel (see CsvChunkService).
+
+        Args:
+            file_path: Path to the CSV file
+            dialect: Previously sniffed dialect (sniffed here if None)
+            nrows: Only read the first N data rows (None for the whole file)
+            progress_callback: Called with the number of rows read after each chunk
+            cancel_check: Called between chunks; raises to abort the load
+
         Returns:
             (dataframe, error_message)
         """
         if pd is None:
             return None, "pandas is not installed"
 
+        if dialect is None:
+            dialect, error = self.sniff_csv_dialect(file_path)
+            if error:
+                return None, error
+
+        read_kwargs = self._csv_read_kwargs(dialect)
+        engine = self.get_csv_engine()
+
+        if nrows is not None:
+            # pyarrow does not support nrows; the C parser stops early anyway
+            read_kwargs['nrows'] = nrows
+            engine = 'c'
+
         try:
-            df = pd.read_csv(file_path, sep=None, engine='python')
-            logger.info(f"Loaded CSV DataFrame from {file_path}: {len(df)} rows, {len(df.columns)} columns")
+            if nrows is None and self.csv_chunk_service.should_use(os.path.getsize(file_path), dialect):
+                columns = list(pd.read_csv(file_path, nrows=0, engine='c', **read_kwargs).columns)
+                df = self.csv_chunk_service.load(
+                    file_path, columns, read_kwargs, engine, progress_callback, cancel_check
+                )
+                df = self._finish_full_load(df)
+                logger.info(
+                    f"Loaded CSV DataFrame from {file_path} (chunked, {engine} engine): "
+                    f"{len(df)} rows, {len(df.columns)} columns"
+                )
+                return df, None
+
+            if nrows is None and (progress_callback or cancel_check):
+                # Read in row chunks so progress is reported and cancellation checked between them
+                engine = 'c'
+                df = self._read_csv_chunked(file_path, read_kwargs, progress_callback, cancel_check)
+                df = self._finish_full_load(df)
+                logger.info(
+                    f"Loaded CSV DataFrame from {file_path} (c engine, row chunks): "
+                    f"{len(df)} rows, {len(df.columns)} columns"
+                )
+                return df, None
+
+            try:
+                df = pd.read_csv(file_path, engine=engine, **read_kwargs)
+            except Exception as e:
+                if engine == 'c':
+                    raise
+                # pyarrow rejects some dialects/inputs the C parser handles
+                logger.debug(f"pyarrow CSV engine failed for {file_path} ({e}), retrying with C engine")
+                engine = 'c'
+                df = pd.read_csv(file_path, engine=engine, **read_kwargs)
+
+            if engine == 'pyarrow':
+                df = normalize_pyarrow_dates(df)
+
+            if nrows is None:
+                df = self._finish_full_load(df)
+
+            logger.info(
+                f"Loaded CSV DataFrame from {file_path} ({engine} engine): "
+                f"{len(df)} rows, {len(df.columns)} columns"
+            )
             return df, None
         except Exception as e:
             error_msg = f"Failed to load CSV data: {str(e)}"
             logger.error(error_msg)
             return None, error_msg
 
-    def load_xlsx_sheet(self, file_path: str, sheet_name: str) -> Tuple[Optional[object], Optional[str]]:
+    def _read_csv_chunked(
+        self,
+        file_path: str,
+        read_kwargs: Dict,
+        progress_callback: Optional[Callable[[int], None]],
+        cancel_check: Optional[Callable[[], None]]
+    ):
+        """
+        Read a CSV with the C engine, CSV_PROGRESS_CHUNK_ROWS rows at a time.
+
+        Types are inferred per chunk, so columns that come out as text in some
+        chunks and typed in others are read again as text throughout, as for
+        parallel chunked loads.
+
+        Args:
+            file_path: Path to the CSV file
+            read_kwargs: pd.read_csv keyword arguments for the dialect
+            progress_callback: Called with the number of rows read after each chunk
+            cancel_check: Called between chunks; raises to abort the load
+
+        Returns:
+            DataFrame
+        """
+        def read_chunks(kwargs, report):
+            frames = []
+            rows_read = 0
+            with pd.read_csv(file_path, engine='c', chunksize=CSV_PROGRESS_CHUNK_ROWS, **kwargs) as reader:
+                for chunk in reader:
+                    if cancel_check:
+                        cancel_check()
+                    frames.append(chunk)
+                    rows_read += len(chunk)
+                    if report and progress_callback:
+                        progress_callback(rows_read)
+            return frames
+
+        frames = read_chunks(read_kwargs, True)
+        if not frames:
+            return pd.read_csv(file_path, nrows=0, engine='c', **read_kwargs)
+
+        text_columns = self.csv_chunk_service.find_mixed_columns(frames)
+        if text_columns:
+            logger.debug(f"Re-reading {file_path} with text columns: {text_columns}")
+            frames = read_chunks(dict(read_kwargs, dtype={col: str for col in text_columns}), False)
+
+        self.csv_chunk_service.align_null_chunks(frames)
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def load_xlsx_sheet(
+        self,
+        file_path: str,
+        sheet_name: str,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        nrows: Optional[int] = None
+    ) -> Tuple[Optional[object], Optional[str]]:
         """
         Load a specific sheet from XLSX file as a pandas DataFrame.
 
+        XLSX sheets are streamed in row chunks from the read-only workbook
+        rather than materialised through openpyxl's full object model.
+
         Args:
             file_path: Path to the XLSX file
             sheet_name: Name of the sheet to load
+            progress_callback: Called with the number of rows read after each chunk
+            nrows: Only read the first N data rows (None for the whole sheet)
 
         Returns:
             (dataframe, error_message)
@@ -172,7 +446,19 @@ class FileService:
             return None, "pandas is not installed"
 
         try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            # Reuse the shared workbook handle instead of re-opening the archive
+            with self.workbook_cache.open_workbook(file_path) as excel_file:
+                if self.xlsx_stream_service.supports(excel_file):
+                    df = self.xlsx_stream_service.read_sheet(
+                        excel_file.book,
+                        sheet_name,
+                        progress_callback,
+                        max_rows=nrows
+                    )
+                else:
+                    df = excel_file.parse(sheet_name=sheet_name, nrows=nrows)
+            if nrows is None:
+                df = self._finish_full_load(df)
             logger.info(f"Loaded XLSX sheet '{sheet_name}' from {file_path}: {len(df)} rows, {len(df.columns)} columns")
             return df, None
         except Exception as e:
@@ -0,0 +1,230 @@
+"""Service for caching factorized pivot group keys."""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pivot_builder.config.logging_config import logger
+
+
+# Mixed-radix group ids must fit in int64
+_MAX_GROUP_ID = np.iinfo(np.int64).max
+
+
+@dataclass
+class GroupIndex:
+    """
+    Integer group ids for one key-column tuple across a dataset's partitions.
+
+    Attributes:
+        keys: Key column names
+        group_ids: Per-partition int64 arrays of group ids (-1 where any key is null)
+        uniques: Key column -> Index of the distinct values codes refer to
+        radices: Number of distinct values per key column (mixed-radix base)
+    """
+    keys: Tuple[str, ...]
+    group_ids: List[np.ndarray]
+    uniques: Dict[str, pd.Index]
+    radices: List[int]
+
+    def decode(self, group_ids: np.ndarray) -> Dict[str, pd.Index]:
+        """
+        Turn group ids back into key values.
+
+        Args:
+            group_ids: Non-negative group ids
+
+        Returns:
+            Dict mapping key column -> Index of values (in the column's dtype)
+        """
+        remaining = np.asarray(group_ids, dtype=np.int64)
+        decoded = {}
+        for key, radix in zip(reversed(self.keys), reversed(self.radices)):
+            remaining, codes = np.divmod(remaining, radix)
+            decoded[key] = self.uniques[key].take(codes)
+        return {key: decoded[key] for key in self.keys}
+
+
+class KeyIndexService:
+    """
+    Caches factorized key columns per dataset version.
+
+    Factorizing string keys is the dominant cost of grouping. Each key column
+    is factorized once per dataset version into codes that refer to one set of
+    uniques shared by every partition, and each key tuple is combined into one
+    integer group id per row. Rebuilds that only change values, aggregations or
+    filters then group on integers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dataset_version = None
+        self._columns = {}  # column -> (uniques, [codes per partition]) or None if unsupported
+        self._groups = {}  # key tuple -> GroupIndex or None if unsupported
+
+    def get_group_index(
+        self,
+        dataset_version: int,
+        partitions: List[pd.DataFrame],
+        keys: List[str]
+    ) -> Optional[GroupIndex]:
+        """
+        Get integer group ids for a key tuple, factorizing on first use.
+
+        Args:
+            dataset_version: CombinedDataset.version the partitions belong to
+            partitions: All of the dataset's partitions, in a stable order
+            keys: Key column names
+
+        Returns:
+            GroupIndex, or None if the keys cannot be encoded (categoricals with
+            differing categories, or too many combinations for int64 ids)
+        """
+        keys = tuple(keys)
+        with self._lock:
+            if dataset_version != self._dataset_version:
+                self._columns.clear()
+                self._groups.clear()
+                self._dataset_version = dataset_version
+
+            if keys in self._groups:
+                return self._groups[keys]
+
+            group_index = self._build_group_index(partitions, keys)
+            self._groups[keys] = group_index
+            return group_index
+
+    def get_cached_codes(
+        self,
+        dataset_version: int,
+        column: str
+    ) -> Optional[Tuple[pd.Index, List[np.ndarray]]]:
+        """
+        Get a column's codes if it has already been factorized.
+
+        Args:
+            dataset_version: CombinedDataset.version the codes must belong to
+            column: Column name
+
+        Returns:
+            (uniques, per-partition codes with -1 for nulls) or None
+        """
+        with self._lock:
+            if dataset_version != self._dataset_version:
+                return None
+            return self._columns.get(column)
+
+    def invalidate(self):
+        """Drop all cached codes."""
+        with self._lock:
+            self._columns.clear()
+            self._groups.clear()
+            self._dataset_version = None
+
+    def _build_group_index(
+        self,
+        partitions: List[pd.DataFrame],
+        keys: Tuple[str, ...]
+    ) -> Optional[GroupIndex]:
+        columns = []
+        for key in keys:
+            if key not in self._columns:
+                self._columns[key] = self._factorize_column(partitions, key)
+            if self._columns[key] is None:
+                logger.debug(f"Key column {key} cannot be factorized across partitions")
+                return None
+            columns.append(self._columns[key])
+
+        # Empty uniques still need a radix of 1 so ids stay decodable
+        radices = [max(1, len(uniques)) for uniques, _ in columns]
+        combinations = 1
+        for radix in radices:
+            combinations *= radix
+        if combinations > _MAX_GROUP_ID:
+            logger.debug(f"Too many key combinations for {keys} to use integer group ids")
+            return None
+
+        group_ids = []
+        for i in range(len(partitions)):
+            ids = None
+            valid = None
+            for (_, codes), radix in zip(columns, radices):
+                part_codes = codes[i]
+                ids = part_codes.astype(np.int64) if ids is None else ids * radix + part_codes
+                valid = part_codes >= 0 if valid is None else valid & (part_codes >= 0)
+            ids[~valid] = -1
+            group_ids.append(ids)
+
+        logger.debug(f"Factorized group keys {list(keys)} into {combinations} possible groups")
+        return GroupIndex(
+            keys=keys,
+            group_ids=group_ids,
+            uniques={key: uniques for key, (uniques, _) in zip(keys, columns)},
+            radices=radices
+        )
+
+    @staticmethod
+    def _factorize_column(
+        partitions: List[pd.DataFrame],
+        column: str
+    ) -> Optional[Tuple[pd.Index, List[np.ndarray]]]:
+        """
+        Factorize one column of every partition against shared uniques.
+
+        Categorical columns reuse their own codes (no hashing) as long as all
+        partitions share the same categories. Other columns are factorized per
+        partition and the partition uniques are mapped into the shared set.
+        Partitions without the column get null codes.
+
+        Returns:
+            (uniques, per-partition codes) or None if unsupported
+        """
+        series_list = [p[column] if column in p.columns else None for p in partitions]
+        present = [s for s in series_list if s is not None]
+
+        categorical = [isinstance(s.dtype, pd.CategoricalDtype) for s in present]
+        if any(categorical):
+            dtype = present[0].dtype
+            if not all(categorical) or any(s.dtype != dtype for s in present):
+                return None
+            uniques = pd.CategoricalIndex(
+                pd.Categorical.from_codes(np.arange(len(dtype.categories)), dtype=dtype)
+            )
+            codes = [
+                np.full(len(p), -1, dtype=np.int64) if s is None else np.asarray(s.cat.codes, dtype=np.int64)
+                for p, s in zip(partitions, series_list)
+            ]
+            return uniques, codes
+
+        uniques = None
+        codes = []
+        for p, s in zip(partitions, series_list):
+            if s is None:
+                codes.append(np.full(len(p), -1, dtype=np.int64))
+                continue
+
+            part_codes, part_uniques = pd.factorize(s, use_na_sentinel=True)
+            part_codes = part_codes.astype(np.int64, copy=False)
+            if len(part_uniques) == 0:
+                # All null: nothing to add (and no all-NaN dtype to widen the uniques)
+                codes.append(part_codes)
+                continue
+            if uniques is None:
+                uniques = part_uniques
+                codes.append(part_codes)
+                continue
+
+            # Map this partition's uniques into the shared set, appending new values
+            positions = uniques.get_indexer(part_uniques)
+            new = positions == -1
+            if new.any():
+                positions[new] = len(uniques) + np.arange(int(new.sum()))
+                uniques = uniques.append(part_uniques[new])
+            codes.append(np.where(part_codes >= 0, positions.take(part_codes, mode='clip'), -1))
+
+        if uniques is None:
+            uniques = pd.Index([])
+        return uniques, codes
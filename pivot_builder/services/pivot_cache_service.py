@@ -0,0 +1,129 @@
+"""Service for caching pivot results."""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Tuple
+
+from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import PIVOT_CACHE_MAX_MB
+from pivot_builder.models.pivot_model import PivotConfig
+
+
+class PivotCacheService:
+    """
+    LRU cache of pivot results keyed by dataset version and config fingerprint.
+
+    Entries are sized with DataFrame.memory_usage and evicted least recently
+    used first once the memory budget is exceeded. Results for an older
+    dataset version can never be hit again, so they are dropped as soon as a
+    newer version is seen.
+    """
+
+    def __init__(self, max_bytes: int = PIVOT_CACHE_MAX_MB * 1024 * 1024):
+        """
+        Initialize the pivot cache.
+
+        Args:
+            max_bytes: Memory budget for cached results
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (version, fingerprint) -> (DataFrame, size)
+        self._total_bytes = 0
+        self._dataset_version = None
+
+    @staticmethod
+    def fingerprint(config: PivotConfig) -> str:
+        """
+        Hash a pivot configuration.
+
+        Args:
+            config: PivotConfig
+
+        Returns:
+            Hex digest of the canonical JSON form of config.to_dict()
+        """
+        payload = json.dumps(config.to_dict(), sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _key(self, dataset_version: int, config: PivotConfig) -> Tuple[int, str]:
+        if dataset_version != self._dataset_version:
+            # A new dataset makes every cached result unreachable
+            if self._entries:
+                logger.debug(f"Dataset version changed, dropping {len(self._entries)} cached pivots")
+            self.clear()
+            self._dataset_version = dataset_version
+        return dataset_version, self.fingerprint(config)
+
+    def get(self, dataset_version: int, config: PivotConfig):
+        """
+        Get a cached pivot result.
+
+        Args:
+            dataset_version: CombinedDataset.version the result was built from
+            config: PivotConfig the result was built with
+
+        Returns:
+            Cached DataFrame, or None on a miss
+        """
+        key = self._key(dataset_version, config)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(key)
+        logger.info("Pivot cache hit")
+        return entry[0]
+
+    def put(self, dataset_version: int, config: PivotConfig, pivot_df) -> bool:
+        """
+        Store a pivot result.
+
+        Args:
+            dataset_version: CombinedDataset.version the result was built from
+            config: PivotConfig the result was built with
+            pivot_df: Pivot result
+
+        Returns:
+            True if the result was cached (results larger than the budget are not)
+        """
+        if pivot_df is None:
+            return False
+
+        key = self._key(dataset_version, config)
+        size = int(pivot_df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            logger.debug(f"Pivot result too large to cache ({size / 1024 / 1024:.1f}MB)")
+            return False
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._total_bytes -= old[1]
+
+        self._entries[key] = (pivot_df, size)
+        self._total_bytes += size
+
+        while self._total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_size
+            logger.debug("Evicted least recently used pivot result")
+
+        return True
+
+    def invalidate(self):
+        """Drop all cached results (e.g. after the combined dataset is rebuilt)."""
+        self.clear()
+        self._dataset_version = None
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def get_stats(self) -> dict:
+        """Get entry count and memory use."""
+        return {
+            'entries': len(self._entries),
+            'bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+        }
@@ -1,17 +1,70 @@
 """Service for building pivot tables from DataFrames."""
 
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+import numpy as np
 import pandas as pd
 
 from pivot_builder.config.logging_config import logger
 from pivot_builder.models.pivot_model import PivotConfig, PivotValueField
+from pivot_builder.models.dataset_model import SOURCE_FILE_COLUMN
+from pivot_builder.config.app_config import (
+    PIVOT_MAX_WORKERS,
+    PIVOT_CACHE_KEY_CODES,
+    PIVOT_PARALLEL_MEASURES,
+)
+from pivot_builder.services.background_task_service import TaskCancelledError
+from pivot_builder.services.key_index_service import KeyIndexService
+
+
+# Partial aggregates computed per partition for each aggregation
+PARTIAL_AGGS = {
+    'sum': ['sum'],
+    'count': ['count'],
+    'min': ['min'],
+    'max': ['max'],
+    'mean': ['sum', 'count'],
+}
+
+# How partial aggregates of each kind are merged across partitions
+PARTIAL_MERGE = {
+    'sum': 'sum',
+    'count': 'sum',
+    'min': 'min',
+    'max': 'max',
+}
+
+# Aggregation used to reshape merged values (one row per group) into the pivot layout
+MERGED_RESHAPE_AGGS = {
+    'sum': 'sum',
+    'count': 'sum',
+    'min': 'min',
+    'max': 'max',
+    'mean': 'mean',
+}
+
+# Column holding integer group ids while aggregating on cached key codes
+GROUP_ID_COLUMN = '__group_id'
 
 
 class PivotEngineService:
     """Builds pivot tables from DataFrames using pivot configurations."""
 
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        cache_key_codes: bool = PIVOT_CACHE_KEY_CODES,
+        parallel_measures: bool = PIVOT_PARALLEL_MEASURES
+    ):
+        """
+        Initialize pivot engine.
+
+        Args:
+            cache_key_codes: Reuse factorized row/column keys across rebuilds
+            parallel_measures: Aggregate multiple value fields concurrently
+                over shared group codes (requires cache_key_codes)
+        """
+        self.key_index = KeyIndexService() if cache_key_codes else None
+        self.parallel_measures = parallel_measures
 
     def build_pivot(self, df: pd.DataFrame, config: PivotConfig) -> pd.DataFrame:
         """
@@ -40,44 +93,505 @@ class PivotEngineService:
                 logger.warning("No data left after applying filters")
                 return pd.DataFrame()
 
-            # Step 2: Build aggregation function dictionary
+            return self._pivot_filtered(filtered_df, config)
+
+        except Exception as e:
+            logger.error(f"Error building pivot: {e}", exc_info=True)
+            return pd.DataFrame()
+
+    def _pivot_filtered(
+        self,
+        filtered_df: pd.DataFrame,
+        config: PivotConfig,
+        aggfunc_dict: Optional[Dict[str, str]] = None,
+        total_rows: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Pivot an already-filtered DataFrame (steps 2-7 of build_pivot).
+
+        Args:
+            filtered_df: Source rows with filters applied
+            config: PivotConfig with rows, columns and values
+            aggfunc_dict: Aggregations to use instead of the config's
+            total_rows: Row count of the full result, if filtered_df was
+                already cut down to the rows the window can select
+
+        Returns:
+            Pivoted DataFrame with flattened columns and reset index
+        """
+        # Step 2: Build aggregation function dictionary
+        if aggfunc_dict is None:
             aggfunc_dict = self._build_aggfunc_dict(config.values)
 
-            # Step 3: Determine index and columns
-            index = config.rows if config.rows else None
-            columns = config.columns if config.columns else None
+        # Step 3: Determine index and columns
+        index = config.rows if config.rows else None
+        columns = config.columns if config.columns else None
+
+        # Step 4: Extract value column names (once each; aggfunc_dict has one entry per column)
+        values = list(dict.fromkeys(v.column for v in config.values))
+        filtered_df = self._widen_value_columns(filtered_df, values)
+
+        # Step 5: Build pivot table
+        logger.info(
+            f"Building pivot: index={index}, columns={columns}, "
+            f"values={values}, aggfunc={aggfunc_dict}"
+        )
+
+        pivot_df = pd.pivot_table(
+            filtered_df,
+            index=index,
+            columns=columns,
+            values=values,
+            aggfunc=aggfunc_dict,
+            fill_value=0,
+            observed=True  # Only category combinations that occur in the data
+        )
+
+        # Sort/top-N/page before flattening so later steps only see the page
+        if config.has_window():
+            pivot_df = self._apply_window(pivot_df, config)
+            if total_rows is not None:
+                pivot_df.attrs['total_rows'] = (
+                    total_rows if config.top_n is None else min(config.top_n, total_rows)
+                )
+
+        # Step 6: Flatten MultiIndex columns if present
+        pivot_df = self._flatten_columns(pivot_df, config.values)
+
+        # Step 7: Reset index to make it a flat DataFrame
+        pivot_df = pivot_df.reset_index()
+
+        logger.info(f"Pivot built successfully: shape={pivot_df.shape}")
+        return pivot_df
 
-            # Step 4: Extract value column names
-            values = [v.column for v in config.values]
+    def build_pivot_from_dataset(
+        self,
+        dataset,
+        config: PivotConfig,
+        cancel_check: Optional[Callable[[], None]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        sample_rows: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Build a pivot table from a partitioned CombinedDataset.
+
+        Each partition is filtered, projected and grouped on its own (in
+        parallel), and the small per-partition aggregates are merged; the
+        combined frame is never built. sum/count/min/max merge directly and
+        mean is carried as sum and count. Without row or column fields there
+        is nothing to group on, so the projected partitions are concatenated
+        and pivoted directly.
+
+        A filter on the source column selects whole partitions instead of
+        scanning rows. Row and column keys are grouped on integer group ids
+        cached per dataset version (see KeyIndexService), so only the first
+        pivot of a dataset pays for hashing string keys.
+
+        With sample_rows, a fast approximate result is built from every k-th
+        row (about sample_rows rows in total): sums and counts are scaled up by
+        the sampled fraction, means/min/max are taken over the sample, and the
+        result's attrs['sample_fraction'] is set. The sample is taken on top of
+        the same cached key codes, so the exact build that follows reuses them.
+        Results without attrs['sample_fraction'] are exact (a dataset within
+        sample_rows, or a pivot without row/column fields, is never sampled).
 
-            # Step 5: Build pivot table
-            logger.info(
-                f"Building pivot: index={index}, columns={columns}, "
-                f"values={values}, aggfunc={aggfunc_dict}"
-            )
+        Args:
+            dataset: CombinedDataset (see CombinedDataset.iter_source_partitions)
+            config: PivotConfig with rows, columns, values, and filters
+            cancel_check: Called between steps and per partition; raises
+                TaskCancelledError (e.g. BackgroundTask.check_cancelled) to abort
+            progress_callback: Called with (done, total) as partitions (or, in
+                measure-parallel mode, value columns) are aggregated
+            sample_rows: Approximate from a sample of about this many rows
 
-            pivot_df = pd.pivot_table(
-                filtered_df,
-                index=index,
-                columns=columns,
-                values=values,
-                aggfunc=aggfunc_dict,
-                fill_value=0
-            )
+        Returns:
+            Pivoted DataFrame with flattened columns and reset index
 
-            # Step 6: Flatten MultiIndex columns if present
-            pivot_df = self._flatten_columns(pivot_df, config.values)
+        Raises:
+            TaskCancelledError: If cancel_check raised it
+        """
+        if not config.is_valid():
+            logger.warning("Pivot configuration is not valid (no values defined)")
+            return pd.DataFrame()
 
-            # Step 7: Reset index to make it a flat DataFrame
-            pivot_df = pivot_df.reset_index()
+        check = cancel_check or (lambda: None)
 
-            logger.info(f"Pivot built successfully: shape={pivot_df.shape}")
+        keys = list(dict.fromkeys(list(config.rows) + list(config.columns)))
+        aggfunc_dict = self._build_aggfunc_dict(config.values)
+        needed = list(dict.fromkeys(keys + list(aggfunc_dict)))
+
+        # Source filtering is resolved per partition from its metadata
+        filters = dict(config.filters or {})
+        allowed_sources = filters.pop(SOURCE_FILE_COLUMN, None)
+
+        source_partitions = list(dataset.iter_source_partitions())
+        filters = self._coerce_filters(filters, [partition for _, partition in source_partitions])
+        selected = [
+            i for i, (meta, partition) in enumerate(source_partitions)
+            if not (
+                allowed_sources
+                and SOURCE_FILE_COLUMN in partition.columns
+                and meta.source_name not in allowed_sources
+            )
+        ]
+        partitions = [source_partitions[i][1] for i in selected]
+
+        # Every sample_step-th row of each partition, when approximating
+        sample_step = 1
+        sample_fraction = None
+        total_source_rows = sum(len(partition) for partition in partitions)
+        if keys and sample_rows and total_source_rows > sample_rows:
+            sample_step = -(-total_source_rows // sample_rows)
+            sampled_rows = sum(-(-len(partition) // sample_step) for partition in partitions)
+            sample_fraction = sampled_rows / total_source_rows
+            logger.info(f"Approximating pivot from {sampled_rows} of {total_source_rows} rows")
+
+        def no_rows():
+            logger.warning("No data left after applying filters")
+            empty = pd.DataFrame()
+            if sample_fraction is not None:
+                # An empty sample says nothing about the full data
+                empty.attrs['sample_fraction'] = sample_fraction
+            return empty
+
+        def project(partition, compiled):
+            # Project first so the single filtered take only copies needed columns
+            projected = partition[[col for col in needed if col in partition.columns]]
+            mask = self._filter_mask(partition, compiled, sample_step=sample_step)
+            return projected if mask is None else projected[mask]
+
+        try:
+            if not keys:
+                compiled = self._compile_filters(filters)
+                pieces = [piece for piece in (project(p, compiled) for p in partitions) if len(piece) > 0]
+                if not pieces:
+                    logger.warning("No data left after applying filters")
+                    return pd.DataFrame()
+                df = pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0]
+                return self._pivot_filtered(df, config)
+
+            check()
+            group_index = None
+            if self.key_index is not None:
+                group_index = self.key_index.get_group_index(
+                    dataset.version,
+                    [partition for _, partition in source_partitions],
+                    keys
+                )
+
+            # Measure-parallel mode only pays off with several measures and cores
+            if (
+                group_index is not None
+                and self.parallel_measures
+                and PIVOT_MAX_WORKERS > 1
+                and len(aggfunc_dict) > 1
+            ):
+                merged = self._aggregate_measures(
+                    [(i, source_partitions[i][1]) for i in selected],
+                    group_index,
+                    self._compile_filters(filters, dataset.version),
+                    aggfunc_dict,
+                    check,
+                    progress_callback,
+                    sample_step=sample_step
+                )
+                if merged is None:
+                    return no_rows()
+            else:
+                if group_index is not None:
+                    compiled = self._compile_filters(filters, dataset.version)
+
+                    def aggregate(i):
+                        check()
+                        return self._partial_aggregate_coded(
+                            source_partitions[i][1], i, group_index.group_ids[i], compiled, aggfunc_dict,
+                            sample_step=sample_step
+                        )
+                    work = selected
+                else:
+                    compiled = self._compile_filters(filters)
+
+                    def aggregate(partition):
+                        check()
+                        return self._partial_aggregate(project(partition, compiled), keys, aggfunc_dict)
+                    work = partitions
+
+                partials = []
+                with ThreadPoolExecutor(max_workers=max(1, min(PIVOT_MAX_WORKERS, len(work)))) as pool:
+                    for done, partial in enumerate(pool.map(aggregate, work), 1):
+                        if partial is not None:
+                            partials.append(partial)
+                        if progress_callback:
+                            progress_callback(done, len(work))
+
+                if not partials:
+                    return no_rows()
+
+                if group_index is not None:
+                    merged = self._merge_partials(partials, [GROUP_ID_COLUMN], aggfunc_dict)
+                    key_values = pd.DataFrame(group_index.decode(merged[GROUP_ID_COLUMN].to_numpy()))
+                    merged = pd.concat([key_values, merged.drop(columns=GROUP_ID_COLUMN)], axis=1)
+                else:
+                    merged = self._merge_partials(partials, keys, aggfunc_dict)
+                logger.debug(f"Merged {len(partials)} partial aggregates into {len(merged)} groups")
+
+            check()
+
+            if sample_fraction is not None:
+                merged = self._scale_sample(merged, aggfunc_dict, sample_fraction)
+
+            # Reshape the merged groups (one row per key combination) with
+            # pivot_table so the layout matches build_pivot exactly
+            source_dtypes = {}
+            for partition in partitions:
+                for col in aggfunc_dict:
+                    if col in partition.columns and col not in source_dtypes:
+                        source_dtypes[col] = partition[col].dtype
+            merged = self._restore_integer_means(merged, aggfunc_dict, source_dtypes)
+
+            # Without column fields every merged group is one result row, so a
+            # top-N/page sorted by a value only needs its candidate rows reshaped
+            total_rows = None
+            if (
+                not config.columns
+                and config.sort_by in aggfunc_dict
+                and (config.top_n is not None or config.limit is not None)
+            ):
+                _, _, stop = self._window_bounds(config, len(merged))
+                candidates = self._top_candidates(merged[config.sort_by], stop, config.sort_ascending)
+                if candidates is not None:
+                    total_rows = len(merged)
+                    merged = merged.iloc[candidates]
+                    logger.debug(f"Reshaping {len(merged)} of {total_rows} groups for the requested page")
+
+            pivot_df = self._pivot_filtered(
+                merged,
+                config,
+                {col: MERGED_RESHAPE_AGGS[agg] for col, agg in aggfunc_dict.items()},
+                total_rows=total_rows
+            )
+            if sample_fraction is not None:
+                pivot_df.attrs['sample_fraction'] = sample_fraction
             return pivot_df
 
+        except TaskCancelledError:
+            logger.info("Pivot build cancelled")
+            raise
         except Exception as e:
             logger.error(f"Error building pivot: {e}", exc_info=True)
             return pd.DataFrame()
 
+    def _partial_aggregate(
+        self,
+        df: pd.DataFrame,
+        keys: List[str],
+        aggfunc_dict: Dict[str, str]
+    ) -> Optional[pd.DataFrame]:
+        """
+        Aggregate one partition into mergeable partial results.
+
+        Args:
+            df: Filtered, projected partition
+            keys: Group key columns (rows + columns)
+            aggfunc_dict: Value column -> aggregation
+
+        Returns:
+            DataFrame with the key columns plus one column per partial
+            ('<col>|sum', '<col>|count', '<col>|min', '<col>|max'), or None if empty
+        """
+        if len(df) == 0:
+            return None
+
+        named_aggs = {}
+        for col, agg in aggfunc_dict.items():
+            for part in PARTIAL_AGGS[agg]:
+                named_aggs[f"{col}|{part}"] = (col, part)
+
+        df = self._widen_value_columns(df, list(aggfunc_dict))
+        grouped = df.groupby(keys, observed=True, sort=False, dropna=True)
+        return grouped.agg(**named_aggs).reset_index()
+
+    def _partial_aggregate_coded(
+        self,
+        partition: pd.DataFrame,
+        partition_index: int,
+        group_ids: np.ndarray,
+        compiled: List[tuple],
+        aggfunc_dict: Dict[str, str],
+        sample_step: int = 1
+    ) -> Optional[pd.DataFrame]:
+        """
+        Aggregate one partition by precomputed integer group ids.
+
+        The null-key and filter masks are combined and applied in one take.
+
+        Args:
+            partition: Unfiltered partition
+            partition_index: Position of the partition in the dataset
+            group_ids: Group id per row of the partition (-1 for null keys)
+            compiled: Filters from _compile_filters
+            aggfunc_dict: Value column -> aggregation
+            sample_step: Only aggregate every sample_step-th row
+
+        Returns:
+            Partial aggregates keyed by GROUP_ID_COLUMN, or None if empty
+        """
+        mask = group_ids >= 0
+        filter_mask = self._filter_mask(partition, compiled, partition_index, sample_step)
+        if filter_mask is not None:
+            mask &= filter_mask
+
+        values = partition[[col for col in aggfunc_dict if col in partition.columns]]
+        df = values.assign(**{GROUP_ID_COLUMN: group_ids})[mask]
+        return self._partial_aggregate(df, [GROUP_ID_COLUMN], aggfunc_dict)
+
+    def _aggregate_measures(
+        self,
+        partitions: List[tuple],
+        group_index,
+        compiled: List[tuple],
+        aggfunc_dict: Dict[str, str],
+        cancel_check: Optional[Callable[[], None]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        sample_step: int = 1
+    ) -> Optional[pd.DataFrame]:
+        """
+        Aggregate every value column concurrently over shared group codes.
+
+        The masked group ids of all partitions are densified once into a
+        categorical grouper, so no per-measure groupby hashes keys again. Each
+        value column is then gathered and reduced in its own thread; pandas'
+        cython group reductions release the GIL, so measures run in parallel.
+
+        Args:
+            partitions: (dataset partition index, partition) pairs to aggregate
+            group_index: GroupIndex for the row/column keys
+            compiled: Filters from _compile_filters
+            aggfunc_dict: Value column -> aggregation
+            cancel_check: Called before each value column; raises to abort
+            progress_callback: Called with (columns_done, column_count)
+            sample_step: Only aggregate every sample_step-th row
+
+        Returns:
+            DataFrame with the key columns and one column per value column,
+            or None if no rows remain
+        """
+        check = cancel_check or (lambda: None)
+        masks = []
+        id_parts = []
+        for i, partition in partitions:
+            group_ids = group_index.group_ids[i]
+            mask = group_ids >= 0
+            filter_mask = self._filter_mask(partition, compiled, i, sample_step)
+            if filter_mask is not None:
+                mask &= filter_mask
+            masks.append(mask)
+            id_parts.append(group_ids[mask])
+
+        ids = np.concatenate(id_parts) if id_parts else np.empty(0, dtype=np.int64)
+        if len(ids) == 0:
+            return None
+
+        # A categorical grouper lets every groupby below use the codes as-is
+        codes, group_ids = pd.factorize(ids)
+        n_groups = len(group_ids)
+        grouper = pd.Categorical.from_codes(codes, categories=pd.RangeIndex(n_groups))
+
+        def gather(col):
+            series = [
+                partition[col] if col in partition.columns
+                else pd.Series(np.nan, index=partition.index)
+                for _, partition in partitions
+            ]
+            if all(isinstance(ser.dtype, np.dtype) and ser.dtype.kind in 'iuf' for ser in series):
+                array = np.concatenate([ser.to_numpy()[mask] for ser, mask in zip(series, masks)])
+                return array.astype(np.float64) if array.dtype == np.float32 else array
+            return pd.concat([ser[mask] for ser, mask in zip(series, masks)], ignore_index=True)
+
+        def reduce(col):
+            check()
+            grouped = pd.Series(gather(col)).groupby(grouper, observed=False, sort=True)
+            return {part: grouped.agg(part).to_numpy() for part in PARTIAL_AGGS[aggfunc_dict[col]]}
+
+        columns = list(aggfunc_dict)
+        reduced = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(PIVOT_MAX_WORKERS, len(columns)))) as pool:
+            for done, (col, parts) in enumerate(zip(columns, pool.map(reduce, columns)), 1):
+                reduced[col] = parts
+                if progress_callback:
+                    progress_callback(done, len(columns))
+
+        result = pd.DataFrame(group_index.decode(group_ids))
+        for col, agg in aggfunc_dict.items():
+            if agg == 'mean':
+                total = pd.Series(reduced[col]['sum'])
+                count = pd.Series(reduced[col]['count'])
+                result[col] = total / count.where(count != 0)
+            else:
+                result[col] = reduced[col][agg]
+
+        logger.debug(f"Aggregated {len(columns)} measures over {n_groups} groups")
+        return result
+
+    def _merge_partials(
+        self,
+        partials: List[pd.DataFrame],
+        keys: List[str],
+        aggfunc_dict: Dict[str, str]
+    ) -> pd.DataFrame:
+        """
+        Merge per-partition partial aggregates into final per-group values.
+
+        Args:
+            partials: Outputs of _partial_aggregate
+            keys: Group key columns
+            aggfunc_dict: Value column -> aggregation
+
+        Returns:
+            DataFrame with the key columns and one column per value column
+        """
+        combined = pd.concat(partials, ignore_index=True) if len(partials) > 1 else partials[0]
+
+        merge_aggs = {
+            name: (name, PARTIAL_MERGE[name.rsplit('|', 1)[1]])
+            for name in combined.columns if name not in keys
+        }
+        merged = combined.groupby(keys, observed=True, sort=True, dropna=True).agg(**merge_aggs)
+
+        result = merged[[]].copy()
+        for col, agg in aggfunc_dict.items():
+            if agg == 'mean':
+                total = merged[f"{col}|sum"]
+                count = merged[f"{col}|count"]
+                result[col] = total / count.where(count != 0)
+            else:
+                result[col] = merged[f"{col}|{agg}"]
+
+        return result.reset_index()
+
+    @staticmethod
+    def _restore_integer_means(
+        merged: pd.DataFrame,
+        aggfunc_dict: Dict[str, str],
+        source_dtypes: Dict[str, object]
+    ) -> pd.DataFrame:
+        """
+        Cast whole-number means of integer columns back to the source dtype.
+
+        pd.pivot_table does this for integer value columns, so the merged
+        result has to as well to produce the same output.
+        """
+        for col, agg in aggfunc_dict.items():
+            dtype = source_dtypes.get(col)
+            if agg != 'mean' or dtype is None or not isinstance(dtype, np.dtype) or dtype.kind not in 'iu':
+                continue
+            values = merged[col]
+            if values.notna().all() and (values == np.round(values)).all():
+                info = np.iinfo(dtype)
+                if len(values) == 0 or (values.min() >= info.min and values.max() <= info.max):
+                    merged[col] = values.astype(dtype)
+        return merged
+
     def _apply_filters(
         self,
         df: pd.DataFrame,
@@ -86,24 +600,214 @@ class PivotEngineService:
         """
         Apply filters to DataFrame.
 
+        All filters are evaluated into one boolean mask and the rows are taken
+        once, so the frame is neither copied up front nor re-sliced per filter.
+
         Args:
             df: Source DataFrame
             filters: Dict mapping column names to list of allowed values
 
         Returns:
-            Filtered DataFrame
+            Filtered DataFrame (df itself if no filter applies)
         """
-        if not filters:
+        mask = self._filter_mask(df, self._compile_filters(self._coerce_filters(filters, [df])))
+        if mask is None:
             return df
 
-        filtered = df.copy()
-        for column, allowed_values in filters.items():
-            if column in filtered.columns and allowed_values:
-                filtered = filtered[filtered[column].isin(allowed_values)]
-                logger.debug(f"Applied filter on {column}: {len(filtered)} rows remain")
-
+        filtered = df[mask]
+        logger.debug(f"Applied filters on {list(filters)}: {len(filtered)} rows remain")
         return filtered
 
+    def _coerce_filters(self, filters: dict, frames: List[pd.DataFrame]) -> dict:
+        """
+        Convert filter values to the type of the column they filter.
+
+        Saved configurations carry filter values as JSON strings, while date
+        and numeric columns are parsed at load time; '2024-01-05' never
+        equals a Timestamp, so unconverted values would match nothing.
+
+        Args:
+            filters: Dict mapping column names to list of allowed values
+            frames: DataFrames the filters will be applied to (the first one
+                holding a column gives its dtype)
+
+        Returns:
+            Dict with the same keys and converted value lists
+        """
+        coerced = {}
+        for column, allowed_values in (filters or {}).items():
+            dtype = next((frame[column].dtype for frame in frames if column in frame.columns), None)
+            if dtype is not None and allowed_values:
+                allowed_values = self._coerce_filter_values(allowed_values, dtype)
+            coerced[column] = allowed_values
+        return coerced
+
+    @staticmethod
+    def _coerce_filter_values(values: list, dtype) -> list:
+        """
+        Convert filter values to dtype where they are not already of its kind.
+
+        Values that cannot be converted are kept as they are (they match nothing).
+
+        Args:
+            values: Allowed values
+            dtype: Column dtype (categoricals use their categories' dtype)
+
+        Returns:
+            List of values
+        """
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = dtype.categories.dtype
+
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            tz = getattr(dtype, 'tz', None)
+
+            def convert(value):
+                timestamp = pd.Timestamp(value)
+                if tz is not None and timestamp.tzinfo is None:
+                    timestamp = timestamp.tz_localize(tz)
+                return timestamp
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            def convert(value):
+                return pd.to_numeric(value) if isinstance(value, str) else value
+        else:
+            return values
+
+        converted = []
+        for value in values:
+            if value is None or (not isinstance(value, str) and pd.isna(value)):
+                converted.append(value)
+                continue
+            try:
+                converted.append(convert(value))
+            except (ValueError, TypeError):
+                converted.append(value)
+        return converted
+
+    def _compile_filters(
+        self,
+        filters: dict,
+        dataset_version: Optional[int] = None
+    ) -> List[tuple]:
+        """
+        Prepare filters for repeated evaluation across partitions.
+
+        Filters on columns the key index has already factorized for
+        dataset_version are resolved once against the column's uniques into a
+        lookup table indexed by code; the rest are evaluated with isin.
+
+        Args:
+            filters: Dict mapping column names to list of allowed values
+            dataset_version: CombinedDataset.version for code lookups (None to skip)
+
+        Returns:
+            List of (column, allowed values, (lookup, per-partition codes) or None)
+        """
+        compiled = []
+        for column, allowed_values in (filters or {}).items():
+            if not allowed_values:
+                continue
+
+            coded = None
+            if self.key_index is not None and dataset_version is not None:
+                cached = self.key_index.get_cached_codes(dataset_version, column)
+                # Null codes are -1, so a filter that allows nulls needs isin
+                if cached is not None and not pd.isna(pd.Index(allowed_values)).any():
+                    uniques, codes = cached
+                    # Trailing False so code -1 (null) indexes to "not allowed"
+                    lookup = np.append(uniques.isin(allowed_values), False)
+                    coded = (lookup, codes)
+
+            compiled.append((column, allowed_values, coded))
+        return compiled
+
+    def _filter_mask(
+        self,
+        df: pd.DataFrame,
+        compiled: List[tuple],
+        partition_index: Optional[int] = None,
+        sample_step: int = 1
+    ) -> Optional[np.ndarray]:
+        """
+        Evaluate compiled filters as one boolean row mask.
+
+        Args:
+            df: Source DataFrame
+            compiled: Output of _compile_filters
+            partition_index: Position of df among the dataset's partitions,
+                required to use code lookups
+            sample_step: Also keep only every sample_step-th row (1 keeps all)
+
+        Returns:
+            Boolean ndarray, or None if no filter applies to df
+        """
+        mask = None
+        if sample_step > 1:
+            mask = np.zeros(len(df), dtype=bool)
+            mask[::sample_step] = True
+
+        for column, allowed_values, coded in compiled:
+            if coded is not None and partition_index is not None:
+                lookup, codes = coded
+                column_mask = lookup[codes[partition_index]]
+            elif column in df.columns:
+                column_mask = df[column].isin(allowed_values).to_numpy()
+            else:
+                continue
+
+            mask = column_mask if mask is None else mask & column_mask
+        return mask
+
+    @staticmethod
+    def _scale_sample(
+        merged: pd.DataFrame,
+        aggfunc_dict: Dict[str, str],
+        fraction: float
+    ) -> pd.DataFrame:
+        """
+        Scale sampled sums and counts up to estimates for the full dataset.
+
+        Args:
+            merged: One row per group with one column per value column
+            aggfunc_dict: Value column -> aggregation
+            fraction: Share of rows that were sampled
+
+        Returns:
+            DataFrame with sum/count columns divided by fraction (integer
+            columns stay integer, rounded)
+        """
+        scaled = {}
+        for col, agg in aggfunc_dict.items():
+            if agg not in ('sum', 'count') or col not in merged.columns:
+                continue
+            values = merged[col] / fraction
+            if pd.api.types.is_integer_dtype(merged[col].dtype):
+                values = values.round().astype(merged[col].dtype)
+            scaled[col] = values
+        return merged.assign(**scaled) if scaled else merged
+
+    def _widen_value_columns(self, df: pd.DataFrame, values: list) -> pd.DataFrame:
+        """
+        Aggregate float32 value columns in float64.
+
+        Load-time dtype optimization stores some floats as float32; sums and
+        means over them would otherwise round in float32.
+
+        Args:
+            df: Source DataFrame
+            values: Value column names
+
+        Returns:
+            DataFrame with float32 value columns widened
+        """
+        narrow = [
+            col for col in dict.fromkeys(values)
+            if col in df.columns and df[col].dtype == 'float32'
+        ]
+        if not narrow:
+            return df
+        return df.assign(**{col: df[col].astype('float64') for col in narrow})
+
     def _build_aggfunc_dict(self, value_fields: list) -> dict:
         """
         Build aggregation function dictionary from value fields.
@@ -143,19 +847,146 @@ class PivotEngineService:
             DataFrame with flattened column names
         """
         if isinstance(pivot_df.columns, pd.MultiIndex):
-            # Flatten MultiIndex columns
-            new_columns = []
-            for col in pivot_df.columns:
-                if isinstance(col, tuple):
-                    # Join tuple elements with underscore
-                    # Filter out empty strings
-                    parts = [str(c) for c in col if str(c) != '']
-                    new_col = '_'.join(parts)
-                    new_columns.append(new_col)
-                else:
-                    new_columns.append(col)
+            pivot_df.columns = self._flat_column_names(pivot_df.columns)
+            logger.debug(f"Flattened {len(pivot_df.columns)} columns")
 
-            pivot_df.columns = new_columns
-            logger.debug(f"Flattened columns: {new_columns}")
+        return pivot_df
+
+    @staticmethod
+    def _flat_column_names(columns: pd.Index) -> pd.Index:
+        """
+        Get the flattened names of pivot columns.
 
+        Args:
+            columns: Pivot columns (MultiIndex or flat)
+
+        Returns:
+            Index of names as _flatten_columns produces them
+        """
+        if not isinstance(columns, pd.MultiIndex):
+            return columns
+
+        # Work per level on the (few) unique labels, then gather by codes,
+        # instead of formatting every column tuple in Python
+        flat = None
+        for level, codes in zip(columns.levels, columns.codes):
+            # Code -1 is a missing label (NaN, or NaT for datetime levels)
+            missing = str(getattr(level, '_na_value', np.nan))
+            labels = np.append(level.map(str).to_numpy(dtype=object), missing)
+            part = labels[codes]
+
+            # Join with underscores, skipping empty parts
+            if flat is None:
+                flat = part
+            else:
+                joined = flat + '_' + part
+                flat = np.where(flat == '', part, np.where(part == '', flat, joined))
+
+        return pd.Index(flat)
+
+    def _apply_window(self, pivot_df: pd.DataFrame, config: PivotConfig) -> pd.DataFrame:
+        """
+        Sort, truncate and page a pivot result (still indexed by row fields).
+
+        Only the rows of the requested page are kept, so flattening, the
+        index reset and the view work on the page alone. The number of rows
+        the page was cut from is recorded in attrs['total_rows'].
+
+        Args:
+            pivot_df: pivot_table output
+            config: PivotConfig with sort_by/sort_ascending/top_n/limit/offset
+
+        Returns:
+            DataFrame with the page's rows, in sorted order
+        """
+        total, start, stop = self._window_bounds(config, len(pivot_df))
+
+        sort_values = None
+        if config.sort_by:
+            if config.sort_by in (pivot_df.index.names or []):
+                sort_values = pivot_df.index.get_level_values(config.sort_by)
+            else:
+                flat_names = self._flat_column_names(pivot_df.columns)
+                matches = np.flatnonzero(flat_names == config.sort_by)
+                if len(matches) > 0:
+                    sort_values = pivot_df.iloc[:, matches[0]]
+                else:
+                    logger.warning(f"Sort column not in pivot result: {config.sort_by}")
+
+        if sort_values is not None:
+            positions = self._top_positions(sort_values, stop, config.sort_ascending)[start:stop]
+        elif start == 0 and stop == len(pivot_df):
+            positions = None
+        else:
+            positions = np.arange(start, stop)
+
+        if positions is not None:
+            pivot_df = pivot_df.iloc[positions]
+        pivot_df.attrs['total_rows'] = total
         return pivot_df
+
+    @staticmethod
+    def _window_bounds(config: PivotConfig, row_count: int) -> tuple:
+        """
+        Resolve top_n/limit/offset against a result size.
+
+        Returns:
+            (rows under top-N, page start, page stop)
+        """
+        total = row_count if config.top_n is None else min(config.top_n, row_count)
+        start = min(max(config.offset, 0), total)
+        stop = total if config.limit is None else min(total, start + config.limit)
+        return total, start, stop
+
+    @staticmethod
+    def _top_candidates(values, k: int, ascending: bool) -> Optional[np.ndarray]:
+        """
+        Find the rows that can be among the first k of a sort, without sorting.
+
+        argpartition finds the k-th sort key; every row that sorts before it or
+        ties with it is a candidate, so a stable sort of the candidates gives
+        exactly the first k rows of a stable sort of everything. Descending
+        sorts partition at len - k instead of negating the keys, which would
+        wrap around at a signed integer's minimum value.
+
+        Args:
+            values: Sort keys (Series or array)
+            k: Number of leading rows wanted
+            ascending: Sort direction
+
+        Returns:
+            Sorted array of candidate positions, or None if a partial sort does
+            not apply (non-numeric keys, nulls, or k covers every row)
+        """
+        array = np.asarray(values)
+        if array.dtype.kind not in 'iuf' or k >= len(array) or k <= 0:
+            return None
+        if array.dtype.kind == 'f' and np.isnan(array).any():
+            return None
+
+        if ascending:
+            kth = array[np.argpartition(array, k - 1)[k - 1]]
+            return np.flatnonzero(array <= kth)
+        kth = array[np.argpartition(array, len(array) - k)[len(array) - k]]
+        return np.flatnonzero(array >= kth)
+
+    def _top_positions(self, values, k: int, ascending: bool) -> np.ndarray:
+        """
+        Get the positions of the first k rows of a stable sort (nulls last).
+
+        Args:
+            values: Sort keys (Series, Index or array)
+            k: Number of leading rows wanted
+            ascending: Sort direction
+
+        Returns:
+            Array of at most k positions in sorted order
+        """
+        candidates = self._top_candidates(values, k, ascending)
+        series = pd.Series(np.asarray(values) if candidates is not None else values)
+        if candidates is not None:
+            series = series.iloc[candidates]
+        else:
+            series = series.reset_index(drop=True)
+        order = series.sort_values(ascending=ascending, kind='stable', na_position='last').index
+        return np.asarray(order[:k])
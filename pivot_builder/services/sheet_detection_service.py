@@ -4,6 +4,7 @@ from typing import List, Optional, Tuple
 from pathlib import Path
 
 from pivot_builder.config.logging_config import logger
+from pivot_builder.services.workbook_cache_service import WorkbookCacheService
 
 try:
     import pandas as pd
@@ -14,9 +15,16 @@ except ImportError:
 class SheetDetectionService:
     """Detects and lists sheets in Excel files."""
 
-    def __init__(self):
+    def __init__(self, workbook_cache: Optional[WorkbookCacheService] = None):
+        """
+        Initialize sheet detection service.
+
+        Args:
+            workbook_cache: Shared workbook handle cache (creates one if None)
+        """
         if pd is None:
             logger.warning("pandas not available - sheet detection will be limited")
+        self.workbook_cache = workbook_cache or WorkbookCacheService()
 
     def detect_sheets(self, file_path: str) -> Tuple[Optional[List[str]], Optional[str]]:
         """
@@ -29,8 +37,7 @@ class SheetDetectionService:
             return None, "pandas is not installed"
 
         try:
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
+            sheet_names = self.workbook_cache.get_sheet_names(file_path)
             logger.info(f"Detected {len(sheet_names)} sheets in {file_path}")
             return sheet_names, None
         except Exception as e:
@@ -62,7 +69,8 @@ class SheetDetectionService:
             return None, "pandas is not installed"
 
         try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            with self.workbook_cache.open_workbook(file_path) as excel_file:
+                df = excel_file.parse(sheet_name=sheet_name)
             logger.info(f"Loaded sheet '{sheet_name}' from {file_path}: {len(df)} rows, {len(df.columns)} columns")
             return df, None
         except Exception as e:
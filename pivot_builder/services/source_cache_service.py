@@ -0,0 +1,251 @@
+"""Service for caching parsed source files as columnar files on disk."""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import (
+    SOURCE_CACHE_ENABLED,
+    SOURCE_CACHE_DIR,
+    SOURCE_CACHE_MAX_MB,
+)
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow  # noqa: F401 - required by DataFrame.to_feather/read_feather
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+# Bump when the stored layout changes so stale entries are never read back
+CACHE_FORMAT_VERSION = 1
+
+# Block size used when hashing source file contents
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class SourceCacheService:
+    """
+    Stores each loaded CSV/sheet as a Feather file keyed by content hash.
+
+    An index maps (path, size, mtime) to the file's content hash, so unchanged
+    files are recognised without re-hashing them; a renamed or copied file is
+    still found through its hash. The directory is capped in size and the
+    least recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = SOURCE_CACHE_DIR,
+        max_bytes: int = SOURCE_CACHE_MAX_MB * 1024 * 1024,
+        enabled: bool = SOURCE_CACHE_ENABLED
+    ):
+        """
+        Initialize the source cache.
+
+        Args:
+            cache_dir: Directory holding cached frames and the index
+            max_bytes: Size cap for cached frames (LRU eviction)
+            enabled: Whether caching is turned on
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled and HAS_PYARROW and pd is not None
+        self._index = None  # stat key -> content hash, loaded lazily
+        self._lock = threading.Lock()
+
+        if enabled and not self.enabled:
+            logger.info("pyarrow not available - source file cache disabled")
+
+    @property
+    def _index_path(self) -> Path:
+        return self.cache_dir / "index.json"
+
+    def _load_index(self) -> Dict[str, str]:
+        """Load the stat -> hash index (caller holds the lock)."""
+        if self._index is None:
+            try:
+                with open(self._index_path, 'r') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        """Write the index atomically (caller holds the lock)."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+
+    @staticmethod
+    def _stat_key(path: Path) -> str:
+        stat = path.stat()
+        return f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    def _content_hash(self, path: Path) -> str:
+        """
+        Get the content hash for a file, hashing only when its stat changed.
+
+        Args:
+            path: Source file path
+
+        Returns:
+            Hex digest of the file contents
+        """
+        stat_key = self._stat_key(path)
+
+        with self._lock:
+            content_hash = self._load_index().get(stat_key)
+        if content_hash:
+            return content_hash
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        content_hash = digest.hexdigest()
+
+        with self._lock:
+            index = self._load_index()
+            # Drop keys for earlier versions of the same file
+            path_prefix = stat_key.rsplit('|', 2)[0] + '|'
+            for key in [k for k in index if k.startswith(path_prefix)]:
+                del index[key]
+            index[stat_key] = content_hash
+            self._save_index()
+
+        return content_hash
+
+    def _entry_path(self, file_path: str, sheet_name: Optional[str], variant: str) -> Path:
+        """Build the cache file path for a source file + sheet + load variant."""
+        content_hash = self._content_hash(Path(file_path))
+        key = f"{CACHE_FORMAT_VERSION}|{content_hash}|{sheet_name or ''}|{variant}"
+        entry_name = hashlib.blake2b(key.encode('utf-8'), digest_size=20).hexdigest()
+        return self.cache_dir / f"{entry_name}.feather"
+
+    def get(self, file_path: str, sheet_name: Optional[str] = None, variant: str = ""):
+        """
+        Get a cached DataFrame for a source file.
+
+        Args:
+            file_path: Path to the source file
+            sheet_name: Sheet name for XLSX files (None for CSV)
+            variant: Extra key part for load options that change the result
+
+        Returns:
+            DataFrame, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            entry_path = self._entry_path(file_path, sheet_name, variant)
+            if not entry_path.exists():
+                return None
+
+            df = pd.read_feather(entry_path)
+
+            # Touch the entry so eviction sees it as recently used
+            os.utime(entry_path)
+
+            logger.info(f"Source cache hit for {file_path}" + (f" [{sheet_name}]" if sheet_name else ""))
+            return df
+        except Exception as e:
+            logger.warning(f"Failed to read source cache for {file_path}: {e}")
+            return None
+
+    def put(self, file_path: str, df, sheet_name: Optional[str] = None, variant: str = "") -> bool:
+        """
+        Store a loaded DataFrame in the cache.
+
+        Frames Feather cannot represent (e.g. non-string column names or
+        mixed-type object columns) are skipped.
+
+        Args:
+            file_path: Path to the source file
+            df: Loaded DataFrame
+            sheet_name: Sheet name for XLSX files (None for CSV)
+            variant: Extra key part for load options that change the result
+
+        Returns:
+            True if the frame was cached
+        """
+        if not self.enabled or df is None:
+            return False
+
+        tmp_path = None
+        try:
+            entry_path = self._entry_path(file_path, sheet_name, variant)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # Write to a private temp file so concurrent loads never see a partial entry
+            tmp_path = entry_path.with_name(f"{entry_path.stem}.{threading.get_ident()}.tmp")
+            df.reset_index(drop=True).to_feather(tmp_path)
+            os.replace(tmp_path, entry_path)
+        except Exception as e:
+            logger.debug(f"Not caching {file_path}: {e}")
+            if tmp_path is not None and tmp_path.exists():
+                tmp_path.unlink()
+            return False
+
+        logger.debug(f"Cached {file_path} as {entry_path.name}")
+        self._evict()
+        return True
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its size cap."""
+        with self._lock:
+            try:
+                entries = [
+                    (entry.stat().st_mtime, entry.stat().st_size, entry)
+                    for entry in self.cache_dir.glob("*.feather")
+                ]
+            except OSError:
+                return
+
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return
+
+            for _, size, entry in sorted(entries, key=lambda e: e[0]):
+                try:
+                    entry.unlink()
+                    total -= size
+                    logger.debug(f"Evicted cached frame {entry.name}")
+                except OSError:
+                    continue
+                if total <= self.max_bytes:
+                    break
+
+            # Forget stat keys for files that no longer exist
+            index = self._load_index()
+            stale = [key for key in index if not Path(key.rsplit('|', 2)[0]).exists()]
+            if stale:
+                for key in stale:
+                    del index[key]
+                self._save_index()
+
+    def clear(self):
+        """Delete every cached frame and the index."""
+        with self._lock:
+            for entry in self.cache_dir.glob("*.feather"):
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+            self._index = {}
+            try:
+                self._index_path.unlink()
+            except OSError:
+                pass
@@ -137,12 +137,13 @@ class ValidationService:
             return
 
         combined_dataset = app.combined_dataset
-        if not combined_dataset or combined_dataset.df is None:
+        if not combined_dataset or not combined_dataset.get_columns():
             report.add("warning", "COMBINED_DATASET_EMPTY", "Combined dataset is empty")
             return
 
-        df = combined_dataset.df
-        rows, cols = df.shape
+        # Sized from the partitions so validation never concatenates them
+        rows = combined_dataset.get_row_count()
+        cols = len(combined_dataset.get_columns())
 
         # Info about combined dataset
         report.add("info", "COMBINED_DATASET_INFO",
@@ -177,16 +178,17 @@ class ValidationService:
                       "Pivot configuration has no value fields defined")
         else:
             # Check for dtype warnings (non-numeric aggregations)
-            if hasattr(app, 'combined_dataset') and app.combined_dataset.df is not None:
-                df = app.combined_dataset.df
+            if hasattr(app, 'combined_dataset') and app.combined_dataset.get_columns():
+                partitions = list(app.combined_dataset.iter_partitions())
                 numeric_aggs = ['sum', 'mean']
 
                 for value_field in config.values:
                     col = value_field.column
                     agg = value_field.aggregation
 
-                    if agg in numeric_aggs and col in df.columns:
-                        if not pd.api.types.is_numeric_dtype(df[col]):
+                    col_parts = [p[col] for p in partitions if col in p.columns]
+                    if agg in numeric_aggs and col_parts:
+                        if not all(pd.api.types.is_numeric_dtype(part) for part in col_parts):
                             report.add("warning", "NON_NUMERIC_AGGREGATION",
                                       f"Aggregation '{agg}' on non-numeric column '{col}'",
                                       {"column": col, "aggregation": agg})
@@ -0,0 +1,190 @@
+"""Service for sharing parsed Excel workbook handles."""
+
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import WORKBOOK_CACHE_MAX_HANDLES
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+class _WorkbookEntry:
+    """A cached workbook handle plus the lock serialising access to it."""
+
+    def __init__(self, key: Tuple):
+        self.key = key
+        self.lock = threading.Lock()
+        self.excel_file = None  # pd.ExcelFile, opened lazily
+        self.sheet_names = None  # List[str], from the workbook index
+
+
+class WorkbookCacheService:
+    """
+    Caches one open workbook handle per file so the archive is parsed once.
+
+    Entries are keyed on (resolved path, mtime, size), so a file that changes
+    on disk gets a fresh handle. Sheet listing reads only the workbook index
+    (xl/workbook.xml) and never touches cell data.
+    """
+
+    def __init__(self, max_handles: int = WORKBOOK_CACHE_MAX_HANDLES):
+        """
+        Initialize the workbook cache.
+
+        Args:
+            max_handles: Maximum number of open workbooks kept (LRU eviction)
+        """
+        self.max_handles = max_handles
+        self._entries = OrderedDict()  # resolved path -> _WorkbookEntry
+        self._lock = threading.Lock()
+
+    def _make_key(self, file_path: str) -> Tuple:
+        """Build the cache key for a file from its current stat."""
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        return (str(path), stat.st_mtime_ns, stat.st_size)
+
+    def _get_entry(self, file_path: str) -> _WorkbookEntry:
+        """Get (or create) the cache entry for a file, evicting stale handles."""
+        key = self._make_key(file_path)
+        evicted = []
+
+        with self._lock:
+            entry = self._entries.get(key[0])
+            if entry is not None and entry.key != key:
+                # File changed on disk since the handle was opened
+                evicted.append(self._entries.pop(key[0]))
+                entry = None
+
+            if entry is None:
+                entry = _WorkbookEntry(key)
+                self._entries[key[0]] = entry
+            self._entries.move_to_end(key[0])
+
+            while len(self._entries) > self.max_handles:
+                _, old_entry = self._entries.popitem(last=False)
+                evicted.append(old_entry)
+
+        for old_entry in evicted:
+            self._close_entry(old_entry)
+
+        return entry
+
+    def _close_entry(self, entry: _WorkbookEntry):
+        """Close an evicted entry's workbook handle."""
+        with entry.lock:
+            if entry.excel_file is not None:
+                try:
+                    entry.excel_file.close()
+                except Exception as e:
+                    logger.debug(f"Error closing workbook {entry.key[0]}: {e}")
+                entry.excel_file = None
+        logger.debug(f"Evicted workbook handle: {entry.key[0]}")
+
+    @contextmanager
+    def open_workbook(self, file_path: str):
+        """
+        Yield the shared pd.ExcelFile for a path, holding its lock.
+
+        The underlying readers are not thread-safe, so callers on different
+        worker threads are serialised per workbook.
+
+        Args:
+            file_path: Path to the workbook
+
+        Yields:
+            pd.ExcelFile
+        """
+        if pd is None:
+            raise RuntimeError("pandas is not installed")
+
+        entry = self._get_entry(file_path)
+        with entry.lock:
+            if entry.excel_file is None:
+                entry.excel_file = pd.ExcelFile(file_path)
+                logger.debug(f"Opened workbook handle: {entry.key[0]}")
+            yield entry.excel_file
+
+    def get_sheet_names(self, file_path: str) -> List[str]:
+        """
+        Get sheet names for a workbook without reading any cell data.
+
+        XLSX sheet names come straight from the workbook index; other formats
+        (e.g. legacy .xls) fall back to the shared ExcelFile handle.
+
+        Args:
+            file_path: Path to the workbook
+
+        Returns:
+            List of sheet names in workbook order
+        """
+        entry = self._get_entry(file_path)
+        with entry.lock:
+            if entry.sheet_names is None:
+                entry.sheet_names = self._read_sheet_index(file_path)
+            if entry.sheet_names is not None:
+                return list(entry.sheet_names)
+
+        with self.open_workbook(file_path) as excel_file:
+            sheet_names = list(excel_file.sheet_names)
+        entry.sheet_names = sheet_names
+        return list(sheet_names)
+
+    def _read_sheet_index(self, file_path: str) -> Optional[List[str]]:
+        """
+        Read sheet names from xl/workbook.xml inside an XLSX archive.
+
+        Returns:
+            List of sheet names, or None if the file is not an OOXML archive
+        """
+        if not zipfile.is_zipfile(file_path):
+            return None
+
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                with archive.open('xl/workbook.xml') as workbook_xml:
+                    root = ET.parse(workbook_xml).getroot()
+        except (KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+            logger.debug(f"Could not read workbook index for {file_path}: {e}")
+            return None
+
+        # Match on local names so both transitional and strict namespaces work
+        sheet_names = []
+        for element in root.iter():
+            if element.tag.rsplit('}', 1)[-1] == 'sheets':
+                for sheet in element:
+                    if sheet.tag.rsplit('}', 1)[-1] == 'sheet' and 'name' in sheet.attrib:
+                        sheet_names.append(sheet.attrib['name'])
+                break
+
+        return sheet_names
+
+    def invalidate(self, file_path: str):
+        """
+        Drop and close the cached handle for a file.
+
+        Args:
+            file_path: Path to the workbook
+        """
+        resolved = str(Path(file_path).resolve())
+        with self._lock:
+            entry = self._entries.pop(resolved, None)
+        if entry is not None:
+            self._close_entry(entry)
+
+    def clear(self):
+        """Close and drop all cached handles."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._close_entry(entry)
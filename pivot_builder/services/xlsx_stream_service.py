@@ -0,0 +1,245 @@
+"""Service for streaming XLSX sheets into DataFrames in row chunks."""
+
+from typing import Callable, List, Optional
+
+from pivot_builder.config.logging_config import logger
+from pivot_builder.config.app_config import XLSX_STREAM_CHUNK_ROWS
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = None
+    pd = None
+
+
+class _ColumnBuffer:
+    """
+    Accumulates one column's values as typed per-chunk arrays.
+
+    Raw cell values are only held as Python objects for a single chunk; each
+    chunk is converted to a typed pandas array as soon as it is complete, so
+    numeric and datetime columns never keep a full list of boxed values.
+    Blank cells become NaN, and the column's final dtype is settled across
+    all chunks in build, the way pd.read_excel infers it for the whole column.
+    """
+
+    def __init__(self, flushed_rows: int = 0, pending_rows: int = 0):
+        # Columns first seen mid-sheet start with nulls for the rows before them
+        self.chunks = [flushed_rows] if flushed_rows else []
+        self.pending = [None] * pending_rows
+
+    def append(self, value):
+        """Append a raw cell value to the current chunk."""
+        self.pending.append(value)
+
+    def flush(self):
+        """Convert the current chunk to a typed array."""
+        if not self.pending:
+            return
+        if all(value is None for value in self.pending):
+            # Typed later, once the dtype of the rest of the column is known
+            self.chunks.append(len(self.pending))
+        else:
+            self.chunks.append(pd.Series([np.nan if value is None else value for value in self.pending]))
+        self.pending = []
+
+    def build(self):
+        """
+        Concatenate the chunks into a single Series.
+
+        Returns:
+            pandas Series with the column's values
+        """
+        self.flush()
+
+        typed = [chunk for chunk in self.chunks if not isinstance(chunk, int)]
+        if not typed:
+            like_dtype = None
+        elif len({chunk.dtype for chunk in typed}) == 1:
+            like_dtype = typed[0].dtype
+        else:
+            # Chunks typed differently are reconciled below
+            like_dtype = np.dtype(object)
+        null_dtype = self._null_dtype(like_dtype)
+
+        parts = [
+            pd.Series(np.full(chunk, np.nan), dtype=null_dtype) if isinstance(chunk, int) else chunk
+            for chunk in self.chunks
+        ]
+        if not parts:
+            return pd.Series([], dtype=object)
+        if len(parts) == 1:
+            series = parts[0].reset_index(drop=True)
+        else:
+            series = pd.concat(parts, ignore_index=True)
+
+        if pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype):
+            # Like pd.read_excel, a column of numbers, numeric text and booleans
+            # with blanks (or mixed across chunks) is numeric
+            try:
+                series = pd.to_numeric(series)
+            except (ValueError, TypeError):
+                if pd.api.types.is_object_dtype(series.dtype):
+                    # Blanks from datetime chunks come through as NaT
+                    series = series.where(series.notna(), np.nan)
+        return series
+
+    @staticmethod
+    def _null_dtype(like_dtype):
+        """Pick a dtype for all-empty chunks that will not widen the column."""
+        if like_dtype is None:
+            # An entirely empty column, which pd.read_excel reads as float
+            return 'float64'
+        if pd.api.types.is_integer_dtype(like_dtype):
+            return 'float64'
+        if pd.api.types.is_bool_dtype(like_dtype):
+            return object
+        return like_dtype
+
+
+class XlsxStreamService:
+    """Reads worksheets row by row from a read-only openpyxl workbook."""
+
+    def __init__(self, chunk_rows: int = XLSX_STREAM_CHUNK_ROWS):
+        """
+        Initialize the stream reader.
+
+        Args:
+            chunk_rows: Number of rows converted per chunk
+        """
+        self.chunk_rows = chunk_rows
+
+    @staticmethod
+    def supports(excel_file) -> bool:
+        """
+        Check whether a pd.ExcelFile can be streamed.
+
+        Args:
+            excel_file: pd.ExcelFile handle
+
+        Returns:
+            True for openpyxl-backed (XLSX) workbooks
+        """
+        return getattr(excel_file, 'engine', None) == 'openpyxl'
+
+    def read_sheet(
+        self,
+        workbook,
+        sheet_name: str,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        max_rows: Optional[int] = None
+    ):
+        """
+        Stream a worksheet into a DataFrame, using the first row as the header.
+
+        Args:
+            workbook: openpyxl Workbook opened in read-only mode
+            sheet_name: Name of the sheet to read
+            progress_callback: Called with the number of data rows read after each chunk
+            max_rows: Stop after this many data rows (None for the whole sheet)
+
+        Returns:
+            pandas DataFrame
+        """
+        worksheet = workbook[sheet_name]
+        rows = worksheet.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        header = list(header)
+
+        buffers = [_ColumnBuffer() for _ in header]
+        row_count = 0
+        chunk_count = 0
+        blank_run = 0  # Blank rows seen since the last non-blank row
+
+        for row in rows:
+            if max_rows is not None and row_count >= max_rows:
+                break
+
+            if all(value is None for value in row):
+                # Held back so trailing blank rows can be dropped like pd.read_excel does
+                blank_run += 1
+                continue
+
+            # Interior blank rows are kept as all-null rows
+            pending_rows = [()] * blank_run + [row]
+            blank_run = 0
+
+            for pending_row in pending_rows:
+                row_count, chunk_count = self._append_row(
+                    buffers, header, pending_row, row_count, chunk_count, progress_callback
+                )
+                if max_rows is not None and row_count >= max_rows:
+                    break
+
+        columns = self._make_column_names(header)
+        df = pd.DataFrame({
+            name: buffer.build()
+            for name, buffer in zip(columns, buffers)
+        })
+
+        if progress_callback:
+            progress_callback(row_count)
+
+        logger.debug(f"Streamed sheet '{sheet_name}': {row_count} rows, {len(columns)} columns")
+        return df
+
+    def _append_row(self, buffers, header, row, row_count, chunk_count, progress_callback):
+        """
+        Append one row to the column buffers, flushing a chunk when it is full.
+
+        Returns:
+            Updated (row_count, chunk_count)
+        """
+        # Rows wider than the header get extra (unnamed) columns
+        while len(buffers) < len(row):
+            buffers.append(_ColumnBuffer(row_count - chunk_count, chunk_count))
+            header.append(None)
+
+        for buffer, value in zip(buffers, row):
+            buffer.append(value)
+        for buffer in buffers[len(row):]:
+            buffer.append(None)
+
+        row_count += 1
+        chunk_count += 1
+
+        if chunk_count >= self.chunk_rows:
+            for buffer in buffers:
+                buffer.flush()
+            chunk_count = 0
+            if progress_callback:
+                progress_callback(row_count)
+
+        return row_count, chunk_count
+
+    @staticmethod
+    def _make_column_names(header: List) -> List:
+        """
+        Name columns like pd.read_excel: blanks become 'Unnamed: i', duplicates get '.n'.
+
+        Args:
+            header: Raw header row values
+
+        Returns:
+            List of unique column names
+        """
+        names = []
+        seen = {}
+        for index, value in enumerate(header):
+            name = f"Unnamed: {index}" if value is None else value
+            if name in seen:
+                seen[name] += 1
+                candidate = f"{name}.{seen[name]}"
+                while candidate in seen:
+                    seen[name] += 1
+                    candidate = f"{name}.{seen[name]}"
+                seen[candidate] = 0
+                name = candidate
+            else:
+                seen[name] = 0
+            names.append(name)
+        return names
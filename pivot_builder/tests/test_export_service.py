@@ -0,0 +1,139 @@
+"""Round-trip tests for the streaming exporters."""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from pivot_builder.services.background_task_service import TaskCancelledError
+from pivot_builder.services.export_service import ExportService
+
+
+class ExportRoundTripTest(unittest.TestCase):
+    """Every format must read back as the frames that were written, in order."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # Small chunks, so each partition is written in several pieces
+        self.service = ExportService(chunk_rows=4)
+        self.frames = [
+            pd.DataFrame({
+                'region': ['north', None, 'south', 'east', 'north', 'west', 'south'],
+                'amount': [1.5, 2.0, np.nan, 4.25, 5.0, 6.0, 7.5],
+                'qty': [1, 2, 3, 4, 5, 6, 7],
+            }),
+            # Missing 'qty' and ordered differently; written in the output column order
+            pd.DataFrame({
+                'amount': [8.0, 9.5, 10.0],
+                'region': ['east', 'west', None],
+            }),
+        ]
+        self.columns = ['region', 'amount', 'qty']
+        self.expected = pd.concat(self.frames, ignore_index=True)[self.columns]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _export(self, name, fmt):
+        path = os.path.join(self.directory, name)
+        progress = []
+        self.assertTrue(self.service.export_frames(
+            iter(self.frames),
+            self.columns,
+            path,
+            fmt,
+            lambda done, total: progress.append((done, total)),
+            len(self.expected)
+        ))
+        self.assertEqual(progress[-1], (len(self.expected), len(self.expected)))
+        # Only the finished file is left behind
+        self.assertEqual(os.listdir(self.directory), [name])
+        return path
+
+    def _assert_frame(self, result):
+        pd.testing.assert_frame_equal(
+            result[self.columns], self.expected, check_dtype=False, check_index_type=False
+        )
+
+    def test_csv(self):
+        path = self._export('out.csv', 'csv')
+        self._assert_frame(pd.read_csv(path))
+
+    def test_csv_gzip(self):
+        path = self._export('out.csv.gz', 'csv')
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            self._assert_frame(pd.read_csv(f))
+
+    def test_json(self):
+        path = self._export('out.json', 'json')
+        with open(path, encoding='utf-8') as f:
+            self._assert_frame(pd.DataFrame(json.load(f)))
+
+    def test_json_gzip(self):
+        path = self._export('out.json.gz', 'json')
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            self._assert_frame(pd.DataFrame(json.load(f)))
+
+    def test_ndjson(self):
+        path = self._export('out.ndjson', 'ndjson')
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), len(self.expected))
+        self._assert_frame(pd.DataFrame([json.loads(line) for line in lines]))
+
+    def test_ndjson_gzip(self):
+        path = self._export('out.ndjson.gz', 'ndjson')
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            self._assert_frame(pd.read_json(f, lines=True))
+
+    def test_json_dates_match_across_orients(self):
+        df = pd.DataFrame({'day': pd.to_datetime(['2024-01-05', None]), 'amount': [1.0, 2.0]})
+        for orient in ('records', 'index', 'columns', 'values', 'table'):
+            with self.subTest(orient=orient):
+                path = os.path.join(self.directory, f'{orient}.json')
+                self.assertTrue(self.service.export_json(df, path, orient=orient))
+                with open(path, encoding='utf-8') as f:
+                    self.assertIn('2024-01-05T00:00:00', f.read())
+
+    def test_xlsx(self):
+        path = self._export('out.xlsx', 'xlsx')
+        self._assert_frame(pd.read_excel(path))
+
+    def test_xlsx_sheet_split(self):
+        # Four rows per sheet: a header and three data rows
+        with mock.patch('pivot_builder.services.export_service.XLSX_MAX_ROWS_PER_SHEET', 4):
+            path = self._export('out.xlsx', 'xlsx')
+
+        sheets = pd.read_excel(path, sheet_name=None)
+        self.assertEqual(list(sheets), ['Sheet1', 'Sheet2', 'Sheet3', 'Sheet4'])
+        self.assertEqual([len(sheet) for sheet in sheets.values()], [3, 3, 3, 1])
+        self._assert_frame(pd.concat(sheets.values(), ignore_index=True))
+
+    def test_failed_export_leaves_no_file(self):
+        path = os.path.join(self.directory, 'out.csv')
+
+        def fail(done, total):
+            raise RuntimeError("disk full")
+
+        self.assertFalse(self.service.export_frames(iter(self.frames), self.columns, path, 'csv', fail))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_cancelled_export_leaves_no_file(self):
+        path = os.path.join(self.directory, 'out.xlsx')
+
+        def cancel(done, total):
+            raise TaskCancelledError("cancelled")
+
+        with self.assertRaises(TaskCancelledError):
+            self.service.export_frames(iter(self.frames), self.columns, path, 'xlsx', cancel)
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
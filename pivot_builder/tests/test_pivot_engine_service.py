@@ -0,0 +1,192 @@
+"""Tests for the pivot engine's partitioned builds, sort and top-N push-down."""
+
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pivot_builder.models.dataset_model import CombinedDataset, PerFileDataset, SOURCE_FILE_COLUMN
+from pivot_builder.models.pivot_model import PivotConfig, PivotValueField
+from pivot_builder.services.pivot_engine_service import PivotEngineService
+
+
+class TopCandidatesTest(unittest.TestCase):
+    """Descending top-N must not wrap around at a signed integer's minimum."""
+
+    def setUp(self):
+        self.engine = PivotEngineService()
+
+    def _top_codes(self, dtype):
+        info = np.iinfo(dtype)
+        codes = np.array([info.min, 5, 100, -3, info.max], dtype=dtype)
+        df = pd.DataFrame({'code': codes, 'amount': np.arange(len(codes), dtype=np.int64)})
+        dataset = CombinedDataset(source_metadata=[PerFileDataset(file_id='a', df=df)])
+        config = PivotConfig(
+            rows=['code'],
+            values=[PivotValueField('amount', 'sum')],
+            sort_by='code',
+            sort_ascending=False,
+            top_n=2
+        )
+        return self.engine.build_pivot_from_dataset(dataset, config)['code'].tolist(), info
+
+    def test_int8_minimum_descending(self):
+        codes, info = self._top_codes(np.int8)
+        self.assertEqual(codes, [info.max, 100])
+
+    def test_int64_minimum_descending(self):
+        codes, info = self._top_codes(np.int64)
+        self.assertEqual(codes, [info.max, 100])
+
+    def test_candidates_at_minimum(self):
+        for dtype in (np.int8, np.int64):
+            info = np.iinfo(dtype)
+            values = np.array([info.min, 5, 100, -3, info.max], dtype=dtype)
+            candidates = PivotEngineService._top_candidates(values, 2, ascending=False)
+            self.assertEqual(sorted(values[candidates].tolist()), [100, info.max])
+            candidates = PivotEngineService._top_candidates(values, 2, ascending=True)
+            self.assertEqual(sorted(values[candidates].tolist()), [info.min, -3])
+
+
+class FilterCoercionTest(unittest.TestCase):
+    """Filter values from saved (JSON) configs are strings; columns may be parsed."""
+
+    def setUp(self):
+        self.engine = PivotEngineService()
+        self.df = pd.DataFrame({
+            'day': pd.to_datetime(['2024-01-05', '2024-01-06', '2024-01-05', None]),
+            'qty': np.array([1, 2, 3, 4], dtype=np.int8),
+            'amount': [10.0, 20.0, 30.0, 40.0],
+        })
+        self.dataset = CombinedDataset(source_metadata=[
+            PerFileDataset(file_id='a', df=self.df.iloc[:2]),
+            PerFileDataset(file_id='b', df=self.df.iloc[2:].reset_index(drop=True)),
+        ])
+
+    def _config(self, filters):
+        config = PivotConfig(rows=['day'], values=[PivotValueField('amount', 'sum')], filters=filters)
+        # Saved configurations round-trip through JSON
+        return PivotConfig.from_dict(json.loads(json.dumps(config.to_dict())))
+
+    def test_string_filter_on_date_column(self):
+        config = self._config({'day': ['2024-01-05']})
+        expected = pd.DataFrame({'day': pd.to_datetime(['2024-01-05']), 'amount': [40.0]})
+
+        pd.testing.assert_frame_equal(self.engine.build_pivot(self.df, config), expected)
+        # Twice, so the second build filters on cached key codes
+        for _ in range(2):
+            result = self.engine.build_pivot_from_dataset(self.dataset, config)
+            pd.testing.assert_frame_equal(result.reset_index(drop=True), expected)
+
+    def test_string_filter_on_numeric_column(self):
+        config = self._config({'qty': ['1', '3']})
+        result = self.engine.build_pivot_from_dataset(self.dataset, config)
+        self.assertEqual(result['amount'].sum(), 40.0)
+
+
+
+class PartitionedBuildTest(unittest.TestCase):
+    """build_pivot_from_dataset must match build_pivot on the concatenated frame."""
+
+    AGGREGATIONS = ['sum', 'count', 'mean', 'min', 'max']
+    SOURCES = ['a.csv', 'b.csv', 'c.xlsx']
+
+    def setUp(self):
+        self.engine = PivotEngineService()
+        rng = np.random.default_rng(7)
+        partitions = []
+        for index, source in enumerate(self.SOURCES):
+            size = 40 + 10 * index
+            region = rng.choice(['north', 'south', 'east'], size).astype(object)
+            region[rng.random(size) < 0.15] = None
+            amount = rng.normal(100, 30, size).round(2)
+            amount[rng.random(size) < 0.1] = np.nan
+            partitions.append(pd.DataFrame({
+                'region': pd.array(region, dtype='str'),
+                # Categories are unified across files by the dataset builder
+                'segment': pd.Categorical(
+                    rng.choice(['retail', 'wholesale', None], size),
+                    categories=['retail', 'wholesale', 'online']
+                ),
+                'year': rng.choice([2023, 2024], size),
+                'amount': amount,
+                'qty': rng.integers(1, 20, size),
+                SOURCE_FILE_COLUMN: pd.Categorical([source] * size, categories=self.SOURCES),
+            }))
+
+        metadata = []
+        row_start = 0
+        for source, df in zip(self.SOURCES, partitions):
+            metadata.append(PerFileDataset(
+                file_id=source,
+                df=df,
+                source_name=source,
+                row_start=row_start,
+                row_stop=row_start + len(df)
+            ))
+            row_start += len(df)
+        self.dataset = CombinedDataset(source_metadata=metadata)
+        self.df = pd.concat(partitions, ignore_index=True)
+
+    def _assert_same(self, config):
+        expected = self.engine.build_pivot(self.df, config)
+        self.assertGreater(len(expected), 0)
+        # Twice, so the second build groups on cached key codes
+        for _ in range(2):
+            result = self.engine.build_pivot_from_dataset(self.dataset, config)
+            pd.testing.assert_frame_equal(
+                result.reset_index(drop=True), expected, check_exact=False
+            )
+
+    def test_each_aggregation(self):
+        for aggregation in self.AGGREGATIONS:
+            with self.subTest(aggregation=aggregation):
+                self._assert_same(PivotConfig(
+                    rows=['region'],
+                    columns=['year'],
+                    values=[PivotValueField('amount', aggregation)]
+                ))
+
+    def test_several_values(self):
+        self._assert_same(PivotConfig(
+            rows=['region', 'year'],
+            values=[PivotValueField('amount', aggregation) for aggregation in self.AGGREGATIONS]
+            + [PivotValueField('qty', 'sum')]
+        ))
+
+    def test_categorical_keys(self):
+        for aggregation in self.AGGREGATIONS:
+            with self.subTest(aggregation=aggregation):
+                self._assert_same(PivotConfig(
+                    rows=['segment'],
+                    columns=['region'],
+                    values=[PivotValueField('qty', aggregation)]
+                ))
+
+    def test_filters(self):
+        self._assert_same(PivotConfig(
+            rows=['region'],
+            values=[PivotValueField('amount', 'mean')],
+            filters={'year': [2024], 'segment': ['retail']}
+        ))
+
+    def test_source_filter(self):
+        for aggregation in self.AGGREGATIONS:
+            with self.subTest(aggregation=aggregation):
+                self._assert_same(PivotConfig(
+                    rows=['region'],
+                    values=[PivotValueField('amount', aggregation)],
+                    filters={SOURCE_FILE_COLUMN: ['a.csv', 'c.xlsx'], 'year': [2023]}
+                ))
+
+    def test_source_as_row_field(self):
+        self._assert_same(PivotConfig(
+            rows=[SOURCE_FILE_COLUMN],
+            columns=['segment'],
+            values=[PivotValueField('qty', 'count')]
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,6 +31,14 @@ class FilePanel(ttk.Frame):
         )
         self.add_button.pack(pady=5, padx=5, fill=tk.X)
 
+        # Cancel Loading button (stops in-flight background loads)
+        self.cancel_button = ttk.Button(
+            self,
+            text="Cancel Loading",
+            command=self._on_cancel_loading_clicked
+        )
+        self.cancel_button.pack(pady=(0, 5), padx=5, fill=tk.X)
+
         # Scrollable frame for file list
         self._create_scrollable_file_list()
 
@@ -64,6 +72,11 @@ class FilePanel(ttk.Frame):
         if self.controller:
             self.controller.on_add_files()
 
+    def _on_cancel_loading_clicked(self):
+        """Handle Cancel Loading button click."""
+        if self.controller:
+            self.controller.cancel_all_loads()
+
     def refresh(self, file_descriptors):
         """
         Refresh the file list display.
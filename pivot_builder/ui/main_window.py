@@ -69,10 +69,28 @@ class MainWindow:
         # Create status bar
         self.status_bar = StatusBar(self.root)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.app_controller.set_status_bar(self.status_bar)
 
         # Set main window reference in app_controller
         self.app_controller.set_main_window(self)
 
+    def after(self, delay_ms, fn):
+        """
+        Schedule fn on the Tk main loop.
+
+        Args:
+            delay_ms: Delay in milliseconds
+            fn: Function to call
+
+        Returns:
+            Tk after id (for after_cancel)
+        """
+        return self.root.after(delay_ms, fn)
+
+    def after_cancel(self, after_id):
+        """Cancel a callback scheduled with after()."""
+        self.root.after_cancel(after_id)
+
     def show_preview_tab(self):
         """Switch to the Preview tab."""
         # Find the index of the Preview tab (it's the second tab, index 1)
@@ -80,4 +98,7 @@ class MainWindow:
 
     def run(self):
         """Start the application main loop."""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.app_controller.shutdown()
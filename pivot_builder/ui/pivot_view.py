@@ -87,6 +87,23 @@ class PivotView(ttk.Frame):
         )
         self.build_button.pack(side=tk.LEFT, padx=5)
 
+        self.cancel_build_button = ttk.Button(
+            button_frame,
+            text="Cancel",
+            command=self._on_cancel_build,
+            state=tk.DISABLED
+        )
+        self.cancel_build_button.pack(side=tk.LEFT, padx=5)
+
+        self.live_mode_var = tk.BooleanVar(value=False)
+        self.live_mode_check = ttk.Checkbutton(
+            button_frame,
+            text="Live preview",
+            variable=self.live_mode_var,
+            command=self._on_toggle_live_mode
+        )
+        self.live_mode_check.pack(side=tk.LEFT, padx=5)
+
         self.clear_button = ttk.Button(
             button_frame,
             text="Clear All",
@@ -149,6 +166,62 @@ class PivotView(ttk.Frame):
         )
         self.export_json_button.pack(side=tk.LEFT, padx=5)
 
+        self.cancel_export_button = ttk.Button(
+            export_frame,
+            text="Cancel Export",
+            command=self._on_cancel_export,
+            state=tk.DISABLED
+        )
+        self.cancel_export_button.pack(side=tk.LEFT, padx=5)
+
+        # Sorting, top-N and paging
+        window_frame = ttk.Frame(parent)
+        window_frame.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(window_frame, text="Sort by:").pack(side=tk.LEFT, padx=(0, 5))
+        self.sort_by_var = tk.StringVar()
+        self.sort_by_combo = ttk.Combobox(
+            window_frame,
+            textvariable=self.sort_by_var,
+            state="readonly",
+            width=25
+        )
+        self.sort_by_combo.pack(side=tk.LEFT, padx=5)
+
+        self.sort_descending_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            window_frame,
+            text="Descending",
+            variable=self.sort_descending_var
+        ).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(window_frame, text="Top N:").pack(side=tk.LEFT, padx=(10, 5))
+        self.top_n_var = tk.StringVar()
+        ttk.Entry(window_frame, textvariable=self.top_n_var, width=8).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(
+            window_frame,
+            text="Apply",
+            command=self._on_apply_window
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.next_page_button = ttk.Button(
+            window_frame,
+            text="Next >",
+            command=self._on_next_page
+        )
+        self.next_page_button.pack(side=tk.RIGHT, padx=5)
+
+        self.page_label = ttk.Label(window_frame, text="", foreground="gray")
+        self.page_label.pack(side=tk.RIGHT, padx=5)
+
+        self.prev_page_button = ttk.Button(
+            window_frame,
+            text="< Prev",
+            command=self._on_previous_page
+        )
+        self.prev_page_button.pack(side=tk.RIGHT, padx=5)
+
         # Pivot table
         self.pivot_table = PivotTableWidget(parent, self.controller)
         self.pivot_table.pack(fill=tk.BOTH, expand=True)
@@ -195,7 +268,69 @@ class PivotView(ttk.Frame):
     def _on_build_pivot(self):
         """Handle build pivot button click."""
         if self.controller:
-            self.controller.rebuild_pivot()
+            self.controller.rebuild_pivot(reset_page=True)
+
+    def _on_cancel_build(self):
+        """Handle cancel build button click."""
+        if self.controller:
+            self.controller.cancel_build()
+
+    def _on_toggle_live_mode(self):
+        """Handle live preview checkbox toggle."""
+        if self.controller:
+            self.controller.set_live_mode(self.live_mode_var.get())
+
+    def set_building(self, building: bool):
+        """
+        Reflect whether a pivot build is running.
+
+        Args:
+            building: True while a build runs on a worker
+        """
+        self.cancel_build_button.config(state=tk.NORMAL if building else tk.DISABLED)
+
+    def _on_apply_window(self):
+        """Handle apply sort/top-N button click."""
+        if not self.controller:
+            return
+
+        top_n_text = self.top_n_var.get().strip()
+        if top_n_text and not (top_n_text.isdigit() and int(top_n_text) > 0):
+            messagebox.showwarning("Invalid Top N", "Top N must be a positive whole number.")
+            return
+
+        self.controller.set_sort(self.sort_by_var.get() or None, not self.sort_descending_var.get())
+        self.controller.set_top_n(int(top_n_text) if top_n_text else None)
+        self.controller.rebuild_pivot()
+
+    def _on_next_page(self):
+        """Handle next page button click."""
+        if self.controller:
+            self.controller.next_page()
+
+    def _on_previous_page(self):
+        """Handle previous page button click."""
+        if self.controller:
+            self.controller.previous_page()
+
+    def _refresh_window_controls(self, pivot_df):
+        """Update sort choices and the page indicator for a loaded pivot."""
+        if not self.controller:
+            return
+
+        # Sort choices come from the result columns (row fields + flattened values)
+        self.sort_by_combo['values'] = [""] + [str(col) for col in pivot_df.columns]
+        self.sort_by_var.set(self.controller.config.sort_by or "")
+        self.sort_descending_var.set(not self.controller.config.sort_ascending)
+        top_n = self.controller.config.top_n
+        self.top_n_var.set("" if top_n is None else str(top_n))
+
+        start, stop, total = self.controller.get_page_info()
+        self.page_label.config(
+            text=f"Rows {start + 1:,}-{stop:,} of {total:,}" if stop > start else ""
+        )
+        self.prev_page_button.config(state=tk.NORMAL if start > 0 else tk.DISABLED)
+        self.next_page_button.config(state=tk.NORMAL if stop < total else tk.DISABLED)
 
     def _on_clear_all(self):
         """Handle clear all button click."""
@@ -241,9 +376,19 @@ class PivotView(ttk.Frame):
         Load pivot DataFrame into preview.
 
         Args:
-            pivot_df: pandas DataFrame with pivot results
+            pivot_df: pandas DataFrame with pivot results (the current page)
         """
         self.pivot_table.load_pivot(pivot_df)
+        self._refresh_window_controls(pivot_df)
+
+    def show_pivot_message(self, message: str):
+        """
+        Show a message in place of the pivot table (no dialog).
+
+        Args:
+            message: Message to display
+        """
+        self.pivot_table.set_empty_message(message)
 
     def show_error(self, message: str):
         """
@@ -302,17 +447,18 @@ class PivotView(ttk.Frame):
         file_path = filedialog.asksaveasfilename(
             title="Export Pivot as CSV",
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[("CSV files", "*.csv"), ("Gzipped CSV files", "*.csv.gz"), ("All files", "*.*")]
         )
 
         if file_path:
             export_controller = self.controller.app.export_controller
             if export_controller:
-                success = export_controller.export_csv(file_path)
-                if success:
-                    messagebox.showinfo("Success", f"Pivot exported to CSV:\n{file_path}")
-                else:
-                    messagebox.showerror("Error", "Failed to export pivot. Check logs for details.")
+                started = export_controller.export_csv(
+                    file_path,
+                    on_done=lambda success: self._on_export_done(success, "CSV", file_path)
+                )
+                if not started:
+                    self._on_export_done(False, "CSV", file_path)
 
     def _on_export_xlsx(self):
         """Handle export XLSX button click."""
@@ -334,11 +480,12 @@ class PivotView(ttk.Frame):
         if file_path:
             export_controller = self.controller.app.export_controller
             if export_controller:
-                success = export_controller.export_xlsx(file_path)
-                if success:
-                    messagebox.showinfo("Success", f"Pivot exported to Excel:\n{file_path}")
-                else:
-                    messagebox.showerror("Error", "Failed to export pivot. Check logs for details.")
+                started = export_controller.export_xlsx(
+                    file_path,
+                    on_done=lambda success: self._on_export_done(success, "Excel", file_path)
+                )
+                if not started:
+                    self._on_export_done(False, "Excel", file_path)
 
     def _on_export_json(self):
         """Handle export JSON button click."""
@@ -354,14 +501,41 @@ class PivotView(ttk.Frame):
         file_path = filedialog.asksaveasfilename(
             title="Export Pivot as JSON",
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=[
+                ("JSON files", "*.json"),
+                ("NDJSON files", "*.ndjson *.jsonl"),
+                ("Gzipped JSON files", "*.json.gz *.ndjson.gz"),
+                ("All files", "*.*")
+            ]
         )
 
         if file_path:
             export_controller = self.controller.app.export_controller
             if export_controller:
-                success = export_controller.export_json(file_path)
-                if success:
-                    messagebox.showinfo("Success", f"Pivot exported to JSON:\n{file_path}")
-                else:
-                    messagebox.showerror("Error", "Failed to export pivot. Check logs for details.")
+                started = export_controller.export_json(
+                    file_path,
+                    on_done=lambda success: self._on_export_done(success, "JSON", file_path)
+                )
+                if not started:
+                    self._on_export_done(False, "JSON", file_path)
+
+    def _on_cancel_export(self):
+        """Handle cancel export button click."""
+        if self.controller and self.controller.app.export_controller:
+            self.controller.app.export_controller.cancel_export()
+
+    def set_exporting(self, exporting: bool):
+        """
+        Reflect whether an export is running.
+
+        Args:
+            exporting: True while an export runs on a worker
+        """
+        self.cancel_export_button.config(state=tk.NORMAL if exporting else tk.DISABLED)
+
+    def _on_export_done(self, success: bool, format_label: str, file_path: str):
+        """Report the outcome of a background pivot export."""
+        if success:
+            messagebox.showinfo("Success", f"Pivot exported to {format_label}:\n{file_path}")
+        else:
+            messagebox.showerror("Error", "Failed to export pivot. Check logs for details.")
@@ -1,7 +1,7 @@
 """Data preview view."""
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
 
 from pivot_builder.widgets.preview_table_widget import PreviewTableWidget
 
@@ -79,6 +79,21 @@ class PreviewView(ttk.Frame):
         )
         self.combined_info_label.pack(side=tk.LEFT)
 
+        self.export_combined_button = ttk.Button(
+            info_panel,
+            text="Export...",
+            command=self._on_export_combined
+        )
+        self.export_combined_button.pack(side=tk.RIGHT)
+
+        self.cancel_export_button = ttk.Button(
+            info_panel,
+            text="Cancel Export",
+            command=self._on_cancel_export,
+            state=tk.DISABLED
+        )
+        self.cancel_export_button.pack(side=tk.RIGHT, padx=5)
+
         # Preview table
         self.combined_preview_table = PreviewTableWidget(self.combined_frame, self.controller)
         self.combined_preview_table.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
@@ -159,9 +174,13 @@ class PreviewView(ttk.Frame):
             self.preview_table.load_dataframe(file_descriptor.preview_rows)
 
             # Update info label
-            total_rows = len(file_descriptor.dataframe) if file_descriptor.dataframe is not None else 0
+            # Row count is only known once the full file has been parsed
+            total_rows = file_descriptor.row_count
             preview_rows = len(file_descriptor.preview_rows)
-            info_text = f"Showing {preview_rows} of {total_rows} rows"
+            if total_rows is not None:
+                info_text = f"Showing {preview_rows} of {total_rows} rows"
+            else:
+                info_text = f"Showing {preview_rows} rows (full file not loaded yet)"
 
             if file_descriptor.selected_sheet:
                 info_text += f" (Sheet: {file_descriptor.selected_sheet})"
@@ -193,6 +212,52 @@ class PreviewView(ttk.Frame):
         info_text = f"Showing {len(preview_df)} rows, {len(preview_df.columns)} columns"
         self.combined_info_label.config(text=info_text)
 
+    def _on_export_combined(self):
+        """Handle export combined dataset button click."""
+        if not self.controller:
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            title="Export Combined Dataset",
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV files", "*.csv"),
+                ("Gzipped CSV files", "*.csv.gz"),
+                ("NDJSON files", "*.ndjson *.jsonl"),
+                ("Gzipped NDJSON files", "*.ndjson.gz"),
+                ("All files", "*.*")
+            ]
+        )
+
+        if file_path:
+            started = self.controller.export_combined(
+                file_path,
+                on_done=lambda success: self._on_export_combined_done(success, file_path)
+            )
+            if not started:
+                self._on_export_combined_done(False, file_path)
+
+    def _on_cancel_export(self):
+        """Handle cancel export button click."""
+        if self.controller:
+            self.controller.cancel_export()
+
+    def set_exporting(self, exporting: bool):
+        """
+        Reflect whether an export is running.
+
+        Args:
+            exporting: True while an export runs on a worker
+        """
+        self.cancel_export_button.config(state=tk.NORMAL if exporting else tk.DISABLED)
+
+    def _on_export_combined_done(self, success: bool, file_path: str):
+        """Report the outcome of a background combined dataset export."""
+        if success:
+            messagebox.showinfo("Success", f"Combined dataset exported:\n{file_path}")
+        else:
+            messagebox.showerror("Error", "Failed to export combined dataset. Check logs for details.")
+
     def _get_file_display_name(self, file_descriptor):
         """Get display name for file in dropdown."""
         display_name = file_descriptor.filename
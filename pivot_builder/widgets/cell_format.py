@@ -0,0 +1,20 @@
+"""Display formatting for table cells."""
+
+from typing import List
+
+
+def format_cell_values(series) -> List[str]:
+    """
+    Format one column's values for display.
+
+    Args:
+        series: pandas Series
+
+    Returns:
+        List of strings, empty for nulls
+    """
+    nulls = series.isna().to_numpy()
+    return [
+        '' if null else str(value)
+        for value, null in zip(series.to_numpy(dtype=object), nulls)
+    ]
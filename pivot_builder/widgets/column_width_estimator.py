@@ -0,0 +1,174 @@
+"""Sampled column width estimation for sheet widgets."""
+
+import heapq
+import tkinter.font as tkfont
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+from pivot_builder.config.app_config import (
+    COLUMN_WIDTH_MAX_PX,
+    COLUMN_WIDTH_MIN_PX,
+    COLUMN_WIDTH_SAMPLE_ROWS,
+)
+from pivot_builder.widgets.cell_format import format_cell_values
+
+
+# Only the longest few sampled strings (by character count) are measured in pixels
+_MEASURED_PER_COLUMN = 5
+
+# Horizontal padding around cell text
+_CELL_PADDING_PX = 16
+
+# Cached (column, dtype) widths kept per estimator
+_MAX_CACHED_WIDTHS = 4096
+
+
+class ColumnWidthEstimator:
+    """
+    Estimates column widths from a bounded sample of rows.
+
+    Measuring text is the expensive part of auto-sizing (one font metrics call
+    per string), so each column contributes at most COLUMN_WIDTH_SAMPLE_ROWS
+    rows - the first rows plus rows spread evenly over the rest - and only the
+    longest of those are measured. Widths are cached per (column, dtype), so
+    reloading a result with the same columns measures nothing.
+    """
+
+    def __init__(
+        self,
+        measure: Callable[[str], int],
+        measure_header: Optional[Callable[[str], int]] = None,
+        sample_rows: int = COLUMN_WIDTH_SAMPLE_ROWS,
+        min_width: int = COLUMN_WIDTH_MIN_PX,
+        max_width: int = COLUMN_WIDTH_MAX_PX
+    ):
+        """
+        Initialize the estimator.
+
+        Args:
+            measure: Returns the pixel width of cell text
+            measure_header: Returns the pixel width of header text (defaults to measure)
+            sample_rows: Maximum rows sampled per column
+            min_width: Smallest width returned
+            max_width: Largest width returned
+        """
+        self.measure = measure
+        self.measure_header = measure_header or measure
+        self.sample_rows = max(1, sample_rows)
+        self.min_width = min_width
+        self.max_width = max_width
+        self._widths = OrderedDict()  # (column, dtype) -> width
+
+    @classmethod
+    def for_sheet(cls, sheet, **kwargs) -> 'ColumnWidthEstimator':
+        """
+        Create an estimator that measures with a tksheet Sheet's fonts.
+
+        Args:
+            sheet: tksheet Sheet
+            **kwargs: Passed to the constructor
+
+        Returns:
+            ColumnWidthEstimator
+        """
+        def sheet_font(getter_name):
+            try:
+                return tkfont.Font(root=sheet, font=getattr(sheet, getter_name)())
+            except Exception:
+                return tkfont.nametofont('TkDefaultFont')
+
+        cell_font = sheet_font('font')
+        header_font = sheet_font('header_font')
+        return cls(cell_font.measure, header_font.measure, **kwargs)
+
+    def sample_positions(self, row_count: int) -> np.ndarray:
+        """
+        Pick the row positions to sample.
+
+        Args:
+            row_count: Number of rows
+
+        Returns:
+            Sorted array of at most sample_rows row positions
+        """
+        if row_count <= self.sample_rows:
+            return np.arange(row_count)
+        head = np.arange(self.sample_rows // 2)
+        spread = np.linspace(0, row_count - 1, self.sample_rows - len(head)).astype(np.int64)
+        return np.unique(np.concatenate([head, spread]))
+
+    def estimate(self, df, start: int = 0, stop: Optional[int] = None) -> List[int]:
+        """
+        Estimate widths for a range of a DataFrame's columns.
+
+        Args:
+            df: pandas DataFrame
+            start: First column position
+            stop: Column position just past the last one (None for all)
+
+        Returns:
+            List of pixel widths, one per column in [start, stop)
+        """
+        stop = df.shape[1] if stop is None else min(stop, df.shape[1])
+        widths = []
+        sample = None
+
+        for j in range(start, stop):
+            key = (str(df.columns[j]), str(df.dtypes.iloc[j]))
+            width = self._widths.get(key)
+            if width is not None:
+                self._widths.move_to_end(key)
+            else:
+                if sample is None:
+                    sample = df.iloc[self.sample_positions(len(df)), start:stop]
+                values = format_cell_values(sample.iloc[:, j - start])
+                width = self.measure_column(key[0], values)
+                self._widths[key] = width
+                if len(self._widths) > _MAX_CACHED_WIDTHS:
+                    self._widths.popitem(last=False)
+            widths.append(width)
+
+        return widths
+
+    def estimate_rows(self, headers: Sequence[str], rows: Sequence[Sequence]) -> List[int]:
+        """
+        Estimate widths for list-of-rows sheet data (not cached).
+
+        Args:
+            headers: Column headers
+            rows: Row lists
+
+        Returns:
+            List of pixel widths, one per header
+        """
+        sampled = [rows[i] for i in self.sample_positions(len(rows))]
+        return [
+            self.measure_column(
+                str(header),
+                [str(row[j]) for row in sampled if j < len(row) and row[j] is not None]
+            )
+            for j, header in enumerate(headers)
+        ]
+
+    def measure_column(self, header: str, values: Sequence[str]) -> int:
+        """
+        Width for one column from its header and sampled cell texts.
+
+        Args:
+            header: Column header
+            values: Sampled cell strings
+
+        Returns:
+            Pixel width, clamped to [min_width, max_width]
+        """
+        longest = heapq.nlargest(_MEASURED_PER_COLUMN, set(values), key=len)
+        width = max(
+            [self.measure_header(header)] + [self.measure(value) for value in longest]
+        )
+        return max(self.min_width, min(self.max_width, width + _CELL_PADDING_PX))
+
+    def clear(self):
+        """Forget cached widths."""
+        self._widths.clear()
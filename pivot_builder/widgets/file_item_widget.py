@@ -12,6 +12,7 @@ class FileItemWidget(ttk.Frame):
     # Status color mapping
     STATUS_COLORS = {
         'pending': '#808080',  # Gray
+        'loading': '#0d6efd',  # Blue
         'loaded': '#28a745',   # Green
         'error': '#dc3545'     # Red
     }
@@ -95,7 +96,7 @@ class FileItemWidget(ttk.Frame):
             )
             metadata_label.pack(side=tk.LEFT)
 
-            # Add preview button for CSV (data is already loaded)
+            # Add preview button for CSV (header and preview rows are loaded)
             if self.file_descriptor.has_dataframe:
                 self._add_preview_button(metadata_frame)
 
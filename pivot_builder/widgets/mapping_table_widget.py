@@ -3,6 +3,8 @@
 import tkinter as tk
 from tkinter import ttk
 
+from pivot_builder.widgets.column_width_estimator import ColumnWidthEstimator
+
 try:
     from tksheet import Sheet
 except ImportError:
@@ -44,6 +46,7 @@ class MappingTableWidget(ttk.Frame):
         )
         self.sheet.enable_bindings()
         self.sheet.pack(fill=tk.BOTH, expand=True)
+        self.width_estimator = ColumnWidthEstimator.for_sheet(self.sheet)
 
         # Bind cell edit event
         self.sheet.bind("<<SheetModified>>", self._on_cell_edited)
@@ -104,8 +107,8 @@ class MappingTableWidget(ttk.Frame):
         # Make first column (Canonical Field) read-only
         self.sheet.readonly_columns([0])
 
-        # Auto-resize columns
-        self.sheet.set_all_column_widths()
+        # Auto-resize columns from a sample of rows
+        self.sheet.set_column_widths(self.width_estimator.estimate_rows(headers, data))
 
     def _find_original_column(self, file_id: str, canonical_name: str) -> str:
         """
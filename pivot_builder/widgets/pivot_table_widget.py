@@ -3,14 +3,16 @@
 import tkinter as tk
 from tkinter import ttk
 
-try:
-    from tksheet import Sheet
-except ImportError:
-    Sheet = None
+from pivot_builder.widgets.virtual_sheet import DataFrameRowProvider, Sheet, VirtualSheet
 
 
 class PivotTableWidget(ttk.Frame):
-    """Widget for displaying pivot tables using tksheet."""
+    """
+    Widget for displaying pivot tables using tksheet.
+
+    Large pivots open immediately: rows are formatted and handed to the sheet
+    only as they scroll into view.
+    """
 
     def __init__(self, parent, controller=None):
         super().__init__(parent)
@@ -31,16 +33,13 @@ class PivotTableWidget(ttk.Frame):
             self.label.pack(pady=20)
             return
 
-        # Create tksheet
-        self.sheet = Sheet(
+        # Create virtualized tksheet table
+        self.sheet = VirtualSheet(
             self,
-            headers=[],
-            data=[],
             theme="light blue",
             width=800,
             height=400
         )
-        self.sheet.enable_bindings()
         self.sheet.pack(fill=tk.BOTH, expand=True)
 
         # Initial empty message
@@ -61,16 +60,8 @@ class PivotTableWidget(ttk.Frame):
             return
 
         try:
-            # Get headers and data
-            headers = list(pivot_df.columns)
-            data = pivot_df.values.tolist()
-
-            # Update sheet
-            self.sheet.headers(headers)
-            self.sheet.set_sheet_data(data)
-
-            # Auto-resize columns
-            self.sheet.set_all_column_widths()
+            # Only the rows in view are formatted and passed to tksheet
+            self.sheet.load(DataFrameRowProvider(pivot_df))
 
         except Exception as e:
             self.set_empty_message(f"Error loading pivot: {str(e)}")
@@ -85,5 +76,4 @@ class PivotTableWidget(ttk.Frame):
         if Sheet is None:
             return
 
-        self.sheet.headers(["Message"])
-        self.sheet.set_sheet_data([[message]])
+        self.sheet.show_message("Message", message)
@@ -3,14 +3,15 @@
 import tkinter as tk
 from tkinter import ttk
 
-try:
-    from tksheet import Sheet
-except ImportError:
-    Sheet = None
+from pivot_builder.widgets.virtual_sheet import DataFrameRowProvider, Sheet, VirtualSheet
 
 
 class PreviewTableWidget(ttk.Frame):
-    """Widget for displaying data preview in table format using tksheet."""
+    """
+    Widget for displaying data preview in table format using tksheet.
+
+    Rows are formatted and handed to the sheet only as they scroll into view.
+    """
 
     def __init__(self, parent, controller):
         super().__init__(parent)
@@ -31,15 +32,12 @@ class PreviewTableWidget(ttk.Frame):
             error_label.pack(pady=20)
             return
 
-        # Create tksheet widget
-        self.sheet = Sheet(
+        # Create virtualized tksheet table
+        self.sheet = VirtualSheet(
             self,
-            headers=[],
-            data=[],
             height=400,
             width=800
         )
-        self.sheet.enable_bindings()
         self.sheet.pack(fill=tk.BOTH, expand=True)
 
     def load_dataframe(self, df):
@@ -57,16 +55,8 @@ class PreviewTableWidget(ttk.Frame):
             return
 
         try:
-            # Convert DataFrame to lists for tksheet
-            headers = list(df.columns)
-            data = df.values.tolist()
-
-            # Set headers and data
-            self.sheet.headers(headers)
-            self.sheet.set_sheet_data(data)
-
-            # Auto-size columns
-            self.sheet.set_all_column_widths()
+            # Only the rows in view are formatted and passed to tksheet
+            self.sheet.load(DataFrameRowProvider(df))
 
         except Exception as e:
             print(f"Error loading dataframe: {e}")
@@ -76,15 +66,12 @@ class PreviewTableWidget(ttk.Frame):
         if self.sheet is None:
             return
 
-        self.sheet.headers([])
-        self.sheet.set_sheet_data([])
+        self.sheet.clear()
 
     def set_empty_message(self, message: str = "No data to preview"):
         """Display an empty message when no data is available."""
         if self.sheet is None:
             return
 
-        self.clear()
         # Show a simple message in the first cell
-        self.sheet.headers(["Message"])
-        self.sheet.set_sheet_data([[message]])
+        self.sheet.show_message("Message", message)
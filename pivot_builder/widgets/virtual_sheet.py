@@ -0,0 +1,257 @@
+"""Virtualized tksheet table over a DataFrame."""
+
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+from typing import List
+
+from pivot_builder.config.app_config import (
+    COLUMN_WIDTH_BATCH,
+    TABLE_BLOCK_ROWS,
+    TABLE_CACHE_BLOCKS,
+    TABLE_ROW_HEIGHT_PX,
+)
+from pivot_builder.widgets.cell_format import format_cell_values
+from pivot_builder.widgets.column_width_estimator import ColumnWidthEstimator
+
+try:
+    from tksheet import Sheet
+except ImportError:
+    Sheet = None
+
+
+class DataFrameRowProvider:
+    """
+    Serves display rows of a DataFrame on demand.
+
+    Rows are formatted a block at a time, column by column, so mixed dtypes are
+    never upcast to one object array and untouched rows are never converted.
+    The most recently used blocks are kept so scrolling back and forth does
+    not reformat them.
+    """
+
+    def __init__(self, df, block_rows: int = TABLE_BLOCK_ROWS, max_blocks: int = TABLE_CACHE_BLOCKS):
+        """
+        Initialize the provider.
+
+        Args:
+            df: pandas DataFrame to display
+            block_rows: Rows formatted per block
+            max_blocks: Formatted blocks kept in the LRU
+        """
+        self.df = df
+        self.headers = [str(col) for col in df.columns]
+        self.row_count = len(df)
+        self.block_rows = max(1, block_rows)
+        self.max_blocks = max(1, max_blocks)
+        self._blocks = OrderedDict()  # block index -> list of formatted rows
+
+    def get_rows(self, start: int, stop: int) -> List[List[str]]:
+        """
+        Get formatted rows [start, stop).
+
+        Args:
+            start: First row position
+            stop: Row position just past the last row (clipped to the frame)
+
+        Returns:
+            List of rows, each a list of cell strings
+        """
+        start = max(0, start)
+        stop = min(stop, self.row_count)
+        rows = []
+        if start >= stop:
+            return rows
+
+        for index in range(start // self.block_rows, (stop - 1) // self.block_rows + 1):
+            base = index * self.block_rows
+            block = self._get_block(index)
+            rows.extend(block[max(start - base, 0):stop - base])
+        return rows
+
+    def _get_block(self, index: int) -> List[List[str]]:
+        block = self._blocks.get(index)
+        if block is not None:
+            self._blocks.move_to_end(index)
+            return block
+
+        start = index * self.block_rows
+        stop = min(start + self.block_rows, self.row_count)
+        chunk = self.df.iloc[start:stop]
+        columns = [format_cell_values(chunk.iloc[:, j]) for j in range(chunk.shape[1])]
+        block = [list(row) for row in zip(*columns)] if columns else [[] for _ in range(stop - start)]
+
+        self._blocks[index] = block
+        if len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+
+class VirtualSheet(ttk.Frame):
+    """
+    tksheet table that only ever holds the rows in view.
+
+    The sheet is given just the visible window of rows from a
+    DataFrameRowProvider; a separate scrollbar spans the whole frame and the
+    window is refilled as it moves. Opening a large result costs the same as
+    opening a small one. Column widths come from a sampled ColumnWidthEstimator
+    and are applied a batch of columns at a time from idle callbacks.
+    """
+
+    def __init__(self, parent, **sheet_kwargs):
+        """
+        Initialize the table. Requires tksheet.
+
+        Args:
+            parent: Parent widget
+            **sheet_kwargs: Extra tksheet Sheet options (e.g. theme, width, height)
+        """
+        super().__init__(parent)
+        self.provider = None
+        self.offset = 0
+        # Refined from the real widget height on the first <Configure>
+        self.visible_rows = max(1, sheet_kwargs.get('height', 400) // TABLE_ROW_HEIGHT_PX)
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.sheet = Sheet(self, headers=[], data=[], show_y_scrollbar=False, **sheet_kwargs)
+        self.sheet.enable_bindings()
+        self.sheet.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Kept across loads so reloading the same columns measures nothing
+        self.width_estimator = ColumnWidthEstimator.for_sheet(self.sheet)
+        self._autosize_job = None
+
+        self.sheet.bind('<Configure>', self._on_resize, add='+')
+        # The main table and row index canvases receive wheel/key events, not the Sheet frame
+        for widget in (getattr(self.sheet, 'MT', None), getattr(self.sheet, 'RI', None)):
+            if widget is None:
+                continue
+            widget.bind('<MouseWheel>', self._on_mousewheel, add='+')
+            widget.bind('<Button-4>', lambda e: self.scroll_rows(-3), add='+')
+            widget.bind('<Button-5>', lambda e: self.scroll_rows(3), add='+')
+            widget.bind('<Prior>', lambda e: self.scroll_rows(-self.visible_rows), add='+')
+            widget.bind('<Next>', lambda e: self.scroll_rows(self.visible_rows), add='+')
+
+    def load(self, provider: DataFrameRowProvider):
+        """
+        Show a provider's rows from the top.
+
+        Args:
+            provider: DataFrameRowProvider for the frame to display
+        """
+        self._cancel_autosize()
+        self.provider = provider
+        self.offset = 0
+        self.sheet.headers(provider.headers)
+        self._render(reset_col_positions=True)
+        self._autosize_columns()
+
+    def show_message(self, header: str, message: str):
+        """
+        Replace the table with a single message cell.
+
+        Args:
+            header: Column header
+            message: Cell text
+        """
+        self._cancel_autosize()
+        self.provider = None
+        self.offset = 0
+        self.sheet.headers([header])
+        self.sheet.set_sheet_data([[message]])
+        self.scrollbar.set(0, 1)
+
+    def clear(self):
+        """Remove all rows and headers."""
+        self._cancel_autosize()
+        self.provider = None
+        self.offset = 0
+        self.sheet.headers([])
+        self.sheet.set_sheet_data([])
+        self.scrollbar.set(0, 1)
+
+    def scroll_rows(self, delta: int):
+        """Move the window by delta rows."""
+        self.scroll_to(self.offset + delta)
+        return 'break'
+
+    def scroll_to(self, offset: int):
+        """Move the window so row offset is at the top."""
+        if self.provider is None:
+            return
+        offset = max(0, min(offset, self.provider.row_count - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _render(self, reset_col_positions: bool = False):
+        """Fill the sheet with the rows currently in view."""
+        if self.provider is None:
+            return
+
+        stop = self.offset + self.visible_rows
+        rows = self.provider.get_rows(self.offset, stop)
+        self.sheet.set_sheet_data(rows, reset_col_positions=reset_col_positions, redraw=False)
+        self.sheet.row_index([str(i + 1) for i in range(self.offset, self.offset + len(rows))])
+        self.sheet.redraw()
+
+        total = self.provider.row_count
+        if total:
+            self.scrollbar.set(self.offset / total, min(stop, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _autosize_columns(self, start: int = 0):
+        """Size one batch of columns, then schedule the next one."""
+        self._autosize_job = None
+        if self.provider is None:
+            return
+
+        df = self.provider.df
+        stop = min(start + COLUMN_WIDTH_BATCH, df.shape[1])
+        for column, width in enumerate(self.width_estimator.estimate(df, start, stop), start):
+            self.sheet.column_width(column=column, width=width, redraw=False)
+        self.sheet.redraw()
+
+        if stop < df.shape[1]:
+            self._autosize_job = self.after_idle(self._autosize_columns, stop)
+
+    def _cancel_autosize(self):
+        if self._autosize_job is not None:
+            self.after_cancel(self._autosize_job)
+            self._autosize_job = None
+
+    def _row_height(self) -> int:
+        try:
+            return max(1, int(self.sheet.default_row_height()))
+        except Exception:
+            return TABLE_ROW_HEIGHT_PX
+
+    def _on_resize(self, event):
+        try:
+            header_height = int(self.sheet.default_header_height())
+        except Exception:
+            header_height = TABLE_ROW_HEIGHT_PX
+
+        # One extra row so a partly visible last row is still filled
+        visible_rows = max(1, (event.height - header_height) // self._row_height() + 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            if self.provider is not None:
+                self.offset = max(0, min(self.offset, self.provider.row_count - visible_rows))
+                self._render()
+
+    def _on_mousewheel(self, event):
+        steps = -1 if event.delta > 0 else 1
+        return self.scroll_rows(steps * 3)
+
+    def _on_scrollbar(self, action, *args):
+        if self.provider is None:
+            return
+        if action == 'moveto':
+            self.scroll_to(int(float(args[0]) * self.provider.row_count))
+        elif action == 'scroll':
+            amount, unit = int(args[0]), args[1]
+            self.scroll_rows(amount * (self.visible_rows if unit == 'pages' else 1))